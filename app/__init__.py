@@ -1,6 +1,10 @@
+import os
+
 from flask import Flask
 
+from .assets import init_assets
 from .extensions import db, login_manager
+from .sqlite import configure_sqlite
 
 
 def create_app(test_config: dict | None = None) -> Flask:
@@ -10,12 +14,24 @@ def create_app(test_config: dict | None = None) -> Flask:
         SECRET_KEY="dev-secret-change-me",
         SQLALCHEMY_DATABASE_URI="sqlite:///app.db",
         SQLALCHEMY_TRACK_MODIFICATIONS=False,
+        AUTO_CREATE_SCHEMA=os.environ.get("AUTO_CREATE_SCHEMA", "1") != "0",
+        USER_CACHE_TTL=int(os.environ.get("USER_CACHE_TTL", "30")),
+        PAGE_CACHE_ENABLED=os.environ.get("PAGE_CACHE_ENABLED", "1") != "0",
+        PAGE_CACHE_MAX_ENTRIES=int(os.environ.get("PAGE_CACHE_MAX_ENTRIES", "512")),
+        ASSETS_DIST_DIR=os.environ.get("ASSETS_DIST_DIR"),
+        SQLITE_TUNING=os.environ.get("SQLITE_TUNING", "1") != "0",
+        SQLITE_BUSY_TIMEOUT_MS=int(os.environ.get("SQLITE_BUSY_TIMEOUT_MS", "5000")),
+        SQLITE_SYNCHRONOUS=os.environ.get("SQLITE_SYNCHRONOUS", "NORMAL"),
+        SQLITE_MMAP_SIZE=int(os.environ.get("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),
+        SQLITE_CACHE_SIZE_KB=int(os.environ.get("SQLITE_CACHE_SIZE_KB", "65536")),
     )
 
     if test_config:
         app.config.update(test_config)
 
     db.init_app(app)
+    with app.app_context():
+        configure_sqlite(db.engine, app.config)
     login_manager.init_app(app)
 
     from .auth.routes import auth_bp
@@ -25,8 +41,23 @@ def create_app(test_config: dict | None = None) -> Flask:
     app.register_blueprint(main_bp)
     app.register_blueprint(auth_bp)
     app.register_blueprint(admin_bp)
+    init_assets(app)
 
-    with app.app_context():
-        db.create_all()
+    from .models import add_missing_user_columns, migrate_legacy_group_permissions
+
+    if app.config["AUTO_CREATE_SCHEMA"]:
+        with app.app_context():
+            db.create_all()
+            migrate_legacy_group_permissions()
+
+    @app.cli.command("migrate-group-permissions")
+    def migrate_group_permissions():
+        migrated = migrate_legacy_group_permissions()
+        print(f"Migrated permissions for {migrated} group(s)")
+
+    @app.cli.command("migrate-user-columns")
+    def migrate_user_columns():
+        added = add_missing_user_columns()
+        print("Added user.session_version" if added else "User table is up to date")
 
     return app
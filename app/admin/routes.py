@@ -1,21 +1,51 @@
 from flask import Blueprint, abort, jsonify, render_template, request
 from flask_login import current_user, login_required
+from sqlalchemy import func, or_, select
+from sqlalchemy.orm import selectinload
 
 from ..extensions import db
-from ..models import Group, User
+from ..models import Group, User, invalidate_user, parse_permission_names
+from ..page_cache import invalidate_pages
 
 
 admin_bp = Blueprint("admin", __name__, url_prefix="/admin")
 
+DEFAULT_PAGE_SIZE = 25
+MAX_PAGE_SIZE = 100
+
 
 def _ensure_admin() -> None:
     if not current_user.is_admin:
         abort(403)
 
 
-def _parse_permissions(raw_permissions: str) -> str:
-    entries = [entry.strip() for entry in raw_permissions.split(",") if entry.strip()]
-    return ",".join(dict.fromkeys(entries))
+def _per_page() -> int:
+    return max(1, min(request.args.get("per_page", DEFAULT_PAGE_SIZE, type=int), MAX_PAGE_SIZE))
+
+
+def _users_page(search: str, page: int, per_page: int):
+    stmt = select(User).options(selectinload(User.groups)).order_by(User.id.asc())
+    if search:
+        pattern = f"%{search.lower()}%"
+        stmt = stmt.where(or_(func.lower(User.username).like(pattern), User.email.like(pattern)))
+    return db.paginate(stmt, page=page, per_page=per_page, error_out=False)
+
+
+def _groups_page(search: str, page: int, per_page: int):
+    stmt = select(Group).options(selectinload(Group.permission_entries)).order_by(Group.name.asc())
+    if search:
+        stmt = stmt.where(func.lower(Group.name).like(f"%{search.lower()}%"))
+    return db.paginate(stmt, page=page, per_page=per_page, error_out=False)
+
+
+def _page_payload(pagination, serialize) -> dict:
+    return {
+        "items": [serialize(item) for item in pagination.items],
+        "page": pagination.page,
+        "per_page": pagination.per_page,
+        "pages": pagination.pages,
+        "total": pagination.total,
+    }
 
 
 @admin_bp.get("/")
@@ -23,9 +53,46 @@ def _parse_permissions(raw_permissions: str) -> str:
 def admin_dashboard():
     _ensure_admin()
 
-    users = User.query.order_by(User.id.asc()).all()
-    groups = Group.query.order_by(Group.name.asc()).all()
-    return render_template("admin.html", users=users, groups=groups)
+    search = request.args.get("q", "").strip()
+    group_search = request.args.get("gq", "").strip()
+    per_page = _per_page()
+    users = _users_page(search, request.args.get("page", 1, type=int), per_page)
+    groups = _groups_page(group_search, request.args.get("gpage", 1, type=int), per_page)
+    return render_template(
+        "admin.html",
+        users=users,
+        groups=groups,
+        search=search,
+        group_search=group_search,
+    )
+
+
+@admin_bp.get("/api/users")
+@login_required
+def list_users():
+    _ensure_admin()
+
+    users = _users_page(request.args.get("q", "").strip(), request.args.get("page", 1, type=int), _per_page())
+    return jsonify(_page_payload(users, lambda user: {
+        "id": user.id,
+        "username": user.username,
+        "email": user.email,
+        "is_admin": user.is_admin,
+        "group_ids": sorted(group.id for group in user.groups),
+    }))
+
+
+@admin_bp.get("/api/groups")
+@login_required
+def list_groups():
+    _ensure_admin()
+
+    groups = _groups_page(request.args.get("q", "").strip(), request.args.get("page", 1, type=int), _per_page())
+    return jsonify(_page_payload(groups, lambda group: {
+        "id": group.id,
+        "name": group.name,
+        "permissions": group.permissions_list,
+    }))
 
 
 @admin_bp.post("/api/users/<int:user_id>")
@@ -60,7 +127,10 @@ def update_user(user_id: int):
     user.email = email
     user.is_admin = is_admin
     user.groups = groups
+    user.bump_session_version()
     db.session.commit()
+    invalidate_user(user.id)
+    invalidate_pages(vary=("user", user.id))
     return jsonify({"ok": True})
 
 
@@ -76,8 +146,11 @@ def delete_user(user_id: int):
     if user.id == current_user.id:
         return jsonify({"error": "You cannot delete your own account."}), 400
 
+    # Other workers see the missing row on their next session_version check.
     db.session.delete(user)
     db.session.commit()
+    invalidate_user(user_id)
+    invalidate_pages(vary=("user", user_id))
     return jsonify({"ok": True})
 
 
@@ -88,7 +161,7 @@ def create_group():
 
     payload = request.get_json(silent=True) or {}
     name = (payload.get("name") or "").strip()
-    permissions = _parse_permissions(payload.get("permissions") or "")
+    permissions = parse_permission_names(payload.get("permissions") or "")
 
     if len(name) < 2:
         return jsonify({"error": "Group name must be at least 2 characters."}), 400
@@ -113,7 +186,7 @@ def update_group(group_id: int):
 
     payload = request.get_json(silent=True) or {}
     name = (payload.get("name") or "").strip()
-    permissions = _parse_permissions(payload.get("permissions") or "")
+    permissions = parse_permission_names(payload.get("permissions") or "")
 
     if len(name) < 2:
         return jsonify({"error": "Group name must be at least 2 characters."}), 400
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import re
+
+from flask import Blueprint, Flask, abort, current_app, request, send_from_directory, url_for
+from flask.cli import AppGroup
+
+# Optional and deliberately not in requirements.txt: without it ``assets build``
+# writes only .gz variants and ``serve`` falls back to gzip or the plain file.
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+
+MANIFEST_NAME = "manifest.json"
+IMMUTABLE = "public, max-age=31536000, immutable"
+FINGERPRINTED = re.compile(r"\.[0-9a-f]{12}(\.[^./]+)?$")
+
+assets_bp = Blueprint("assets", __name__, url_prefix="/assets")
+assets_cli = AppGroup("assets", help="Build fingerprinted static assets.")
+
+
+def dist_dir(app: Flask) -> str:
+    return app.config["ASSETS_DIST_DIR"] or os.path.join(app.static_folder, "dist")
+
+
+def load_manifest(app: Flask) -> dict[str, str]:
+    path = os.path.join(dist_dir(app), MANIFEST_NAME)
+    try:
+        with open(path) as fh:
+            manifest = json.load(fh)
+    except FileNotFoundError:
+        manifest = {}
+    app.extensions["assets_manifest"] = manifest
+    return manifest
+
+
+def _hashed_name(rel_path: str, data: bytes) -> str:
+    root, ext = os.path.splitext(rel_path)
+    return f"{root}.{hashlib.sha256(data).hexdigest()[:12]}{ext}"
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as fh:
+        fh.write(data)
+    os.replace(tmp, path)
+
+
+def build_assets(app: Flask) -> dict[str, str]:
+    """Write fingerprinted files next to earlier builds and swap in the new manifest.
+
+    Files from earlier builds stay in place, because pages rendered against an
+    older manifest (by workers not yet restarted, or from the page cache) still
+    reference them. ``prune_assets`` removes them once they are no longer needed.
+    """
+    source, target = app.static_folder, dist_dir(app)
+
+    manifest = {}
+    for dirpath, dirnames, filenames in os.walk(source):
+        dirnames[:] = [d for d in dirnames if os.path.join(dirpath, d) != target]
+        for filename in sorted(filenames):
+            rel_path = os.path.relpath(os.path.join(dirpath, filename), source).replace(os.sep, "/")
+            with open(os.path.join(dirpath, filename), "rb") as fh:
+                data = fh.read()
+            hashed = _hashed_name(rel_path, data)
+            out = os.path.join(target, hashed)
+            os.makedirs(os.path.dirname(out), exist_ok=True)
+            if not os.path.exists(out):
+                # Compressed variants first, so a visible hashed file always has them.
+                _write_atomic(out + ".gz", gzip.compress(data, compresslevel=9, mtime=0))
+                if brotli is not None:
+                    _write_atomic(out + ".br", brotli.compress(data))
+                _write_atomic(out, data)
+            manifest[rel_path] = hashed
+
+    os.makedirs(target, exist_ok=True)
+    _write_atomic(os.path.join(target, MANIFEST_NAME), json.dumps(manifest, indent=2, sort_keys=True).encode())
+    app.extensions["assets_manifest"] = manifest
+    return manifest
+
+
+def prune_assets(app: Flask) -> int:
+    """Delete fingerprinted files the current manifest no longer references."""
+    target = dist_dir(app)
+    keep = {MANIFEST_NAME}
+    for hashed in load_manifest(app).values():
+        keep.update(hashed + suffix for suffix in ("", ".gz", ".br"))
+    removed = 0
+    for dirpath, _dirnames, filenames in os.walk(target):
+        for filename in filenames:
+            rel_path = os.path.relpath(os.path.join(dirpath, filename), target).replace(os.sep, "/")
+            if rel_path not in keep:
+                os.remove(os.path.join(dirpath, filename))
+                removed += 1
+    return removed
+
+
+@assets_cli.command("build")
+def build_command():
+    """Content-hash static files into the dist directory with .gz/.br variants."""
+    manifest = build_assets(current_app)
+    print(f"Built {len(manifest)} asset(s) into {dist_dir(current_app)}" + ("" if brotli else " (brotli not installed, gzip only)"))
+
+
+@assets_cli.command("prune")
+def prune_command():
+    """Delete files from earlier builds; run once no served page can still reference them."""
+    print(f"Removed {prune_assets(current_app)} stale file(s) from {dist_dir(current_app)}")
+
+
+def asset_url_for(endpoint: str, **values) -> str:
+    if endpoint == "static":
+        hashed = current_app.extensions.get("assets_manifest", {}).get(values.get("filename"))
+        if hashed:
+            values["filename"] = hashed
+            return url_for("assets.serve", **values)
+    return url_for(endpoint, **values)
+
+
+@assets_bp.get("/<path:filename>")
+def serve(filename: str):
+    # Any fingerprinted file still on disk, not just this worker's manifest: pages
+    # rendered against a newer or older build must keep loading.
+    directory = dist_dir(current_app)
+    if not FINGERPRINTED.search(filename) or not os.path.isfile(os.path.join(directory, filename)):
+        abort(404)
+
+    mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    encoding = None
+    for candidate, suffix in (("br", ".br"), ("gzip", ".gz")):
+        if request.accept_encodings[candidate] and os.path.exists(os.path.join(directory, filename + suffix)):
+            encoding, filename = candidate, filename + suffix
+            break
+
+    resp = send_from_directory(directory, filename, mimetype=mimetype, conditional=True)
+    if encoding:
+        resp.headers["Content-Encoding"] = encoding
+    resp.headers["Cache-Control"] = IMMUTABLE
+    resp.vary.add("Accept-Encoding")
+    return resp
+
+
+def init_assets(app: Flask) -> None:
+    app.register_blueprint(assets_bp)
+    app.cli.add_command(assets_cli)
+    app.jinja_env.globals["url_for"] = asset_url_for
+    load_manifest(app)
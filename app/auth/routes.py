@@ -2,7 +2,7 @@ from flask import Blueprint, jsonify, redirect, render_template, request, url_fo
 from flask_login import current_user, login_required, login_user, logout_user
 
 from ..extensions import db
-from ..models import User
+from ..models import User, remember_session_version
 
 
 auth_bp = Blueprint("auth", __name__)
@@ -35,13 +35,14 @@ def signup_api():
     if User.query.filter((User.username == username) | (User.email == email)).first():
         return jsonify({"error": "User already exists."}), 409
 
-    is_first_user = User.query.count() == 0
+    is_first_user = db.session.query(User.id).first() is None
 
     user = User(username=username, email=email, is_admin=is_first_user)
     user.set_password(password)
     db.session.add(user)
     db.session.commit()
     login_user(user)
+    remember_session_version(user)
     return jsonify({"ok": True, "is_admin": user.is_admin})
 
 
@@ -56,6 +57,7 @@ def login_api():
         return jsonify({"error": "Invalid email or password."}), 401
 
     login_user(user)
+    remember_session_version(user)
     return jsonify({"ok": True, "is_admin": user.is_admin})
 
 
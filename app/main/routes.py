@@ -3,11 +3,14 @@ from datetime import date
 from flask import Blueprint, render_template
 from flask_login import current_user, login_required
 
+from ..page_cache import cached_page
+
 
 main_bp = Blueprint("main", __name__)
 
 
 @main_bp.get("/")
+@cached_page(ttl=300)
 def index():
     features = [
         {"title": "Authentication", "description": "Signup/login flow with secure password hashing."},
@@ -32,6 +35,7 @@ def index():
 
 
 @main_bp.get("/docs")
+@cached_page(ttl=300)
 def docs():
     setup_steps = [
         "Create and activate a Python virtual environment.",
@@ -59,6 +63,7 @@ def docs():
 
 
 @main_bp.get("/components")
+@cached_page(ttl=300)
 def components():
     metrics = [
         {"label": "Reusable widgets", "value": "8"},
@@ -1,5 +1,11 @@
 from __future__ import annotations
 
+import threading
+import time
+from collections.abc import Iterable
+
+from flask import current_app, session
+from sqlalchemy import event, inspect, text
 from werkzeug.security import check_password_hash, generate_password_hash
 from flask_login import UserMixin
 
@@ -13,16 +19,94 @@ user_groups = db.Table(
 )
 
 
+group_permissions = db.Table(
+    "group_permissions",
+    db.Column("group_id", db.Integer, db.ForeignKey("group.id", ondelete="CASCADE"), primary_key=True),
+    db.Column("permission_id", db.Integer, db.ForeignKey("permission.id", ondelete="CASCADE"), primary_key=True),
+    db.Index("ix_group_permissions_permission_id", "permission_id"),
+)
+
+
+def parse_permission_names(raw: str | Iterable[str]) -> list[str]:
+    entries = raw.split(",") if isinstance(raw, str) else raw
+    return list(dict.fromkeys(entry.strip() for entry in entries if entry and entry.strip()))
+
+
+class Permission(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(120), unique=True, nullable=False, index=True)
+
+    groups = db.relationship("Group", secondary=group_permissions, back_populates="permission_entries")
+
+    @classmethod
+    def get_or_create_many(cls, names: list[str]) -> list["Permission"]:
+        if not names:
+            return []
+        with db.session.no_autoflush:
+            existing = {perm.name: perm for perm in cls.query.filter(cls.name.in_(names))}
+        for name in names:
+            if name not in existing:
+                existing[name] = cls(name=name)
+                db.session.add(existing[name])
+        return [existing[name] for name in names]
+
+
 class Group(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(80), unique=True, nullable=False)
-    permissions = db.Column(db.Text, nullable=False, default="")
+    # Pre-normalization comma-joined storage, kept so existing databases still load.
+    # migrate_legacy_group_permissions() moves it into group_permissions and clears it.
+    legacy_permissions = db.Column("permissions", db.Text, nullable=False, default="")
 
     users = db.relationship("User", secondary=user_groups, back_populates="groups")
+    permission_entries = db.relationship(
+        "Permission", secondary=group_permissions, back_populates="groups", order_by="Permission.name"
+    )
+
+    @property
+    def permission_set(self) -> frozenset[str]:
+        cached = self.__dict__.get("_permission_set")
+        if cached is None:
+            cached = self.__dict__["_permission_set"] = frozenset(perm.name for perm in self.permission_entries)
+        return cached
 
     @property
     def permissions_list(self) -> list[str]:
-        return [entry.strip() for entry in self.permissions.split(",") if entry.strip()]
+        return sorted(self.permission_set)
+
+    @property
+    def permissions(self) -> str:
+        return ",".join(self.permissions_list)
+
+    @permissions.setter
+    def permissions(self, raw: str | Iterable[str]) -> None:
+        self.permission_entries = Permission.get_or_create_many(parse_permission_names(raw))
+
+    def grants(self, permission: str) -> bool:
+        return permission in self.permission_set
+
+    @classmethod
+    def granting(cls, permission: str):
+        return cls.query.join(cls.permission_entries).filter(Permission.name == permission)
+
+
+def _invalidate_permission_set(group, *_args, **_kwargs):
+    group.__dict__.pop("_permission_set", None)
+
+
+for _event in ("append", "remove", "set"):
+    event.listen(Group.permission_entries, _event, _invalidate_permission_set)
+
+
+def migrate_legacy_group_permissions() -> int:
+    migrated = 0
+    for group in Group.query.filter(Group.legacy_permissions != "").all():
+        names = parse_permission_names(group.legacy_permissions)
+        group.permissions = list(group.permission_set) + names
+        group.legacy_permissions = ""
+        migrated += 1
+    db.session.commit()
+    return migrated
 
 
 class User(UserMixin, db.Model):
@@ -31,9 +115,14 @@ class User(UserMixin, db.Model):
     email = db.Column(db.String(255), unique=True, nullable=False)
     password_hash = db.Column(db.String(255), nullable=False)
     is_admin = db.Column(db.Boolean, default=False, nullable=False)
+    # Bumped by every admin change to the account; cached snapshots are checked against it.
+    session_version = db.Column(db.Integer, default=1, server_default="1", nullable=False)
 
     groups = db.relationship("Group", secondary=user_groups, back_populates="users")
 
+    def bump_session_version(self) -> None:
+        self.session_version = User.session_version + 1
+
     def set_password(self, password: str) -> None:
         self.password_hash = generate_password_hash(password)
 
@@ -41,6 +130,70 @@ class User(UserMixin, db.Model):
         return check_password_hash(self.password_hash, password)
 
 
+class UserSnapshot(UserMixin):
+    """Detached, read-only view of a User served from the per-worker cache."""
+
+    def __init__(self, user: User) -> None:
+        self.id = user.id
+        self.username = user.username
+        self.email = user.email
+        self.is_admin = user.is_admin
+        self.session_version = user.session_version
+
+
+def add_missing_user_columns() -> bool:
+    """Add ``user.session_version`` to databases created before it existed."""
+    columns = {column["name"] for column in inspect(db.engine).get_columns("user")}
+    if "session_version" in columns:
+        return False
+    with db.engine.begin() as conn:
+        conn.execute(text('ALTER TABLE "user" ADD COLUMN session_version INTEGER NOT NULL DEFAULT 1'))
+    return True
+
+
+# Per-worker cache of UserSnapshot keyed by user id, stored on the app. The
+# login session carries the user's session_version; a snapshot is served only
+# while the two agree, without a query. The worker handling an admin change
+# drops its entry, and any reload copies the new version into the session, so
+# other workers' snapshots are bounded by USER_CACHE_TTL.
+USER_CACHE_MAX_ENTRIES = 10_000
+_user_cache_lock = threading.Lock()
+
+
+def _user_cache() -> dict[int, tuple[float, UserSnapshot]]:
+    return current_app.extensions.setdefault("user_cache", {})
+
+
+def invalidate_user(user_id: int) -> None:
+    with _user_cache_lock:
+        _user_cache().pop(user_id, None)
+
+
+def remember_session_version(user: User) -> None:
+    if session.get("session_version") != user.session_version:
+        session["session_version"] = user.session_version
+
+
 @login_manager.user_loader
-def load_user(user_id: str) -> User | None:
-    return db.session.get(User, int(user_id))
+def load_user(user_id: str) -> User | UserSnapshot | None:
+    uid = int(user_id)
+    ttl = current_app.config.get("USER_CACHE_TTL", 0)
+    now = time.monotonic()
+    cache = _user_cache()
+    cached = cache.get(uid)
+    if cached and cached[0] > now and cached[1].session_version == session.get("session_version"):
+        return cached[1]
+
+    user = db.session.get(User, uid)
+    if user is not None:
+        remember_session_version(user)
+    if user is None or ttl <= 0:
+        invalidate_user(uid)
+        return user
+
+    snapshot = UserSnapshot(user)
+    with _user_cache_lock:
+        if len(cache) >= USER_CACHE_MAX_ENTRIES:
+            cache.pop(next(iter(cache)))
+        cache[uid] = (now + ttl, snapshot)
+    return snapshot
\ No newline at end of file
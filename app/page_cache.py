@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from functools import wraps
+
+from flask import Response, current_app, make_response, request
+from flask_login import current_user
+
+
+def auth_vary() -> tuple:
+    if current_user.is_authenticated:
+        return ("user", current_user.id)
+    return ("anon",)
+
+
+class PageCache:
+    """Bounded LRU of rendered pages with per-entry expiry."""
+
+    def __init__(self, max_entries: int = 512) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple, dict] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> dict | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry["expires"] <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: tuple, entry: dict) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, endpoint: str | None = None, vary: Hashable | None = None) -> int:
+        with self._lock:
+            doomed = [
+                key for key in self._entries
+                if (endpoint is None or key[0] == endpoint) and (vary is None or key[2] == vary)
+            ]
+            for key in doomed:
+                del self._entries[key]
+            return len(doomed)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def get_page_cache() -> PageCache:
+    cache = current_app.extensions.get("page_cache")
+    if cache is None:
+        cache = current_app.extensions["page_cache"] = PageCache(current_app.config["PAGE_CACHE_MAX_ENTRIES"])
+    return cache
+
+
+def invalidate_pages(endpoint: str | None = None, vary: Hashable | None = None) -> int:
+    return get_page_cache().invalidate(endpoint, vary)
+
+
+def _cached_response(entry: dict, ttl: int) -> Response:
+    if request.if_none_match.contains(entry["etag"]):
+        resp = Response(status=304)
+    else:
+        resp = Response(entry["body"], content_type=entry["content_type"])
+    resp.set_etag(entry["etag"])
+    if entry["public"]:
+        resp.cache_control.public = True
+        resp.cache_control.max_age = ttl
+    else:
+        resp.cache_control.private = True
+        resp.cache_control.no_cache = True
+    resp.vary.add("Cookie")
+    return resp
+
+
+def cached_page(ttl: int = 60, vary: Callable[[], Hashable] = auth_vary):
+    """Serve a GET view from the page cache, keyed by endpoint, full path and ``vary()``."""
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if not current_app.config["PAGE_CACHE_ENABLED"] or request.method != "GET":
+                return view(*args, **kwargs)
+
+            cache = get_page_cache()
+            vary_key = vary()
+            key = (request.endpoint, request.full_path, vary_key)
+            entry = cache.get(key)
+            if entry is None:
+                resp = make_response(view(*args, **kwargs))
+                if resp.status_code != 200 or resp.is_streamed:
+                    return resp
+                body = resp.get_data()
+                entry = {
+                    "body": body,
+                    "content_type": resp.content_type,
+                    "etag": hashlib.sha1(body).hexdigest(),
+                    "public": vary_key == ("anon",),
+                    "expires": time.monotonic() + ttl,
+                }
+                cache.set(key, entry)
+            return _cached_response(entry, ttl)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,27 @@
+"""SQLite connection pragmas so several gunicorn workers can share ``app.db``.
+
+WAL lets readers run alongside the writer and ``busy_timeout`` makes a
+writer wait for the lock instead of failing with ``database is locked``.
+"""
+from sqlalchemy import event
+
+
+def configure_sqlite(engine, config):
+    if engine.dialect.name != "sqlite" or not config["SQLITE_TUNING"]:
+        return
+    pragmas = {
+        "journal_mode": "WAL",
+        "busy_timeout": config["SQLITE_BUSY_TIMEOUT_MS"],
+        "synchronous": config["SQLITE_SYNCHRONOUS"],
+        "mmap_size": config["SQLITE_MMAP_SIZE"],
+        "cache_size": -config["SQLITE_CACHE_SIZE_KB"],
+    }
+    if engine.url.database in (None, "", ":memory:"):
+        pragmas.pop("journal_mode")
+
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_conn, _record):
+        cursor = dbapi_conn.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
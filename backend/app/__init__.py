@@ -1,14 +1,30 @@
 import logging
+import os
 
-from flask import Flask, jsonify, g
+from flask import Flask, jsonify, g, request
+from sqlalchemy import func
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 
 from app.api.routes import api_bp
 from app.auth.routes import auth_bp
 from app.config import CONFIG_MAP
-from app.extensions import bcrypt, cors, db, limiter, migrate
-from app.models import Group, Permission, User
+from app.extensions import bcrypt, cors, db, limiter
+from app.models import Group, Permission, User, group_permissions
+from app.services.mail import mail_worker
+from app.services.revocation import prune_revoked_tokens_command
+from app.services.rbac_sync import rbac_sync
+from app.services.search import search_reindex
+from app.services.stats import stats_rebuild
+from app.services.synthetic import seed_synthetic
+from app.utils.admission import init_admission, pool_options, readiness
 from app.utils.auth import ensure_request_id
-from app.utils.errors import error_response
+from app.utils.compression import init_compression
+from app.utils.errors import ApiError, error_response
+from app.utils.log import configure_logging
+from app.utils.profiling import finish_request_profile, profile_aggregate, start_request_profile
+from app.utils.sqlite import configure_sqlite
+from app.utils.startup import startup_profile
+from app.utils.traffic import mark_request_start, record_request, request_latency_ms
 
 
 DEFAULT_PERMISSIONS = [
@@ -21,25 +37,50 @@ DEFAULT_PERMISSIONS = [
 ]
 
 
-def create_app(config_name: str | None = None) -> Flask:
+def seed_is_current() -> bool:
+    present = Permission.query.filter(Permission.name.in_(DEFAULT_PERMISSIONS)).count()
+    if present != len(DEFAULT_PERMISSIONS) or Group.query.filter(Group.name.in_(["Admin", "Default"])).count() != 2:
+        return False
+    admin_grants = db.session.query(func.count()).select_from(group_permissions).join(Group).filter(Group.name == "Admin").scalar()
+    return admin_grants == Permission.query.count()
+
+
+access_log = logging.getLogger("app.access")
+
+
+def create_app(config_name: str | None = None, config_overrides: dict | None = None) -> Flask:
     app = Flask(__name__)
     cfg = config_name or "development"
     app.config.from_object(CONFIG_MAP[cfg])
+    if config_overrides:
+        app.config.update(config_overrides)
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {**pool_options(app.config), **app.config.get("SQLALCHEMY_ENGINE_OPTIONS", {})}
 
     db.init_app(app)
-    migrate.init_app(app, db)
+    with app.app_context():
+        configure_sqlite(db.engine, app.config)
+    if os.environ.get("FLASK_RUN_FROM_CLI") == "true":
+        # flask_migrate imports alembic (~300ms); only the `flask db` commands need it.
+        from flask_migrate import Migrate
+
+        Migrate(app, db)
     bcrypt.init_app(app)
     limiter.init_app(app)
     cors.init_app(app, resources={r"/api/*": {"origins": [app.config["FRONTEND_ORIGIN"]]}})
 
     app.register_blueprint(auth_bp)
     app.register_blueprint(api_bp)
+    init_compression(app)
 
-    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    configure_logging(app)
 
     @app.before_request
     def before_request():
+        mark_request_start()
         ensure_request_id()
+        start_request_profile()
+
+    init_admission(app)
 
     @app.after_request
     def after_request(resp):
@@ -47,7 +88,15 @@ def create_app(config_name: str | None = None) -> Flask:
         resp.headers["X-Content-Type-Options"] = "nosniff"
         resp.headers["X-Frame-Options"] = "DENY"
         resp.headers["Referrer-Policy"] = "same-origin"
-        return resp
+        if app.config["LOG_ACCESS"]:
+            access_log.info("request", extra={"status": resp.status_code, "latency_ms": request_latency_ms()})
+        return record_request(resp)
+
+    app.teardown_request(finish_request_profile)
+
+    @app.errorhandler(ApiError)
+    def api_error(exc):
+        return exc.to_response()
 
     @app.errorhandler(404)
     def not_found(_):
@@ -57,19 +106,45 @@ def create_app(config_name: str | None = None) -> Flask:
     def too_many(_):
         return error_response("RATE_LIMITED", "Too many requests", 429)
 
+    @app.errorhandler(PoolTimeoutError)
+    def pool_exhausted(_):
+        # Work outside the admission gates (batch sub-requests, CLI threads) can still drain the pool.
+        resp, status = error_response("OVERLOADED", "Server is busy, retry shortly", 503)
+        resp.headers["Retry-After"] = str(app.config["ADMISSION_RETRY_AFTER"])
+        return resp, status
+
     @app.errorhandler(500)
     def internal(_):
         return error_response("INTERNAL_ERROR", "Unexpected server error", 500)
 
     @app.route("/healthz")
     def healthz():
-        return jsonify({"ok": True})
+        if not request.args.get("ready"):
+            return jsonify({"ok": True})
+        # Readiness: tell the load balancer to back off while this worker is saturated.
+        ready, details = readiness()
+        resp = jsonify({"ok": ready, **details})
+        if not ready:
+            resp.status_code = 503
+            resp.headers["Retry-After"] = str(app.config["ADMISSION_RETRY_AFTER"])
+        return resp
+
+    app.cli.add_command(mail_worker)
+    app.cli.add_command(profile_aggregate)
+    app.cli.add_command(prune_revoked_tokens_command)
+    app.cli.add_command(rbac_sync)
+    app.cli.add_command(search_reindex)
+    app.cli.add_command(seed_synthetic)
+    app.cli.add_command(startup_profile)
+    app.cli.add_command(stats_rebuild)
 
     @app.cli.command("seed")
     def seed():
-        for p in DEFAULT_PERMISSIONS:
-            if not Permission.query.filter_by(name=p).first():
-                db.session.add(Permission(name=p))
+        if seed_is_current():
+            print("Seed data already present")
+            return
+        existing = {p.name for p in Permission.query.filter(Permission.name.in_(DEFAULT_PERMISSIONS))}
+        db.session.add_all(Permission(name=p) for p in DEFAULT_PERMISSIONS if p not in existing)
         admin = Group.query.filter_by(name="Admin").first()
         if not admin:
             admin = Group(name="Admin", description="Administrator group")
@@ -1,19 +1,25 @@
-from flask import Blueprint, jsonify, request, g
+from flask import Blueprint, current_app, jsonify, request, g
 
 from app.extensions import bcrypt, db
 from app.models import AuditLog, Group, Permission, User
 from app.schemas.payloads import (
-    GroupCreateSchema,
-    GroupMemberChangeSchema,
-    GroupPatchSchema,
-    GroupPermChangeSchema,
-    UserCreateSchema,
-    UserPatchSchema,
-    validate,
+    batch_schema,
+    group_create_schema,
+    group_member_change_schema,
+    group_patch_schema,
+    group_perm_change_schema,
+    rbac_policy_schema,
+    user_create_schema,
+    user_patch_schema,
 )
 from app.services.audit import log_event
-from app.utils.decorators import require_perm
-from app.utils.errors import error_response
+from app.services.batch import run_batch
+from app.services.rbac_sync import sync_policy
+from app.services.search import search
+from app.services.stats import get_stats
+from app.services.uow import transactional
+from app.utils.decorators import require_auth, require_perm
+from app.utils.errors import ApiError, error_response
 
 api_bp = Blueprint("api", __name__, url_prefix="/api")
 
@@ -40,25 +46,44 @@ def group_payload(group):
     }
 
 
+def search_args():
+    q = request.args.get("q", "").strip()
+    if not q:
+        raise ApiError("VALIDATION_ERROR", "Invalid request", 400, {"q": ["Missing data for required field."]})
+    limit = request.args.get("limit", 20, type=int)
+    return q, max(1, min(limit, current_app.config["SEARCH_MAX_LIMIT"]))
+
+
+def in_order(model, ids):
+    by_id = {row.id: row for row in model.query.filter(model.id.in_(ids))} if ids else {}
+    return [by_id[i] for i in ids if i in by_id]
+
+
 @api_bp.get("/users")
 @require_perm("users.read")
 def users_list():
     return jsonify({"items": [user_payload(user) for user in User.query.order_by(User.id).all()]})
 
 
+@api_bp.get("/users/search")
+@require_perm("users.read")
+def users_search():
+    users = in_order(User, search("users", *search_args()))
+    return jsonify({"items": [{"id": u.id, "email": u.email, "is_active": u.is_active} for u in users]})
+
+
 @api_bp.post("/users")
 @require_perm("users.write")
+@transactional
 def users_create():
-    data = validate(UserCreateSchema(), request.get_json(silent=True) or {})
-    if isinstance(data, dict) and "email" not in data:
-        return error_response("VALIDATION_ERROR", "Invalid request", 400, data)
+    data = user_create_schema.load(request.get_json(silent=True) or {})
     if User.query.filter_by(email=data["email"].lower()).first():
         return error_response("CONFLICT", "Email already exists", 409)
     user = User(email=data["email"].lower(), password_hash=bcrypt.generate_password_hash(data["password"]).decode())
     groups = Group.query.filter(Group.id.in_(data["group_ids"])).all() if data["group_ids"] else []
     user.groups = groups
     db.session.add(user)
-    db.session.commit()
+    db.session.flush()
     log_event("user.created", "user", target_id=user.id, actor_user_id=g.current_user.id)
     return jsonify(user_payload(user)), 201
 
@@ -72,18 +97,18 @@ def users_get(user_id):
 
 @api_bp.patch("/users/<int:user_id>")
 @require_perm("users.write")
+@transactional
 def users_patch(user_id):
     user = User.query.get_or_404(user_id)
-    data = validate(UserPatchSchema(), request.get_json(silent=True) or {})
-    if isinstance(data, dict) and not any(k in ["email", "is_active", "must_reset_password"] for k in data.keys()):
-        return error_response("VALIDATION_ERROR", "Invalid request", 400, data)
+    data = user_patch_schema.load(request.get_json(silent=True) or {})
+    if not data:
+        raise ApiError("VALIDATION_ERROR", "Invalid request", 400)
     if "email" in data:
         user.email = data["email"].lower()
     if "is_active" in data:
         user.is_active = data["is_active"]
     if "must_reset_password" in data:
         user.must_reset_password = data["must_reset_password"]
-    db.session.commit()
     log_event("user.updated", "user", target_id=user.id, actor_user_id=g.current_user.id, details=data)
     return jsonify(user_payload(user))
 
@@ -94,41 +119,46 @@ def groups_list():
     return jsonify({"items": [group_payload(group) for group in Group.query.order_by(Group.id).all()]})
 
 
+@api_bp.get("/groups/search")
+@require_perm("groups.read")
+def groups_search():
+    groups = in_order(Group, search("groups", *search_args()))
+    return jsonify({"items": [{"id": g.id, "name": g.name, "description": g.description} for g in groups]})
+
+
 @api_bp.post("/groups")
 @require_perm("groups.write")
+@transactional
 def groups_create():
-    data = validate(GroupCreateSchema(), request.get_json(silent=True) or {})
-    if isinstance(data, dict) and "name" not in data:
-        return error_response("VALIDATION_ERROR", "Invalid request", 400, data)
+    data = group_create_schema.load(request.get_json(silent=True) or {})
     group = Group(name=data["name"], description=data.get("description", ""))
     db.session.add(group)
-    db.session.commit()
+    db.session.flush()
     log_event("group.created", "group", target_id=group.id, actor_user_id=g.current_user.id)
     return jsonify(group_payload(group)), 201
 
 
 @api_bp.patch("/groups/<int:group_id>")
 @require_perm("groups.write")
+@transactional
 def groups_patch(group_id):
     group = Group.query.get_or_404(group_id)
-    data = validate(GroupPatchSchema(), request.get_json(silent=True) or {})
-    if isinstance(data, dict) and not any(k in ["name", "description"] for k in data.keys()):
-        return error_response("VALIDATION_ERROR", "Invalid request", 400, data)
+    data = group_patch_schema.load(request.get_json(silent=True) or {})
+    if not data:
+        raise ApiError("VALIDATION_ERROR", "Invalid request", 400)
     for key in ["name", "description"]:
         if key in data:
             setattr(group, key, data[key])
-    db.session.commit()
     log_event("group.updated", "group", target_id=group.id, actor_user_id=g.current_user.id, details=data)
     return jsonify(group_payload(group))
 
 
 @api_bp.post("/groups/<int:group_id>/members")
 @require_perm("groups.write")
+@transactional
 def groups_members(group_id):
     group = Group.query.get_or_404(group_id)
-    data = validate(GroupMemberChangeSchema(), request.get_json(silent=True) or {})
-    if isinstance(data, dict) and "user_id" not in data:
-        return error_response("VALIDATION_ERROR", "Invalid request", 400, data)
+    data = group_member_change_schema.load(request.get_json(silent=True) or {})
     user = User.query.get_or_404(data["user_id"])
     if data["action"] == "add" and user not in group.users:
         group.users.append(user)
@@ -136,18 +166,16 @@ def groups_members(group_id):
         group.users.remove(user)
     else:
         return error_response("VALIDATION_ERROR", "action must be add/remove", 400)
-    db.session.commit()
     log_event("group.membership_changed", "group", target_id=group.id, actor_user_id=g.current_user.id, details=data)
     return jsonify(group_payload(group))
 
 
 @api_bp.post("/groups/<int:group_id>/perms")
 @require_perm("groups.write")
+@transactional
 def groups_permissions(group_id):
     group = Group.query.get_or_404(group_id)
-    data = validate(GroupPermChangeSchema(), request.get_json(silent=True) or {})
-    if isinstance(data, dict) and "permission" not in data:
-        return error_response("VALIDATION_ERROR", "Invalid request", 400, data)
+    data = group_perm_change_schema.load(request.get_json(silent=True) or {})
     perm = Permission.query.filter_by(name=data["permission"]).first()
     if not perm:
         perm = Permission(name=data["permission"])
@@ -159,11 +187,20 @@ def groups_permissions(group_id):
         group.permissions.remove(perm)
     else:
         return error_response("VALIDATION_ERROR", "action must be add/remove", 400)
-    db.session.commit()
     log_event("group.permission_changed", "group", target_id=group.id, actor_user_id=g.current_user.id, details=data)
     return jsonify(group_payload(group))
 
 
+@api_bp.post("/rbac/sync")
+@require_perm("admin.panel")
+@transactional
+def rbac_sync():
+    policy = rbac_policy_schema.load(request.get_json(silent=True) or {})
+    dry_run = request.args.get("dry_run", "0").lower() in ("1", "true")
+    diff, summary = sync_policy(policy, dry_run=dry_run, actor_user_id=g.current_user.id)
+    return jsonify({"dry_run": dry_run, "summary": summary, **({"diff": diff} if dry_run else {})})
+
+
 @api_bp.get("/audit")
 @require_perm("audit.read")
 def audit_list():
@@ -177,3 +214,17 @@ def audit_list():
         "request_id": r.request_id,
         "created_at": r.created_at.isoformat(),
     } for r in rows]})
+
+
+@api_bp.get("/stats")
+@require_perm("admin.panel")
+def stats():
+    days = min(max(request.args.get("days", 30, type=int), 1), 366)
+    return jsonify(get_stats(days))
+
+
+@api_bp.post("/batch")
+@require_auth
+def batch():
+    data = batch_schema.load(request.get_json(silent=True) or {})
+    return jsonify({"responses": run_batch(data["requests"], parallel=data["parallel"])})
@@ -0,0 +1,188 @@
+"""ASGI entry point serving the hot read endpoints with an async DB driver.
+
+``GET /api/auth/me``, ``GET /api/users/<id>`` and ``GET /api/audit`` are
+answered natively on the event loop; every other request falls through to
+the regular Flask app via ``asgiref``. Requires ``requirements-async.txt``.
+"""
+import json
+import logging
+import re
+import uuid
+
+import jwt
+from asgiref.wsgi import WsgiToAsgi
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app import create_app
+from app.models import AuditLog, Permission, User, group_members, group_permissions
+from app.services.revocation import revocation_cache, revoked_jti_stmt
+from app.utils.auth import jwt_settings, subject_id
+from app.utils.decorators import has_permission
+from app.utils.errors import error_payload
+
+
+log = logging.getLogger(__name__)
+ASYNC_DRIVERS = {"postgresql": "postgresql+asyncpg", "sqlite": "sqlite+aiosqlite"}
+
+
+def async_database_url(url: str) -> str:
+    scheme, rest = url.split("://", 1)
+    base = scheme.split("+", 1)[0]
+    if base not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for {scheme}")
+    return f"{ASYNC_DRIVERS[base]}://{rest}"
+
+
+class HTTPError(Exception):
+    def __init__(self, status, code, message, details=None):
+        super().__init__(message)
+        self.status = status
+        self.body = error_payload(code, message, details)
+
+
+class AsyncReadApp:
+    def __init__(self, flask_app, engine=None):
+        self.flask_app = flask_app
+        self.fallback = WsgiToAsgi(flask_app)
+        self.engine = engine or create_async_engine(async_database_url(flask_app.config["SQLALCHEMY_DATABASE_URI"]))
+        with flask_app.app_context():
+            self.jwt = jwt_settings()
+            self.revocations = revocation_cache()
+        self.frontend_origin = flask_app.config["FRONTEND_ORIGIN"]
+        self.routes = [
+            (re.compile(r"/api/auth/me"), None, self.me),
+            (re.compile(r"/api/users/(\d+)"), "users.read", self.users_get),
+            (re.compile(r"/api/audit"), "audit.read", self.audit_list),
+        ]
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            return await self.lifespan(receive, send)
+        if scope["type"] == "http" and scope["method"] == "GET":
+            for pattern, permission, handler in self.routes:
+                match = pattern.fullmatch(scope["path"])
+                if match:
+                    return await self.dispatch(scope, send, permission, handler, match.groups())
+        return await self.fallback(scope, receive, send)
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self.engine.dispose()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def dispatch(self, scope, send, permission, handler, args):
+        headers = {k.decode("latin-1").lower(): v.decode("latin-1") for k, v in scope["headers"]}
+        request_id = headers.get("x-request-id") or str(uuid.uuid4())
+        try:
+            async with self.engine.connect() as conn:
+                user, perms = await self.authenticate(conn, headers)
+                if permission and not has_permission(perms, permission):
+                    raise HTTPError(403, "FORBIDDEN", "You do not have required permission", {"required": permission})
+                status, body = 200, await handler(conn, user, perms, *args)
+        except HTTPError as exc:
+            status, body = exc.status, exc.body
+        except Exception:
+            # Same envelope as the Flask 500 handler instead of a bare server error.
+            log.exception("async read %s failed", scope["path"])
+            status, body = 500, error_payload("INTERNAL_ERROR", "Unexpected server error")
+        await self.respond(send, status, body, request_id, headers.get("origin"))
+
+    async def authenticate(self, conn, headers):
+        # Mirrors require_auth: any failure is a uniform 401.
+        unauthorized = HTTPError(401, "UNAUTHORIZED", "Authentication required")
+        auth_header = headers.get("authorization", "")
+        if not auth_header.startswith("Bearer "):
+            raise unauthorized
+        try:
+            payload = jwt.decode(auth_header.split(" ", 1)[1], self.jwt["key"], algorithms=self.jwt["algorithms"])
+        except jwt.PyJWTError:
+            raise unauthorized
+        if "jti" in payload and await self.is_revoked(conn, payload["jti"]):
+            raise unauthorized
+        user_id = subject_id(payload)
+        if user_id is None:
+            raise unauthorized
+        user = (await conn.execute(select(User.__table__).where(User.id == user_id))).mappings().first()
+        if not user or not user["is_active"]:
+            raise unauthorized
+        return user, await self.user_permissions(conn, user["id"])
+
+    async def is_revoked(self, conn, jti):
+        cache = self.revocations
+        if cache.needs_refresh():
+            stmt, full = cache.refresh_stmt()
+            cache.apply((await conn.execute(stmt)).all(), full)
+        verdict = cache.check(jti)
+        if verdict is None:
+            verdict = (await conn.execute(revoked_jti_stmt(jti))).first() is not None
+        return verdict
+
+    async def user_permissions(self, conn, user_id):
+        perms = await conn.execute(
+            select(Permission.name)
+            .join(group_permissions, group_permissions.c.permission_id == Permission.id)
+            .join(group_members, group_members.c.group_id == group_permissions.c.group_id)
+            .where(group_members.c.user_id == user_id)
+            .distinct()
+        )
+        return sorted(perms.scalars())
+
+    async def me(self, conn, user, perms):
+        return {"user": self.user_fields(user, perms)}
+
+    async def users_get(self, conn, user, perms, user_id):
+        target = (await conn.execute(select(User.__table__).where(User.id == int(user_id)))).mappings().first()
+        if not target:
+            raise HTTPError(404, "NOT_FOUND", "Resource not found")
+        if target["id"] != user["id"]:
+            perms = await self.user_permissions(conn, target["id"])
+        group_ids = await conn.execute(select(group_members.c.group_id).where(group_members.c.user_id == target["id"]))
+        return {**self.user_fields(target, perms), "group_ids": list(group_ids.scalars())}
+
+    async def audit_list(self, conn, user, perms):
+        rows = await conn.execute(select(AuditLog.__table__).order_by(AuditLog.created_at.desc()).limit(200))
+        return {"items": [{
+            "id": r["id"],
+            "event_type": r["event_type"],
+            "target_type": r["target_type"],
+            "target_id": r["target_id"],
+            "details": r["details"],
+            "request_id": r["request_id"],
+            "created_at": r["created_at"].isoformat(),
+        } for r in rows.mappings()]}
+
+    @staticmethod
+    def user_fields(user, perms):
+        return {
+            "id": user["id"],
+            "email": user["email"],
+            "is_active": user["is_active"],
+            "is_email_verified": user["is_email_verified"],
+            "must_reset_password": user["must_reset_password"],
+            "permissions": perms,
+        }
+
+    async def respond(self, send, status, body, request_id, origin):
+        payload = (json.dumps(body, sort_keys=True, separators=(",", ":")) + "\n").encode()
+        headers = [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(payload)).encode()),
+            (b"x-request-id", request_id.encode("latin-1")),
+            (b"x-content-type-options", b"nosniff"),
+            (b"x-frame-options", b"DENY"),
+            (b"referrer-policy", b"same-origin"),
+        ]
+        if origin and origin == self.frontend_origin:
+            headers += [(b"access-control-allow-origin", origin.encode("latin-1")), (b"vary", b"Origin")]
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": payload})
+
+
+def create_asgi_app(config_name: str | None = None, config_overrides: dict | None = None):
+    return AsyncReadApp(create_app(config_name, config_overrides))
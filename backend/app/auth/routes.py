@@ -1,13 +1,17 @@
 from datetime import datetime, timedelta, timezone
 import secrets
 
+import jwt
 from flask import Blueprint, current_app, g, jsonify, request
 
 from app.extensions import bcrypt, db, limiter
 from app.models import EmailVerificationToken, PasswordResetToken, User
-from app.schemas.payloads import LoginSchema, RequestPasswordResetSchema, ResetPasswordSchema, VerifyTokenSchema, validate
+from app.schemas.payloads import login_schema, request_password_reset_schema, reset_password_schema, verify_token_schema
 from app.services.audit import log_event
-from app.utils.auth import make_jwt
+from app.services.mail import enqueue_email
+from app.services.revocation import revoke_token
+from app.services.uow import transactional
+from app.utils.auth import decode_jwt, make_jwt, subject_id
 from app.utils.decorators import require_auth
 from app.utils.errors import error_response
 
@@ -29,9 +33,7 @@ def _public_user_payload(user):
 @auth_bp.post("/login")
 @limiter.limit("5/minute")
 def login():
-    data = validate(LoginSchema(), request.get_json(silent=True) or {})
-    if isinstance(data, dict) and "email" not in data:
-        return error_response("VALIDATION_ERROR", "Invalid request", 400, data)
+    data = login_schema.load(request.get_json(silent=True) or {})
 
     user = User.query.filter_by(email=data["email"].lower()).first()
     now = datetime.now(timezone.utc)
@@ -58,7 +60,18 @@ def login():
 
 
 @auth_bp.post("/logout")
+@transactional
 def logout():
+    auth_header = request.headers.get("Authorization", "")
+    if auth_header.startswith("Bearer "):
+        try:
+            payload = decode_jwt(auth_header.split(" ", 1)[1])
+        except jwt.PyJWTError:
+            payload = None
+        if payload and "jti" in payload:
+            revoke_token(payload)
+            user_id = subject_id(payload)
+            log_event("logout", "user", target_id=user_id, actor_user_id=user_id)
     return jsonify({"ok": True})
 
 
@@ -71,16 +84,15 @@ def me():
 @auth_bp.post("/request-password-reset")
 @limiter.limit("5/hour")
 def request_password_reset():
-    data = validate(RequestPasswordResetSchema(), request.get_json(silent=True) or {})
-    if isinstance(data, dict) and "email" not in data:
-        return error_response("VALIDATION_ERROR", "Invalid request", 400, data)
+    data = request_password_reset_schema.load(request.get_json(silent=True) or {})
     user = User.query.filter_by(email=data["email"].lower()).first()
     if user:
         token = secrets.token_urlsafe(32)
         rec = PasswordResetToken(user_id=user.id, token=token, expires_at=datetime.now(timezone.utc) + timedelta(hours=1))
         db.session.add(rec)
+        link = f"{current_app.config['FRONTEND_ORIGIN']}/reset-password?token={token}"
+        enqueue_email(user.email, "Reset your password", f"Use this link within the next hour to choose a new password:\n\n{link}\n")
         db.session.commit()
-        print(f"[dev-email] Password reset link: {current_app.config['FRONTEND_ORIGIN']}/reset-password?token={token}")
         log_event("password_reset.requested", "user", target_id=user.id, actor_user_id=user.id)
     return jsonify({"ok": True})
 
@@ -88,9 +100,7 @@ def request_password_reset():
 @auth_bp.post("/reset-password")
 @limiter.limit("10/hour")
 def reset_password():
-    data = validate(ResetPasswordSchema(), request.get_json(silent=True) or {})
-    if isinstance(data, dict) and "token" not in data:
-        return error_response("VALIDATION_ERROR", "Invalid request", 400, data)
+    data = reset_password_schema.load(request.get_json(silent=True) or {})
     rec = PasswordResetToken.query.filter_by(token=data["token"]).first()
     if not rec or rec.used_at is not None or rec.expires_at < datetime.now(timezone.utc):
         return error_response("TOKEN_INVALID", "Reset token is invalid", 400)
@@ -109,16 +119,15 @@ def request_email_verify():
     token = secrets.token_urlsafe(32)
     rec = EmailVerificationToken(user_id=g.current_user.id, token=token, expires_at=datetime.now(timezone.utc) + timedelta(hours=24))
     db.session.add(rec)
+    link = f"{current_app.config['FRONTEND_ORIGIN']}/verify-email?token={token}"
+    enqueue_email(g.current_user.email, "Verify your email address", f"Confirm your email address with this link:\n\n{link}\n")
     db.session.commit()
-    print(f"[dev-email] Email verify link: {current_app.config['FRONTEND_ORIGIN']}/verify-email?token={token}")
     return jsonify({"ok": True})
 
 
 @auth_bp.post("/verify-email")
 def verify_email():
-    data = validate(VerifyTokenSchema(), request.get_json(silent=True) or {})
-    if isinstance(data, dict) and "token" not in data:
-        return error_response("VALIDATION_ERROR", "Invalid request", 400, data)
+    data = verify_token_schema.load(request.get_json(silent=True) or {})
     rec = EmailVerificationToken.query.filter_by(token=data["token"]).first()
     if not rec or rec.used_at is not None or rec.expires_at < datetime.now(timezone.utc):
         return error_response("TOKEN_INVALID", "Verify token is invalid", 400)
@@ -1,6 +1,11 @@
 import os
 
 
+def _optional_int(name):
+    value = os.getenv(name)
+    return int(value) if value else None
+
+
 class Config:
     SECRET_KEY = os.getenv("SECRET_KEY", "dev-secret-change")
     SQLALCHEMY_TRACK_MODIFICATIONS = False
@@ -8,6 +13,55 @@ class Config:
     JWT_REMEMBER_DAYS = int(os.getenv("JWT_REMEMBER_DAYS", "14"))
     FRONTEND_ORIGIN = os.getenv("FRONTEND_ORIGIN", "http://localhost:5173")
     RATE_LIMIT_STORAGE_URI = os.getenv("RATE_LIMIT_STORAGE_URI", "memory://")
+    PROFILE_ENABLED = os.getenv("PROFILE_ENABLED", "0") == "1"
+    PROFILE_SAMPLE_RATE = int(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+    PROFILE_HEADER_SECRET = os.getenv("PROFILE_HEADER_SECRET", "")
+    PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+    TRAFFIC_RECORD_PATH = os.getenv("TRAFFIC_RECORD_PATH", "")
+    REVOCATION_REFRESH_SECONDS = float(os.getenv("REVOCATION_REFRESH_SECONDS", "5"))
+    REVOCATION_REFRESH_OVERLAP_SECONDS = float(os.getenv("REVOCATION_REFRESH_OVERLAP_SECONDS", "60"))
+    REVOCATION_FULL_REFRESH_SECONDS = float(os.getenv("REVOCATION_FULL_REFRESH_SECONDS", "300"))
+    REVOCATION_BLOOM_CAPACITY = int(os.getenv("REVOCATION_BLOOM_CAPACITY", "100000"))
+    REVOCATION_BLOOM_ERROR_RATE = float(os.getenv("REVOCATION_BLOOM_ERROR_RATE", "0.001"))
+    BATCH_MAX_REQUESTS = int(os.getenv("BATCH_MAX_REQUESTS", "20"))
+    BATCH_MAX_WORKERS = int(os.getenv("BATCH_MAX_WORKERS", "4"))
+    SEARCH_MAX_LIMIT = int(os.getenv("SEARCH_MAX_LIMIT", "100"))
+    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+    LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+    LOG_ACCESS = os.getenv("LOG_ACCESS", "1") == "1"
+    MAIL_BACKEND = os.getenv("MAIL_BACKEND", "console")
+    MAIL_FROM = os.getenv("MAIL_FROM", "no-reply@localhost")
+    MAIL_SMTP_HOST = os.getenv("MAIL_SMTP_HOST", "localhost")
+    MAIL_SMTP_PORT = int(os.getenv("MAIL_SMTP_PORT", "25"))
+    MAIL_SMTP_USERNAME = os.getenv("MAIL_SMTP_USERNAME", "")
+    MAIL_SMTP_PASSWORD = os.getenv("MAIL_SMTP_PASSWORD", "")
+    MAIL_SMTP_USE_TLS = os.getenv("MAIL_SMTP_USE_TLS", "0") == "1"
+    MAIL_SMTP_POOL_SIZE = int(os.getenv("MAIL_SMTP_POOL_SIZE", "2"))
+    MAIL_MAX_ATTEMPTS = int(os.getenv("MAIL_MAX_ATTEMPTS", "6"))
+    MAIL_RETRY_BASE_SECONDS = float(os.getenv("MAIL_RETRY_BASE_SECONDS", "30"))
+    MAIL_RETRY_MAX_SECONDS = float(os.getenv("MAIL_RETRY_MAX_SECONDS", "3600"))
+    ADMISSION_ENABLED = os.getenv("ADMISSION_ENABLED", "1") == "1"
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "2"))
+    # Unset caps are derived from DB_POOL_SIZE + DB_MAX_OVERFLOW (see admission_limits).
+    ADMISSION_MAX_INFLIGHT = _optional_int("ADMISSION_MAX_INFLIGHT")
+    ADMISSION_AUTH_LIMIT = _optional_int("ADMISSION_AUTH_LIMIT")
+    ADMISSION_API_LIMIT = _optional_int("ADMISSION_API_LIMIT")
+    ADMISSION_ROUTE_LIMITS = os.getenv("ADMISSION_ROUTE_LIMITS", "api.batch=4,api.rbac_sync=1")
+    ADMISSION_QUEUE_TIMEOUT_MS = int(os.getenv("ADMISSION_QUEUE_TIMEOUT_MS", "250"))
+    ADMISSION_RETRY_AFTER = int(os.getenv("ADMISSION_RETRY_AFTER", "1"))
+    ADMISSION_READY_THRESHOLD = float(os.getenv("ADMISSION_READY_THRESHOLD", "0.9"))
+    SQLITE_TUNING = os.getenv("SQLITE_TUNING", "1") == "1"
+    SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+    SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+    SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", "65536"))
+    SQLITE_WRITE_RETRIES = int(os.getenv("SQLITE_WRITE_RETRIES", "3"))
+    COMPRESS_ENABLED = os.getenv("COMPRESS_ENABLED", "1") == "1"
+    COMPRESS_MIN_SIZE = int(os.getenv("COMPRESS_MIN_SIZE", "1024"))
+    COMPRESS_LEVEL = int(os.getenv("COMPRESS_LEVEL", "6"))
+    COMPRESS_MIMETYPES = ("application/json", "text/html", "text/plain", "text/css", "text/csv", "application/javascript")
+    COMPRESS_EXCLUDE_PATHS = ("/healthz",)
 
 
 class DevelopmentConfig(Config):
@@ -2,12 +2,10 @@ from flask_bcrypt import Bcrypt
 from flask_cors import CORS
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
-from flask_migrate import Migrate
 from flask_sqlalchemy import SQLAlchemy
 
 
 db = SQLAlchemy()
-migrate = Migrate()
 bcrypt = Bcrypt()
 cors = CORS()
 limiter = Limiter(key_func=get_remote_address)
@@ -1,5 +1,7 @@
 from datetime import datetime, timezone
 
+from sqlalchemy.orm import validates
+
 from app.extensions import db
 
 
@@ -88,3 +90,45 @@ class AuditLog(db.Model):
     details = db.Column(db.JSON, nullable=True)
     request_id = db.Column(db.String(64), nullable=True, index=True)
     created_at = db.Column(db.DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False)
+
+    @validates("created_at")
+    def _created_at_utc(self, _key, value):
+        # SQLite keeps only the wall time, so store UTC to keep date(created_at) a UTC day.
+        return value.astimezone(timezone.utc) if value is not None and value.tzinfo is not None else value
+
+
+class RevokedToken(db.Model):
+    __tablename__ = "revoked_tokens"
+
+    id = db.Column(db.Integer, primary_key=True)
+    jti = db.Column(db.String(64), unique=True, nullable=False, index=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=True)
+    expires_at = db.Column(db.DateTime(timezone=True), nullable=False, index=True)
+    # Indexed for the workers' incremental ``revoked_at >= watermark`` refreshes.
+    revoked_at = db.Column(db.DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False, index=True)
+
+
+class OutboundEmail(db.Model):
+    __tablename__ = "outbound_emails"
+    __table_args__ = (db.Index("ix_outbound_emails_status_next_attempt", "status", "next_attempt_at"),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    to_address = db.Column(db.String(255), nullable=False)
+    subject = db.Column(db.String(255), nullable=False)
+    body = db.Column(db.Text, nullable=False)
+    status = db.Column(db.String(16), default="pending", nullable=False)
+    attempts = db.Column(db.Integer, default=0, nullable=False)
+    next_attempt_at = db.Column(db.DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False)
+    last_error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False)
+    sent_at = db.Column(db.DateTime(timezone=True), nullable=True)
+
+
+class StatCounter(db.Model):
+    """Incrementally maintained counters; see ``app.services.stats``."""
+
+    __tablename__ = "stat_counters"
+
+    name = db.Column(db.String(64), primary_key=True)
+    key = db.Column(db.String(160), primary_key=True, default="")
+    value = db.Column(db.BigInteger, default=0, nullable=False)
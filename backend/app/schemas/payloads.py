@@ -1,4 +1,6 @@
-from marshmallow import Schema, ValidationError, fields
+from marshmallow import RAISE, Schema, ValidationError, fields, missing, validate
+
+from app.utils.errors import ApiError
 
 
 class LoginSchema(Schema):
@@ -52,8 +54,98 @@ class GroupPermChangeSchema(Schema):
     action = fields.String(required=True)
 
 
-def validate(schema, payload):
-    try:
-        return schema.load(payload)
-    except ValidationError as exc:
-        return exc.messages
+class BatchItemSchema(Schema):
+    method = fields.String(required=True, validate=validate.OneOf(["GET", "POST", "PATCH", "DELETE"]))
+    path = fields.String(required=True)
+    body = fields.Raw(load_default=None)
+
+
+class BatchSchema(Schema):
+    requests = fields.List(fields.Nested(BatchItemSchema), required=True, validate=validate.Length(min=1))
+    parallel = fields.Boolean(load_default=False)
+
+
+class GroupPolicySchema(Schema):
+    description = fields.String()
+    permissions = fields.List(fields.String(), load_default=list)
+    members = fields.List(fields.Email(), load_default=None, allow_none=True)
+
+
+class RbacPolicySchema(Schema):
+    permissions = fields.List(fields.String(), load_default=list)
+    groups = fields.Dict(keys=fields.String(), values=fields.Nested(GroupPolicySchema), required=True)
+    prune = fields.Boolean(load_default=False)
+
+
+_FAST_TYPES = {fields.String: str, fields.Email: str, fields.Boolean: bool, fields.Integer: int}
+
+
+class CompiledSchema:
+    """A schema instance built once, with a fast path for flat payloads.
+
+    Payloads whose values already have the exact field types are checked by
+    hand; anything else (coercion, missing required fields, unknown keys)
+    falls back to ``Schema.load`` so results and error messages are unchanged.
+    """
+
+    def __init__(self, schema_cls):
+        self.schema = schema_cls()
+        self.fields = self._compile(self.schema)
+        self.names = frozenset(self.schema.load_fields)
+
+    @staticmethod
+    def _compile(schema):
+        if any(schema._hooks.values()) or schema.unknown != RAISE:
+            return None
+        compiled = []
+        for name, field in schema.load_fields.items():
+            if type(field) not in _FAST_TYPES or field.data_key or field.attribute:
+                return None
+            compiled.append((name, _FAST_TYPES[type(field)], field.required, field.load_default, tuple(field.validators)))
+        return compiled
+
+    def _fast_load(self, payload):
+        if type(payload) is not dict or not payload.keys() <= self.names:
+            return None
+        data = {}
+        for name, expected, required, default, validators in self.fields:
+            if name not in payload:
+                if required:
+                    return None
+                if default is not missing:
+                    data[name] = default() if callable(default) else default
+                continue
+            value = payload[name]
+            if type(value) is not expected:
+                return None
+            for validator in validators:
+                try:
+                    validator(value)
+                except ValidationError:
+                    return None
+            data[name] = value
+        return data
+
+    def load(self, payload):
+        if self.fields is not None:
+            data = self._fast_load(payload)
+            if data is not None:
+                return data
+        try:
+            return self.schema.load(payload)
+        except ValidationError as exc:
+            raise ApiError("VALIDATION_ERROR", "Invalid request", 400, exc.messages)
+
+
+login_schema = CompiledSchema(LoginSchema)
+request_password_reset_schema = CompiledSchema(RequestPasswordResetSchema)
+reset_password_schema = CompiledSchema(ResetPasswordSchema)
+verify_token_schema = CompiledSchema(VerifyTokenSchema)
+user_create_schema = CompiledSchema(UserCreateSchema)
+user_patch_schema = CompiledSchema(UserPatchSchema)
+group_create_schema = CompiledSchema(GroupCreateSchema)
+group_patch_schema = CompiledSchema(GroupPatchSchema)
+group_member_change_schema = CompiledSchema(GroupMemberChangeSchema)
+group_perm_change_schema = CompiledSchema(GroupPermChangeSchema)
+batch_schema = CompiledSchema(BatchSchema)
+rbac_policy_schema = CompiledSchema(RbacPolicySchema)
@@ -2,6 +2,7 @@ from flask import g
 
 from app.extensions import db
 from app.models import AuditLog
+from app.services.uow import in_unit_of_work
 
 
 def log_event(event_type: str, target_type: str, target_id=None, actor_user_id=None, details=None):
@@ -14,4 +15,5 @@ def log_event(event_type: str, target_type: str, target_id=None, actor_user_id=N
         request_id=getattr(g, "request_id", None),
     )
     db.session.add(log)
-    db.session.commit()
+    if not in_unit_of_work():
+        db.session.commit()
@@ -0,0 +1,49 @@
+"""Dispatch ``POST /api/batch`` sub-requests through the regular blueprints.
+
+Every sub-request runs in its own app and request context (own session, own
+unit of work) but reuses the caller's already authenticated user, so the JWT
+is decoded and permissions are resolved once per batch. Sub-requests are not
+atomic as a group: each write commits or rolls back on its own.
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import current_app, g, request
+
+from app.utils.errors import ApiError
+
+
+def _dispatch(app, user, item, headers, remote_addr):
+    with app.app_context():
+        g.batch_user = user
+        with app.test_request_context(
+            item["path"], method=item["method"], json=item["body"], headers=headers,
+            environ_base={"REMOTE_ADDR": remote_addr},
+        ):
+            try:
+                resp = app.full_dispatch_request()
+            except Exception as exc:
+                resp = app.make_response(app.handle_exception(exc))
+            return {"status": resp.status_code, "body": resp.get_json(silent=True)}
+
+
+def run_batch(items, parallel=False):
+    app = current_app._get_current_object()
+    if len(items) > app.config["BATCH_MAX_REQUESTS"]:
+        raise ApiError("VALIDATION_ERROR", "Too many sub-requests", 400, {"max": app.config["BATCH_MAX_REQUESTS"]})
+    for item in items:
+        if not item["path"].startswith("/api/") or item["path"].split("?", 1)[0] == "/api/batch":
+            raise ApiError("VALIDATION_ERROR", "Sub-request path not allowed", 400, {"path": item["path"]})
+
+    user = g.current_user
+    # Load the permission graph up front so worker threads only read already-populated attributes.
+    user.permissions()
+    auth_header = request.headers.get("Authorization", "")
+    remote_addr = request.remote_addr
+    calls = [
+        (app, user, item, {"Authorization": auth_header, "X-Request-ID": f"{g.request_id}.{i}"}, remote_addr)
+        for i, item in enumerate(items)
+    ]
+    if parallel and len(calls) > 1 and all(item["method"] == "GET" for item in items):
+        with ThreadPoolExecutor(max_workers=min(len(calls), app.config["BATCH_MAX_WORKERS"])) as pool:
+            return list(pool.map(lambda args: _dispatch(*args), calls))
+    return [_dispatch(*args) for args in calls]
@@ -0,0 +1,240 @@
+"""Outbound email queue and the ``flask mail-worker`` delivery loop.
+
+Request handlers only ``enqueue_email`` (one row in the caller's transaction).
+The worker claims due rows in batches, sends them over a small pool of
+reusable SMTP connections and reschedules failures with exponential backoff.
+"""
+import logging
+import queue
+import random
+import smtplib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from email.message import EmailMessage
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from sqlalchemy import select
+
+from app.extensions import db
+from app.models import OutboundEmail
+
+
+log = logging.getLogger(__name__)
+
+
+def enqueue_email(to_address, subject, body):
+    message = OutboundEmail(to_address=to_address, subject=subject, body=body)
+    db.session.add(message)
+    return message
+
+
+class ConsoleBackend:
+    def send(self, message):
+        log.info("email", extra={"to": message["To"], "subject": message["Subject"], "body": message.get_content()})
+
+    def close(self):
+        pass
+
+
+class SMTPPool:
+    """Keeps up to ``size`` authenticated SMTP connections open between batches.
+
+    At most ``size`` connections exist at once; senders beyond that wait for
+    one to be returned, however many delivery threads share the pool.
+    """
+
+    def __init__(self, host, port, username=None, password=None, use_tls=False, timeout=10.0, size=2):
+        self.host, self.port = host, port
+        self.username, self.password = username, password
+        self.use_tls = use_tls
+        self.timeout = timeout
+        self.size = size
+        self.idle = queue.LifoQueue()
+        self.open = 0
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        conn = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        if self.use_tls:
+            conn.starttls()
+        if self.username:
+            conn.login(self.username, self.password)
+        return conn
+
+    def _open(self):
+        try:
+            return self._connect()
+        except BaseException:
+            with self._lock:
+                self.open -= 1
+            raise
+
+    def _acquire(self):
+        while True:
+            try:
+                conn = self.idle.get_nowait()
+            except queue.Empty:
+                with self._lock:
+                    can_open = self.open < self.size
+                    if can_open:
+                        self.open += 1
+                if can_open:
+                    return self._open()
+                # Every connection is in use: wait for one to be returned or discarded.
+                conn = self.idle.get()
+            if conn is None:
+                continue
+            try:
+                if conn.noop()[0] == 250:
+                    return conn
+            except smtplib.SMTPException:
+                pass
+            self._discard(conn)
+
+    @staticmethod
+    def _close_quietly(conn):
+        try:
+            conn.close()
+        except OSError:
+            pass
+
+    def _discard(self, conn):
+        self._close_quietly(conn)
+        with self._lock:
+            self.open -= 1
+        # Wake a sender waiting in _acquire so it can open a replacement.
+        self.idle.put(None)
+
+    def send(self, message):
+        conn = self._acquire()
+        try:
+            conn.send_message(message)
+        except (smtplib.SMTPServerDisconnected, OSError):
+            self._discard(conn)
+            raise
+        except smtplib.SMTPException:
+            # The connection is still usable after a per-message rejection.
+            self.idle.put(conn)
+            raise
+        self.idle.put(conn)
+
+    def close(self):
+        while True:
+            try:
+                conn = self.idle.get_nowait()
+            except queue.Empty:
+                return
+            if conn is None:
+                continue
+            try:
+                conn.quit()
+            except (smtplib.SMTPException, OSError):
+                self._close_quietly(conn)
+            with self._lock:
+                self.open -= 1
+
+
+def make_backend(cfg):
+    if cfg["MAIL_BACKEND"] == "smtp":
+        return SMTPPool(cfg["MAIL_SMTP_HOST"], cfg["MAIL_SMTP_PORT"], cfg["MAIL_SMTP_USERNAME"] or None,
+                        cfg["MAIL_SMTP_PASSWORD"], cfg["MAIL_SMTP_USE_TLS"], size=cfg["MAIL_SMTP_POOL_SIZE"])
+    return ConsoleBackend()
+
+
+def retry_delay(attempts, base, cap):
+    delay = min(cap, base * 2 ** (attempts - 1))
+    return delay * random.uniform(0.8, 1.2)
+
+
+def claim_batch(limit):
+    stmt = (
+        select(OutboundEmail)
+        .where(OutboundEmail.status == "pending", OutboundEmail.next_attempt_at <= datetime.now(timezone.utc))
+        .order_by(OutboundEmail.next_attempt_at, OutboundEmail.id)
+        .limit(limit)
+    )
+    if db.session.get_bind().dialect.name == "postgresql":
+        # Lets several mail workers run side by side without sending a row twice.
+        stmt = stmt.with_for_update(skip_locked=True)
+    return db.session.execute(stmt).scalars().all()
+
+
+def _to_message(row, sender):
+    message = EmailMessage()
+    message["From"] = sender
+    message["To"] = row.to_address
+    message["Subject"] = row.subject
+    message.set_content(row.body)
+    return message
+
+
+def deliver_batch(backend, batch_size=50, workers=1):
+    """Send one batch of due messages; returns ``{"sent": n, "retried": n, "failed": n}``."""
+    cfg = current_app.config
+    rows = claim_batch(batch_size)
+    counts = {"sent": 0, "retried": 0, "failed": 0}
+    if not rows:
+        db.session.rollback()
+        return counts
+
+    def attempt(row_message):
+        try:
+            backend.send(row_message)
+            return None
+        except (smtplib.SMTPException, OSError) as exc:
+            return f"{type(exc).__name__}: {exc}"
+
+    messages = [_to_message(row, cfg["MAIL_FROM"]) for row in rows]
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(rows)))) as pool:
+        errors = list(pool.map(attempt, messages))
+
+    now = datetime.now(timezone.utc)
+    for row, error in zip(rows, errors):
+        row.attempts += 1
+        if error is None:
+            row.status, row.sent_at, row.last_error = "sent", now, None
+            counts["sent"] += 1
+        elif row.attempts >= cfg["MAIL_MAX_ATTEMPTS"]:
+            row.status, row.last_error = "failed", error
+            counts["failed"] += 1
+        else:
+            row.last_error = error
+            row.next_attempt_at = now + timedelta(seconds=retry_delay(row.attempts, cfg["MAIL_RETRY_BASE_SECONDS"], cfg["MAIL_RETRY_MAX_SECONDS"]))
+            counts["retried"] += 1
+    db.session.commit()
+    return counts
+
+
+@click.command("mail-worker")
+@click.option("--once", is_flag=True, help="Deliver everything currently due, then exit.")
+@click.option("--batch-size", default=50, show_default=True)
+@click.option("--poll-interval", default=2.0, show_default=True, help="Seconds to sleep when the queue is empty.")
+@with_appcontext
+def mail_worker(once, batch_size, poll_interval):
+    """Deliver queued outbound email."""
+    cfg = current_app.config
+    backend = make_backend(cfg)
+    workers = cfg["MAIL_SMTP_POOL_SIZE"] if cfg["MAIL_BACKEND"] == "smtp" else 1
+    totals = {"sent": 0, "retried": 0, "failed": 0}
+    try:
+        while True:
+            counts = deliver_batch(backend, batch_size, workers)
+            for key, value in counts.items():
+                totals[key] += value
+            if any(counts.values()):
+                log.info("mail batch delivered", extra=counts)
+            elif once:
+                # Retried rows are rescheduled into the future, so an empty claim means nothing is due.
+                break
+            else:
+                time.sleep(poll_interval)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        backend.close()
+        db.session.remove()
+    print(f"Mail worker stopped: {totals}")
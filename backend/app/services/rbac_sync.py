@@ -0,0 +1,171 @@
+"""Apply a declarative RBAC policy with the minimal set of inserts and deletes.
+
+Policy shape (``members`` is optional; omit it to leave memberships alone)::
+
+    {
+      "permissions": ["reports.read"],
+      "groups": {
+        "Admin": {"description": "Administrators", "permissions": ["users.read"], "members": ["a@example.com"]}
+      },
+      "prune": false
+    }
+
+Listed groups end up with exactly the listed permissions (and members).
+With ``prune`` set, groups missing from the policy are deleted.
+"""
+import json
+
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import bindparam, delete, insert, select, tuple_, update
+
+from app.extensions import db
+from app.models import Group, Permission, StatCounter, User, group_members, group_permissions
+from app.schemas.payloads import rbac_policy_schema
+from app.services.audit import log_event
+from app.services.search import reindex_rows
+from app.services.stats import add_delta
+from app.utils.errors import ApiError
+
+
+CHUNK = 500
+
+
+def _chunks(items, size=CHUNK):
+    items = list(items)
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def _ids_by_name(model, column, names):
+    found = {}
+    for chunk in _chunks(names):
+        found.update(db.session.execute(select(column, model.id).where(column.in_(chunk))).all())
+    return found
+
+
+def _pairs(table, left, group_ids):
+    pairs = set()
+    for chunk in _chunks(group_ids):
+        pairs.update(db.session.execute(select(table.c.group_id, left).where(table.c.group_id.in_(chunk))).all())
+    return pairs
+
+
+def plan(policy):
+    groups = policy["groups"]
+    perm_names = set(policy.get("permissions", []))
+    for spec in groups.values():
+        perm_names.update(spec["permissions"])
+
+    perm_ids = dict(db.session.execute(select(Permission.name, Permission.id)).all())
+    existing_groups = {name: (gid, desc) for gid, name, desc in db.session.execute(select(Group.id, Group.name, Group.description))}
+    emails = {email.lower() for spec in groups.values() for email in spec.get("members") or []}
+    user_ids = _ids_by_name(User, User.email, emails)
+    unknown = sorted(emails - user_ids.keys())
+    if unknown:
+        raise ApiError("VALIDATION_ERROR", "Policy references unknown users", 400, {"members": unknown[:50]})
+
+    diff = {
+        "permissions_created": sorted(perm_names - perm_ids.keys()),
+        "groups_created": sorted(name for name in groups if name not in existing_groups),
+        "groups_updated": sorted(
+            name for name, spec in groups.items()
+            if name in existing_groups and "description" in spec and existing_groups[name][1] != spec["description"]
+        ),
+        "groups_deleted": sorted(name for name in existing_groups if name not in groups) if policy.get("prune") else [],
+    }
+
+    # Pairs are (group name, permission name / user id) so they are valid before new rows have ids.
+    id_to_group = {gid: name for name, (gid, _) in existing_groups.items() if name in groups}
+    id_to_perm = {pid: name for name, pid in perm_ids.items()}
+    current_perms = {(id_to_group[gid], id_to_perm[pid]) for gid, pid in _pairs(group_permissions, group_permissions.c.permission_id, id_to_group)}
+    wanted_perms = {(name, perm) for name, spec in groups.items() for perm in spec["permissions"]}
+    diff["grants_added"] = sorted(wanted_perms - current_perms)
+    diff["grants_removed"] = sorted(current_perms - wanted_perms)
+
+    managed = {name for name, spec in groups.items() if spec.get("members") is not None}
+    current_members = {
+        (id_to_group[gid], uid) for gid, uid in _pairs(group_members, group_members.c.user_id, [g for g, n in id_to_group.items() if n in managed])
+    }
+    wanted_members = {(name, user_ids[email.lower()]) for name in managed for email in groups[name]["members"]}
+    diff["members_added"] = sorted(wanted_members - current_members)
+    diff["members_removed"] = sorted(current_members - wanted_members)
+    return diff
+
+
+def apply(policy, diff):
+    groups = policy["groups"]
+    if diff["permissions_created"]:
+        db.session.execute(insert(Permission), [{"name": name} for name in diff["permissions_created"]])
+    if diff["groups_created"]:
+        db.session.execute(insert(Group), [{"name": name, "description": groups[name].get("description", "")} for name in diff["groups_created"]])
+    if diff["groups_updated"]:
+        db.session.execute(
+            update(Group.__table__).where(Group.__table__.c.name == bindparam("b_name")).values(description=bindparam("b_description")),
+            [{"b_name": name, "b_description": groups[name]["description"]} for name in diff["groups_updated"]],
+        )
+
+    group_ids = _ids_by_name(Group, Group.name, set(groups) | set(diff["groups_deleted"]))
+    perm_ids = _ids_by_name(Permission, Permission.name, {perm for _, perm in diff["grants_added"] + diff["grants_removed"]})
+
+    for chunk in _chunks(diff["grants_removed"]):
+        db.session.execute(delete(group_permissions).where(
+            tuple_(group_permissions.c.group_id, group_permissions.c.permission_id).in_([(group_ids[g], perm_ids[p]) for g, p in chunk])
+        ))
+    for chunk in _chunks(diff["members_removed"]):
+        db.session.execute(delete(group_members).where(
+            tuple_(group_members.c.group_id, group_members.c.user_id).in_([(group_ids[g], uid) for g, uid in chunk])
+        ))
+    if diff["grants_added"]:
+        db.session.execute(insert(group_permissions), [{"group_id": group_ids[g], "permission_id": perm_ids[p]} for g, p in diff["grants_added"]])
+    if diff["members_added"]:
+        db.session.execute(insert(group_members), [{"group_id": group_ids[g], "user_id": uid} for g, uid in diff["members_added"]])
+
+    for g, _ in diff["members_added"]:
+        add_delta(db.session, "group.members", group_ids[g])
+    for g, _ in diff["members_removed"]:
+        add_delta(db.session, "group.members", group_ids[g], -1)
+
+    for chunk in _chunks([group_ids[name] for name in diff["groups_deleted"]]):
+        db.session.execute(delete(group_permissions).where(group_permissions.c.group_id.in_(chunk)))
+        db.session.execute(delete(group_members).where(group_members.c.group_id.in_(chunk)))
+        db.session.execute(delete(Group.__table__).where(Group.__table__.c.id.in_(chunk)))
+        db.session.execute(delete(StatCounter).where(StatCounter.name == "group.members", StatCounter.key.in_([str(gid) for gid in chunk])))
+    reindex_rows("groups", [group_ids[name] for name in diff["groups_created"] + diff["groups_deleted"]])
+    # Bulk statements bypass the identity map; drop any loaded collections.
+    db.session.expire_all()
+
+
+def summarize(diff):
+    return {key: len(value) for key, value in diff.items()}
+
+
+def sync_policy(policy, dry_run=False, actor_user_id=None):
+    """Plan and (unless ``dry_run``) stage the changes; the caller commits."""
+    diff = plan(policy)
+    summary = summarize(diff)
+    if not dry_run and any(summary.values()):
+        apply(policy, diff)
+        log_event("rbac.synced", "policy", actor_user_id=actor_user_id, details=summary)
+    return diff, summary
+
+
+@click.command("rbac-sync")
+@click.argument("policy_file", type=click.File())
+@click.option("--dry-run", is_flag=True, help="Print the diff without writing anything.")
+@with_appcontext
+def rbac_sync(policy_file, dry_run):
+    """Sync groups, permissions and memberships to a JSON policy file."""
+    try:
+        diff, summary = sync_policy(rbac_policy_schema.load(json.load(policy_file)), dry_run=dry_run)
+    except ApiError as exc:
+        db.session.rollback()
+        raise click.ClickException(f"{exc.message}: {exc.details}")
+    if dry_run:
+        db.session.rollback()
+        for key, changes in diff.items():
+            for change in changes:
+                print(f"{key}: {change}")
+    else:
+        db.session.commit()
+    print(("Would apply: " if dry_run else "Applied: ") + ", ".join(f"{k}={v}" for k, v in summary.items()))
@@ -0,0 +1,210 @@
+"""Revoked-token denylist with a per-worker Bloom filter in front of the database.
+
+Every worker keeps a Bloom filter of all unexpired revoked ``jti`` values plus
+an exact set of the most recent ones, refreshed at most every
+``REVOCATION_REFRESH_SECONDS``. Incremental refreshes re-read everything
+revoked since ``watermark - REVOCATION_REFRESH_OVERLAP_SECONDS``, because
+concurrent logouts do not commit in ``revoked_at`` (or id) order; a full
+rebuild every ``REVOCATION_FULL_REFRESH_SECONDS`` backstops commits delayed
+longer than that. A Bloom miss means "not revoked" without touching the
+database; a hit that is not in the recent set is confirmed with a single
+indexed lookup.
+"""
+import hashlib
+import math
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta, timezone
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from app.extensions import db
+from app.models import RevokedToken
+
+
+class BloomFilter:
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1, h2 = int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, key: str):
+        for pos in self._positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+class RevocationCache:
+    """Pure in-memory state; callers feed it rows and confirm Bloom hits themselves."""
+
+    def __init__(self, capacity=100_000, error_rate=0.001, recent_size=1024, refresh_seconds=5.0,
+                 overlap_seconds=60.0, full_refresh_seconds=300.0):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.refresh_seconds = refresh_seconds
+        self.overlap = timedelta(seconds=overlap_seconds)
+        self.full_refresh_seconds = full_refresh_seconds
+        self.lock = threading.Lock()
+        self.recent = deque(maxlen=recent_size)
+        self.recent_set = set()
+        self.reset()
+
+    def reset(self):
+        self.bloom = BloomFilter(self.capacity, self.error_rate)
+        self.count = 0
+        self.watermark = None
+        # jti -> revoked_at for rows inside the overlap window, so re-read rows are not counted twice.
+        self.window = {}
+        self.refreshed_at = 0.0
+        self.rebuilt_at = 0.0
+        self.recent.clear()
+        self.recent_set.clear()
+
+    def needs_refresh(self) -> bool:
+        return time.monotonic() - self.refreshed_at >= self.refresh_seconds
+
+    def add(self, jti: str):
+        with self.lock:
+            self._add(jti)
+
+    def _add(self, jti: str):
+        if len(self.recent) == self.recent.maxlen:
+            self.recent_set.discard(self.recent[0])
+        self.recent.append(jti)
+        self.recent_set.add(jti)
+        self.bloom.add(jti)
+        self.count += 1
+
+    @property
+    def saturated(self) -> bool:
+        # Pruned entries never leave a Bloom filter, so it is rebuilt from the table once full.
+        return self.count > self.capacity
+
+    def needs_rebuild(self) -> bool:
+        return self.saturated or time.monotonic() - self.rebuilt_at >= self.full_refresh_seconds
+
+    def refresh_stmt(self):
+        """``(statement, full)`` for the next refresh; pass the rows to ``apply``."""
+        if self.needs_rebuild() or self.watermark is None:
+            return new_revocations_stmt(None), True
+        return new_revocations_stmt(self.watermark - self.overlap), False
+
+    def apply(self, rows, full):
+        if full:
+            self.rebuild(rows)
+        else:
+            self.ingest(rows)
+
+    def ingest(self, rows):
+        with self.lock:
+            for jti, revoked_at in rows:
+                if jti not in self.window and jti not in self.recent_set:
+                    self._add(jti)
+                self.window[jti] = revoked_at
+                if self.watermark is None or revoked_at > self.watermark:
+                    self.watermark = revoked_at
+            if self.watermark is not None:
+                cutoff = self.watermark - self.overlap
+                self.window = {jti: at for jti, at in self.window.items() if at >= cutoff}
+            self.refreshed_at = time.monotonic()
+
+    def rebuild(self, rows):
+        with self.lock:
+            self.capacity = max(self.capacity, 2 * len(rows))
+            self.reset()
+            self.rebuilt_at = time.monotonic()
+        self.ingest(rows)
+
+    def check(self, jti: str):
+        """True/False when memory is conclusive, None when the database must confirm."""
+        if jti not in self.bloom:
+            return False
+        if jti in self.recent_set:
+            return True
+        return None
+
+
+def new_revocations_stmt(since=None):
+    stmt = select(RevokedToken.jti, RevokedToken.revoked_at).where(RevokedToken.expires_at > datetime.now(timezone.utc))
+    if since is not None:
+        stmt = stmt.where(RevokedToken.revoked_at >= since)
+    return stmt.order_by(RevokedToken.revoked_at)
+
+
+def revoked_jti_stmt(jti: str):
+    return select(RevokedToken.id).where(RevokedToken.jti == jti)
+
+
+def revocation_cache() -> RevocationCache:
+    cache = current_app.extensions.get("revocation_cache")
+    if cache is None:
+        cfg = current_app.config
+        cache = current_app.extensions["revocation_cache"] = RevocationCache(
+            capacity=cfg["REVOCATION_BLOOM_CAPACITY"],
+            error_rate=cfg["REVOCATION_BLOOM_ERROR_RATE"],
+            refresh_seconds=cfg["REVOCATION_REFRESH_SECONDS"],
+            overlap_seconds=cfg["REVOCATION_REFRESH_OVERLAP_SECONDS"],
+            full_refresh_seconds=cfg["REVOCATION_FULL_REFRESH_SECONDS"],
+        )
+    return cache
+
+
+def refresh_revocations(force=False):
+    cache = revocation_cache()
+    if not force and not cache.needs_refresh():
+        return cache
+    stmt, full = cache.refresh_stmt()
+    cache.apply(db.session.execute(stmt).all(), full)
+    return cache
+
+
+def is_revoked(jti: str) -> bool:
+    cache = refresh_revocations()
+    verdict = cache.check(jti)
+    if verdict is None:
+        verdict = db.session.execute(revoked_jti_stmt(jti)).first() is not None
+    return verdict
+
+
+INSERTS = {"postgresql": pg_insert, "sqlite": sqlite_insert}
+
+
+def revoke_token(payload: dict):
+    """Stage the revocation; revoking the same jti twice (even concurrently) is a no-op."""
+    from app.utils.auth import subject_id  # app.utils.auth imports this module
+
+    jti = payload["jti"]
+    insert = INSERTS[db.session.get_bind().dialect.name]
+    db.session.execute(insert(RevokedToken).values(
+        jti=jti,
+        user_id=subject_id(payload),
+        expires_at=datetime.fromtimestamp(payload["exp"], timezone.utc),
+    ).on_conflict_do_nothing(index_elements=["jti"]))
+    revocation_cache().add(jti)
+
+
+def prune_revoked_tokens() -> int:
+    result = db.session.execute(delete(RevokedToken).where(RevokedToken.expires_at <= datetime.now(timezone.utc)))
+    db.session.commit()
+    return result.rowcount
+
+
+@click.command("prune-revoked-tokens")
+@with_appcontext
+def prune_revoked_tokens_command():
+    """Delete revoked-token rows whose tokens have expired anyway."""
+    print(f"Pruned {prune_revoked_tokens()} expired revoked token(s)")
@@ -0,0 +1,121 @@
+"""Substring search over user emails and group names.
+
+Postgres answers from ``pg_trgm`` GIN indexes; SQLite from FTS5 trigram
+tables (``users_search``/``groups_search``) that ORM write events keep in
+sync. Bulk loads that bypass the ORM must call ``reindex_search``.
+"""
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import DDL, bindparam, event, inspect, text
+
+from app.extensions import db
+from app.models import Group, User
+
+
+# (model, FTS table, indexed column)
+SEARCH_INDEXES = {
+    "users": (User, "users_search", "email"),
+    "groups": (Group, "groups_search", "name"),
+}
+
+for _model, _fts, _column in SEARCH_INDEXES.values():
+    _table = _model.__table__
+    event.listen(_table, "after_create", DDL(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {_fts} USING fts5({_column}, tokenize='trigram')"
+    ).execute_if(dialect="sqlite"))
+    event.listen(_table, "before_drop", DDL(f"DROP TABLE IF EXISTS {_fts}").execute_if(dialect="sqlite"))
+    event.listen(_table, "after_create", DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"))
+    event.listen(_table, "after_create", DDL(
+        f"CREATE INDEX IF NOT EXISTS ix_{_table.name}_{_column}_trgm ON {_table.name} USING gin ({_column} gin_trgm_ops)"
+    ).execute_if(dialect="postgresql"))
+
+
+def _sync_listeners(fts, column):
+    def after_insert(mapper, connection, target):
+        if connection.dialect.name == "sqlite":
+            connection.execute(text(f"INSERT INTO {fts}(rowid, {column}) VALUES (:id, :value)"),
+                               {"id": target.id, "value": getattr(target, column)})
+
+    def after_update(mapper, connection, target):
+        if connection.dialect.name == "sqlite" and inspect(target).attrs[column].history.has_changes():
+            connection.execute(text(f"UPDATE {fts} SET {column} = :value WHERE rowid = :id"),
+                               {"id": target.id, "value": getattr(target, column)})
+
+    def after_delete(mapper, connection, target):
+        if connection.dialect.name == "sqlite":
+            connection.execute(text(f"DELETE FROM {fts} WHERE rowid = :id"), {"id": target.id})
+
+    return after_insert, after_update, after_delete
+
+
+for _model, _fts, _column in SEARCH_INDEXES.values():
+    for _name, _fn in zip(("after_insert", "after_update", "after_delete"), _sync_listeners(_fts, _column)):
+        event.listen(_model, _name, _fn)
+
+
+def _like_escape(value):
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def search(kind, q, limit):
+    """Return up to ``limit`` ids matching ``q``; prefix matches rank first."""
+    model, fts, column = SEARCH_INDEXES[kind]
+    table = model.__tablename__
+    params = {"q": q, "limit": limit, "pattern": f"%{_like_escape(q)}%", "prefix": f"{_like_escape(q)}%"}
+    dialect = db.session.get_bind().dialect.name
+
+    if dialect == "sqlite" and len(q) >= 3:
+        sql = (
+            f"SELECT t.id FROM {fts} s JOIN {table} t ON t.id = s.rowid WHERE {fts} MATCH :match "
+            f"ORDER BY t.{column} LIKE :prefix ESCAPE '\\' DESC, s.rank, t.id LIMIT :limit"
+        )
+        params["match"] = '"' + q.replace('"', '""') + '"'
+    elif dialect == "postgresql":
+        sql = (
+            f"SELECT id FROM {table} WHERE {column} ILIKE :pattern ESCAPE '\\' "
+            f"ORDER BY {column} ILIKE :prefix ESCAPE '\\' DESC, similarity({column}, :q) DESC, id LIMIT :limit"
+        )
+    else:
+        # FTS5 trigrams need three characters; shorter SQLite queries (and other dialects) scan by prefix.
+        col = getattr(model, column)
+        return list(db.session.execute(
+            db.select(model.id).where(col.ilike(params["prefix"], escape="\\")).order_by(col).limit(limit)
+        ).scalars())
+    return list(db.session.execute(text(sql), params).scalars())
+
+
+def reindex_search():
+    if db.session.get_bind().dialect.name != "sqlite":
+        return {}
+    counts = {}
+    for model, fts, column in SEARCH_INDEXES.values():
+        db.session.execute(text(f"DELETE FROM {fts}"))
+        result = db.session.execute(text(f"INSERT INTO {fts}(rowid, {column}) SELECT id, {column} FROM {model.__tablename__}"))
+        counts[fts] = result.rowcount
+    db.session.commit()
+    return counts
+
+
+def reindex_rows(kind, ids):
+    """Re-copy specific rows into the SQLite search table after bulk statements; no commit."""
+    if not ids or db.session.get_bind().dialect.name != "sqlite":
+        return
+    model, fts, column = SEARCH_INDEXES[kind]
+    ids = list(ids)
+    for i in range(0, len(ids), 500):
+        params = {"ids": ids[i:i + 500]}
+        db.session.execute(text(f"DELETE FROM {fts} WHERE rowid IN :ids").bindparams(bindparam("ids", expanding=True)), params)
+        db.session.execute(text(
+            f"INSERT INTO {fts}(rowid, {column}) SELECT id, {column} FROM {model.__tablename__} WHERE id IN :ids"
+        ).bindparams(bindparam("ids", expanding=True)), params)
+
+
+@click.command("search-reindex")
+@with_appcontext
+def search_reindex():
+    """Rebuild the SQLite FTS5 search tables from users and groups (no-op on Postgres)."""
+    counts = reindex_search()
+    if not counts:
+        print("Postgres trigram indexes are maintained by the database; nothing to do")
+    for name, count in counts.items():
+        print(f"Indexed {count} rows into {name}")
@@ -0,0 +1,204 @@
+"""Admin statistics kept as counters in ``stat_counters`` instead of ``COUNT(*)`` scans.
+
+Counters (``name`` / ``key``):
+
+- ``users.total``, ``users.active``, ``users.locked`` (``locked_until`` set; cleared on the next successful login)
+- ``group.members`` / ``<group id>``
+- ``audit.events`` / ``<YYYY-MM-DD>|<event type>`` (UTC day)
+
+ORM flushes record deltas on the session; ``before_commit`` writes them as
+upserts in the same transaction as the change, so a rolled-back write never
+moves a counter. Core bulk statements bypass the ORM and must call
+``add_delta`` (or ``rebuild_stats`` after bulk loads).
+"""
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import delete, event, func, inspect, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from app.extensions import db
+from app.models import AuditLog, Group, StatCounter, User, group_members
+
+
+_DELTAS = "stat_deltas"
+UPSERTS = {"postgresql": pg_insert, "sqlite": sqlite_insert}
+
+
+def add_delta(session, name, key="", amount=1):
+    if amount:
+        session.info.setdefault(_DELTAS, Counter())[(name, str(key))] += amount
+
+
+def _day(value):
+    value = value or datetime.now(timezone.utc)
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.date().isoformat()
+
+
+def utc_date(column, dialect):
+    """SQL ``date()`` of ``column`` in UTC, the same day ``_day`` picks; Postgres would use the session time zone."""
+    if dialect == "postgresql":
+        column = func.timezone("UTC", column)
+    return func.date(column)
+
+
+def _user_flags(user, side):
+    """(active, locked) before (``side=0``) or after (``side=1``) the pending change."""
+    state = inspect(user)
+    flags = []
+    for attr in ("is_active", "locked_until"):
+        history = state.attrs[attr].history
+        if side == 0 and history.has_changes():
+            value = history.deleted[0] if history.deleted else None
+        else:
+            value = getattr(user, attr)
+        flags.append(bool(value) if attr == "is_active" else value is not None)
+    return flags
+
+
+def _membership_changes(session):
+    added, removed = set(), set()
+    for obj in session.new | session.dirty:
+        if isinstance(obj, Group):
+            history = inspect(obj).attrs.users.history
+            added.update((obj.id, user.id) for user in history.added)
+            removed.update((obj.id, user.id) for user in history.deleted)
+        elif isinstance(obj, User):
+            history = inspect(obj).attrs.groups.history
+            added.update((group.id, obj.id) for group in history.added)
+            removed.update((group.id, obj.id) for group in history.deleted)
+    # Deleting either side drops its group_members rows; the flush has loaded the collection to do so.
+    for obj in session.deleted:
+        if isinstance(obj, Group):
+            history = inspect(obj).attrs.users.history
+            removed.update((obj.id, user.id) for user in (*history.unchanged, *history.deleted))
+        elif isinstance(obj, User):
+            history = inspect(obj).attrs.groups.history
+            removed.update((group.id, obj.id) for group in (*history.unchanged, *history.deleted))
+    return added - removed, removed - added
+
+
+def _load_previous_value(target, value, oldvalue, initiator):
+    pass
+
+
+for _attr in (User.is_active, User.locked_until):
+    # active_history loads the old value before an expired attribute is overwritten, so the flush sees both sides.
+    event.listen(_attr, "set", _load_previous_value, active_history=True)
+
+
+@event.listens_for(db.session, "after_flush")
+def collect_deltas(session, _flush_context):
+    # Runs before attribute history is reset, so old and new values are both visible.
+    for obj in session.new:
+        if isinstance(obj, User):
+            active, locked = _user_flags(obj, 1)
+            add_delta(session, "users.total")
+            add_delta(session, "users.active", amount=int(active))
+            add_delta(session, "users.locked", amount=int(locked))
+        elif isinstance(obj, AuditLog):
+            add_delta(session, "audit.events", f"{_day(obj.created_at)}|{obj.event_type}")
+    for obj in session.dirty:
+        if isinstance(obj, User) and session.is_modified(obj, include_collections=False):
+            (was_active, was_locked), (active, locked) = _user_flags(obj, 0), _user_flags(obj, 1)
+            add_delta(session, "users.active", amount=int(active) - int(was_active))
+            add_delta(session, "users.locked", amount=int(locked) - int(was_locked))
+    for obj in session.deleted:
+        if isinstance(obj, User):
+            active, locked = _user_flags(obj, 0)
+            add_delta(session, "users.total", amount=-1)
+            add_delta(session, "users.active", amount=-int(active))
+            add_delta(session, "users.locked", amount=-int(locked))
+    added, removed = _membership_changes(session)
+    for group_id, _ in added:
+        add_delta(session, "group.members", group_id)
+    for group_id, _ in removed:
+        add_delta(session, "group.members", group_id, -1)
+
+
+@event.listens_for(db.session, "before_commit")
+def write_deltas(session):
+    session.flush()
+    deltas = session.info.pop(_DELTAS, None)
+    if not deltas:
+        return
+    insert = UPSERTS[session.get_bind().dialect.name]
+    # Sorted so concurrent transactions take the counter row locks in the same order.
+    rows = [{"name": name, "key": key, "value": amount} for (name, key), amount in sorted(deltas.items()) if amount]
+    if not rows:
+        return
+    stmt = insert(StatCounter)
+    # One executemany round-trip for the whole transaction, rows still in lock order.
+    session.execute(stmt.on_conflict_do_update(
+        index_elements=["name", "key"], set_={"value": StatCounter.value + stmt.excluded.value},
+    ), rows)
+
+
+@event.listens_for(db.session, "after_soft_rollback")
+def discard_deltas(session, previous_transaction):
+    if not previous_transaction.nested:
+        session.info.pop(_DELTAS, None)
+
+
+def get_stats(days=30):
+    """Read the counters; ``days`` bounds the audit history returned."""
+    since = (datetime.now(timezone.utc) - timedelta(days=days - 1)).date().isoformat()
+    rows = db.session.execute(
+        select(StatCounter.name, StatCounter.key, StatCounter.value)
+        .where((StatCounter.name != "audit.events") | (StatCounter.key >= since))
+    ).all()
+    stats = {"users": {"total": 0, "active": 0, "locked": 0}, "groups": {}, "audit": {}}
+    for name, key, value in rows:
+        if name.startswith("users."):
+            stats["users"][name.split(".", 1)[1]] = value
+        elif name == "group.members" and value:
+            # Emptied or deleted groups keep a zero row until the next rebuild.
+            stats["groups"][key] = value
+        elif name == "audit.events":
+            day, event_type = key.split("|", 1)
+            stats["audit"].setdefault(day, {})[event_type] = value
+    return stats
+
+
+def rebuild_stats():
+    """Recompute every counter from the base tables in one transaction."""
+    day = utc_date(AuditLog.created_at, db.session.get_bind().dialect.name)
+    rows = [
+        ("users.total", "", db.session.scalar(select(func.count()).select_from(User))),
+        ("users.active", "", db.session.scalar(select(func.count()).select_from(User).where(User.is_active))),
+        ("users.locked", "", db.session.scalar(select(func.count()).select_from(User).where(User.locked_until.is_not(None)))),
+    ]
+    rows += [
+        ("group.members", str(group_id), count)
+        for group_id, count in db.session.execute(select(group_members.c.group_id, func.count()).group_by(group_members.c.group_id))
+    ]
+    rows += [
+        ("audit.events", f"{str(event_day)[:10]}|{event_type}", count)
+        for event_day, event_type, count in db.session.execute(
+            select(day, AuditLog.event_type, func.count()).group_by(day, AuditLog.event_type)
+        )
+    ]
+    db.session.info.pop(_DELTAS, None)
+    db.session.execute(delete(StatCounter))
+    if rows:
+        db.session.execute(db.insert(StatCounter), [{"name": n, "key": k, "value": v} for n, k, v in rows])
+    db.session.commit()
+    return len(rows)
+
+
+@click.command("stats-rebuild")
+@with_appcontext
+def stats_rebuild():
+    """Recount the admin statistics counters from users, group_members and audit_logs."""
+    before = {(r.name, r.key): r.value for r in db.session.execute(select(StatCounter)).scalars()}
+    count = rebuild_stats()
+    after = {(r.name, r.key): r.value for r in db.session.execute(select(StatCounter)).scalars()}
+    changed = sorted(k for k in before.keys() | after.keys() if before.get(k, 0) != after.get(k, 0))
+    for name, key in changed:
+        print(f"{name}{'/' + key if key else ''}: {before.get((name, key), 0)} -> {after.get((name, key), 0)}")
+    print(f"Rebuilt {count} counters ({len(changed)} corrected)")
@@ -0,0 +1,166 @@
+import csv
+import io
+import itertools
+import json
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import func, select, text
+
+from app.extensions import bcrypt, db
+from app.models import AuditLog, Group, Permission, User, group_members, group_permissions
+from app.services.search import reindex_search
+from app.services.stats import rebuild_stats
+
+
+AUDIT_EVENT_WEIGHTS = {
+    "login.success": 60,
+    "login.failure": 20,
+    "user.updated": 8,
+    "group.membership_changed": 6,
+    "password_reset.requested": 3,
+    "group.permission_changed": 2,
+    "user.created": 1,
+}
+
+
+def _batches(rows, size):
+    it = iter(rows)
+    while True:
+        batch = list(itertools.islice(it, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _copy_value(value):
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return value
+
+
+def bulk_insert(table, rows, batch_size=10_000):
+    """Load dict rows with COPY on Postgres and batched executemany elsewhere."""
+    conn = db.session.connection()
+    total = 0
+    if conn.dialect.name == "postgresql":
+        columns = None
+        cursor = conn.connection.cursor()
+        for batch in _batches(rows, batch_size):
+            columns = columns or list(batch[0].keys())
+            buf = io.StringIO()
+            writer = csv.writer(buf)
+            for row in batch:
+                writer.writerow(["" if (v := _copy_value(row[c])) is None else v for c in columns])
+            buf.seek(0)
+            cursor.copy_expert(f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buf)
+            total += len(batch)
+        cursor.close()
+    else:
+        for batch in _batches(rows, batch_size):
+            conn.execute(table.insert(), batch)
+            total += len(batch)
+    return total
+
+
+def _next_id(model):
+    return (db.session.execute(select(func.max(model.id))).scalar() or 0) + 1
+
+
+def _reset_sequences(*tables):
+    if db.session.connection().dialect.name != "postgresql":
+        return
+    for table in tables:
+        db.session.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), COALESCE((SELECT MAX(id) FROM {table}), 1))"
+        ))
+
+
+def _skewed_picker(rng, ids, skew):
+    # Zipf-like weights: the first few groups are huge, the long tail is small.
+    cum_weights = list(itertools.accumulate(1.0 / (rank + 1) ** skew for rank in range(len(ids))))
+    return lambda k: rng.choices(ids, cum_weights=cum_weights, k=k)
+
+
+def generate_synthetic(users=1000, groups=50, permissions=30, audit_rows=0, memberships_per_user=3,
+                       skew=1.1, password="synthetic-password", batch_size=10_000, seed=None):
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    password_hash = bcrypt.generate_password_hash(password).decode()
+    counts = {}
+
+    first_perm = _next_id(Permission)
+    perm_ids = list(range(first_perm, first_perm + permissions))
+    counts["permissions"] = bulk_insert(Permission.__table__, (
+        {"id": pid, "name": f"synthetic.resource{pid}.{('read', 'write')[pid % 2]}"} for pid in perm_ids
+    ), batch_size)
+
+    first_group = _next_id(Group)
+    group_ids = list(range(first_group, first_group + groups))
+    counts["groups"] = bulk_insert(Group.__table__, (
+        {"id": gid, "name": f"synthetic-group-{gid}", "description": "Synthetic load-test group"} for gid in group_ids
+    ), batch_size)
+    counts["group_permissions"] = bulk_insert(group_permissions, (
+        {"group_id": gid, "permission_id": pid}
+        for gid in group_ids if perm_ids
+        for pid in rng.sample(perm_ids, rng.randint(1, min(10, len(perm_ids))))
+    ), batch_size)
+
+    first_user = _next_id(User)
+    user_ids = range(first_user, first_user + users)
+    counts["users"] = bulk_insert(User.__table__, (
+        {"id": uid, "email": f"synthetic-{uid}@example.test", "password_hash": password_hash,
+         "is_active": rng.random() > 0.05, "is_email_verified": rng.random() > 0.2, "must_reset_password": False,
+         "failed_logins": 0, "locked_until": None, "created_at": now, "updated_at": now}
+        for uid in user_ids
+    ), batch_size)
+
+    if group_ids:
+        pick = _skewed_picker(rng, group_ids, skew)
+        counts["group_members"] = bulk_insert(group_members, (
+            {"group_id": gid, "user_id": uid}
+            for uid in user_ids
+            for gid in set(pick(rng.randint(0, memberships_per_user * 2)))
+        ), batch_size)
+
+    if audit_rows and users:
+        event_types, weights = zip(*AUDIT_EVENT_WEIGHTS.items())
+        first_audit = _next_id(AuditLog)
+        counts["audit_logs"] = bulk_insert(AuditLog.__table__, (
+            {"id": aid, "actor_user_id": uid, "event_type": rng.choices(event_types, weights)[0],
+             "target_type": "user", "target_id": str(uid), "details": {}, "request_id": None,
+             "created_at": now - timedelta(seconds=rng.randint(0, 30 * 86400))}
+            for aid, uid in ((aid, rng.choice(user_ids)) for aid in range(first_audit, first_audit + audit_rows))
+        ), batch_size)
+
+    _reset_sequences("permissions", "groups", "users", "audit_logs")
+    db.session.commit()
+    # COPY/executemany bypass the ORM events that maintain the SQLite search tables.
+    reindex_search()
+    rebuild_stats()
+    return counts
+
+
+@click.command("seed-synthetic")
+@click.option("--users", default=1000, show_default=True)
+@click.option("--groups", default=50, show_default=True)
+@click.option("--permissions", default=30, show_default=True)
+@click.option("--audit-rows", default=0, show_default=True)
+@click.option("--memberships-per-user", default=3, show_default=True, help="Average group memberships per user.")
+@click.option("--skew", default=1.1, show_default=True, help="Zipf exponent for group sizes.")
+@click.option("--password", default="synthetic-password", show_default=True)
+@click.option("--batch-size", default=10_000, show_default=True)
+@click.option("--seed", type=int, default=None, help="Random seed for reproducible datasets.")
+@with_appcontext
+def seed_synthetic(**options):
+    started = time.perf_counter()
+    counts = generate_synthetic(**options)
+    summary = ", ".join(f"{name}={count}" for name, count in counts.items())
+    print(f"Seeded synthetic data in {time.perf_counter() - started:.1f}s: {summary}")
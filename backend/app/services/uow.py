@@ -0,0 +1,48 @@
+import random
+import time
+from functools import wraps
+
+from flask import current_app, g, make_response
+
+from app.extensions import db
+from app.utils.sqlite import is_locked_error
+
+
+def in_unit_of_work() -> bool:
+    return g.get("unit_of_work", False)
+
+
+def transactional(fn):
+    """Run a handler as one unit of work: a single commit on success, rollback otherwise.
+
+    Handlers flush instead of committing; ``log_event`` only stages its row
+    while a unit of work is active, so the change and its audit event land
+    together. Responses with status >= 400 are rolled back as well.
+
+    On SQLite a write that still hits ``database is locked`` after
+    ``busy_timeout`` is rolled back and the whole handler re-run, up to
+    ``SQLITE_WRITE_RETRIES`` times.
+    """
+
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        attempt = 0
+        while True:
+            g.unit_of_work = True
+            try:
+                resp = make_response(fn(*args, **kwargs))
+                if resp.status_code >= 400:
+                    db.session.rollback()
+                else:
+                    db.session.commit()
+                return resp
+            except Exception as exc:
+                db.session.rollback()
+                attempt += 1
+                if not is_locked_error(exc) or attempt > current_app.config["SQLITE_WRITE_RETRIES"]:
+                    raise
+                time.sleep(random.uniform(0.5, 1.5) * 0.01 * 2 ** attempt)
+            finally:
+                g.unit_of_work = False
+
+    return wrapper
@@ -0,0 +1,37 @@
+import logging
+
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import configure_mappers
+
+from app.extensions import db
+from app.models import User
+from app.services.revocation import refresh_revocations
+from app.utils.auth import jwt_settings
+
+
+def reset_engines():
+    # Connections opened in the master must not be shared with forked workers.
+    for engine in db.engines.values():
+        engine.dispose(close=False)
+
+
+def warm_worker():
+    configure_mappers()
+    jwt_settings()
+    db.session.execute(text("SELECT 1"))
+    # Compile the hot auth queries once so the first real request hits SQLAlchemy's statement cache.
+    db.session.get(User, 0)
+    refresh_revocations(force=True)
+    db.session.remove()
+
+
+def prepare_worker(app):
+    with app.app_context():
+        reset_engines()
+        try:
+            warm_worker()
+        except SQLAlchemyError:
+            # Warm-up is best effort; a worker must still boot while the database is unreachable.
+            db.session.remove()
+            logging.getLogger(__name__).warning("worker warm-up skipped: database unavailable", exc_info=True)
@@ -0,0 +1,187 @@
+"""Per-process admission control: bounded in-flight requests with fast 503s.
+
+The caps default to the worker's DB pool (``DB_POOL_SIZE + DB_MAX_OVERFLOW``):
+the global gate admits one request per pooled connection, the ``api`` lane
+leaves part of the pool free for the ``auth`` lane, and the lanes together
+exceed the global cap so the global gate is what binds under load. The pool's
+own checkout timeout matches the admission queue timeout. The gates only
+matter with threaded workers (``GUNICORN_THREADS`` > 1).
+
+Each request takes a slot under the global cap, one in its lane (``auth`` for
+``auth_bp`` so logins are not starved by API traffic, ``api`` otherwise) and
+one for its endpoint when ``ADMISSION_ROUTE_LIMITS`` names it. A request that
+cannot get all of them within ``ADMISSION_QUEUE_TIMEOUT_MS`` is rejected with
+503 and ``Retry-After`` instead of queueing behind a saturated DB pool.
+"""
+import threading
+import time
+
+from flask import current_app, g, request
+from sqlalchemy.engine import make_url
+
+from app.extensions import db
+from app.utils.errors import error_response
+
+
+EXEMPT_ENDPOINTS = frozenset({None, "healthz", "static"})
+
+
+class Gate:
+    def __init__(self, name, limit):
+        self.name = name
+        self.limit = limit
+        self._sem = threading.BoundedSemaphore(limit)
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.shed = 0
+
+    def acquire(self, timeout):
+        if not self._sem.acquire(timeout=max(timeout, 0)):
+            with self._lock:
+                self.shed += 1
+            return False
+        with self._lock:
+            self.in_flight += 1
+        return True
+
+    def release(self):
+        with self._lock:
+            self.in_flight -= 1
+        self._sem.release()
+
+    def stats(self):
+        return {"limit": self.limit, "in_flight": self.in_flight, "shed": self.shed}
+
+
+def parse_route_limits(value):
+    """``"api.batch=4,api.rbac_sync=1"`` (or an already parsed dict) -> ``{endpoint: limit}``."""
+    if isinstance(value, dict):
+        return dict(value)
+    limits = {}
+    for item in filter(None, (part.strip() for part in value.split(","))):
+        endpoint, _, limit = item.partition("=")
+        limits[endpoint.strip()] = int(limit)
+    return limits
+
+
+def pool_capacity(config):
+    return config["DB_POOL_SIZE"] + config["DB_MAX_OVERFLOW"]
+
+
+def admission_limits(config):
+    """``(global_limit, {"auth": ..., "api": ...})``, deriving unset caps from the DB pool."""
+    capacity = pool_capacity(config)
+    derived = {
+        "ADMISSION_MAX_INFLIGHT": capacity,
+        "ADMISSION_AUTH_LIMIT": max(2, capacity // 4),
+        "ADMISSION_API_LIMIT": max(1, capacity - max(1, capacity // 8)),
+    }
+    limits = {key: derived[key] if config[key] is None else config[key] for key in derived}
+    return limits["ADMISSION_MAX_INFLIGHT"], {"auth": limits["ADMISSION_AUTH_LIMIT"], "api": limits["ADMISSION_API_LIMIT"]}
+
+
+def pool_options(config):
+    """Engine options sizing the pool to match the admission caps; in-memory SQLite keeps its static pool."""
+    url = make_url(config["SQLALCHEMY_DATABASE_URI"])
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        return {}
+    return {
+        "pool_size": config["DB_POOL_SIZE"],
+        "max_overflow": config["DB_MAX_OVERFLOW"],
+        "pool_timeout": config["ADMISSION_QUEUE_TIMEOUT_MS"] / 1000,
+    }
+
+
+class AdmissionController:
+    def __init__(self, global_limit, lane_limits, route_limits, queue_timeout):
+        self.queue_timeout = queue_timeout
+        self.global_gate = Gate("global", global_limit)
+        self.lanes = {name: Gate(name, limit) for name, limit in lane_limits.items()}
+        self.routes = {name: Gate(name, limit) for name, limit in route_limits.items()}
+
+    def gates_for(self, endpoint):
+        lane = "auth" if endpoint.startswith("auth.") else "api"
+        # Narrowest first, so a request waiting on its own route or lane does not hold a global slot.
+        return [gate for gate in (self.routes.get(endpoint), self.lanes[lane], self.global_gate) if gate is not None]
+
+    def admit(self, endpoint):
+        """Return the gates now held, or ``None`` (holding nothing) if the budget ran out."""
+        deadline = time.monotonic() + self.queue_timeout
+        held = []
+        for gate in self.gates_for(endpoint):
+            if not gate.acquire(deadline - time.monotonic()):
+                self.release(held)
+                return None
+            held.append(gate)
+        return held
+
+    @staticmethod
+    def release(held):
+        for gate in reversed(held):
+            gate.release()
+
+    def stats(self):
+        return {
+            "global": self.global_gate.stats(),
+            "lanes": {name: gate.stats() for name, gate in self.lanes.items()},
+            "routes": {name: gate.stats() for name, gate in self.routes.items()},
+        }
+
+
+def pool_stats():
+    pool = db.engine.pool
+    if not hasattr(pool, "checkedout") or not hasattr(pool, "size"):
+        return None
+    max_overflow = getattr(pool, "_max_overflow", 0)
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "capacity": pool.size() + max_overflow if max_overflow >= 0 else None,
+    }
+
+
+def readiness():
+    """``(ready, details)``: not ready when in-flight requests or pool checkouts reach the threshold."""
+    threshold = current_app.config["ADMISSION_READY_THRESHOLD"]
+    controller = current_app.extensions.get("admission")
+    details = {"admission": controller.stats() if controller else None, "pool": pool_stats()}
+    saturated = []
+    if controller and controller.global_gate.in_flight >= controller.global_gate.limit * threshold:
+        saturated.append("admission")
+    pool = details["pool"]
+    if pool and pool["capacity"] and pool["checked_out"] >= pool["capacity"] * threshold:
+        saturated.append("pool")
+    details["saturated"] = saturated
+    return not saturated, details
+
+
+def init_admission(app):
+    if not app.config["ADMISSION_ENABLED"]:
+        return
+    global_limit, lane_limits = admission_limits(app.config)
+    controller = AdmissionController(
+        global_limit,
+        lane_limits,
+        parse_route_limits(app.config["ADMISSION_ROUTE_LIMITS"]),
+        app.config["ADMISSION_QUEUE_TIMEOUT_MS"] / 1000,
+    )
+    app.extensions["admission"] = controller
+
+    @app.before_request
+    def admit_request():
+        # Batch sub-requests run inside the already admitted POST /api/batch.
+        if request.endpoint in EXEMPT_ENDPOINTS or g.get("batch_user") is not None:
+            return None
+        held = controller.admit(request.endpoint)
+        if held is None:
+            resp, status = error_response("OVERLOADED", "Server is busy, retry shortly", 503)
+            resp.headers["Retry-After"] = str(app.config["ADMISSION_RETRY_AFTER"])
+            return resp, status
+        g.admission_slots = held
+        return None
+
+    @app.teardown_request
+    def release_request(_exc):
+        held = g.pop("admission_slots", None)
+        if held:
+            controller.release(held)
@@ -5,22 +5,46 @@ import jwt
 from flask import current_app, g, request
 
 from app.models import User
+from app.services.revocation import is_revoked
+
+
+def jwt_settings():
+    settings = current_app.extensions.get("jwt_settings")
+    if settings is None:
+        cfg = current_app.config
+        settings = current_app.extensions["jwt_settings"] = {
+            "key": cfg["SECRET_KEY"],
+            "algorithms": ["HS256"],
+            "ttl": timedelta(minutes=cfg["JWT_EXPIRE_MINUTES"]),
+            "remember_ttl": timedelta(days=cfg["JWT_REMEMBER_DAYS"]),
+        }
+    return settings
 
 
 def make_jwt(user_id: int, remember_me: bool = False):
+    settings = jwt_settings()
     now = datetime.now(timezone.utc)
-    ttl = timedelta(days=current_app.config["JWT_REMEMBER_DAYS"]) if remember_me else timedelta(minutes=current_app.config["JWT_EXPIRE_MINUTES"])
+    ttl = settings["remember_ttl"] if remember_me else settings["ttl"]
     payload = {
         "sub": str(user_id),
         "iat": int(now.timestamp()),
         "exp": int((now + ttl).timestamp()),
         "jti": str(uuid.uuid4()),
     }
-    return jwt.encode(payload, current_app.config["SECRET_KEY"], algorithm="HS256")
+    return jwt.encode(payload, settings["key"], algorithm=settings["algorithms"][0])
 
 
 def decode_jwt(token: str):
-    return jwt.decode(token, current_app.config["SECRET_KEY"], algorithms=["HS256"])
+    settings = jwt_settings()
+    return jwt.decode(token, settings["key"], algorithms=settings["algorithms"])
+
+
+def subject_id(payload):
+    """The user id in ``sub``, or ``None`` when it is missing or not an integer."""
+    try:
+        return int(payload["sub"])
+    except (KeyError, TypeError, ValueError):
+        return None
 
 
 def current_user_from_request():
@@ -32,7 +56,10 @@ def current_user_from_request():
         payload = decode_jwt(token)
     except jwt.PyJWTError:
         return None
-    return User.query.get(int(payload["sub"]))
+    if "jti" in payload and is_revoked(payload["jti"]):
+        return None
+    user_id = subject_id(payload)
+    return User.query.get(user_id) if user_id is not None else None
 
 
 def ensure_request_id():
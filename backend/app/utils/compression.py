@@ -0,0 +1,108 @@
+"""WSGI gzip middleware that compresses response bodies chunk by chunk."""
+import itertools
+import zlib
+
+from werkzeug.datastructures import Headers
+from werkzeug.http import parse_accept_header
+
+
+class GzipMiddleware:
+    """Compress eligible responses without buffering more than ``min_size`` bytes.
+
+    Bodies are held back only until ``min_size`` is reached; shorter bodies go
+    out untouched, longer ones are streamed through a gzip compressor. Every
+    response of a compressible type carries ``Vary: Accept-Encoding``, whether
+    or not this particular one was compressed.
+    """
+
+    def __init__(self, wsgi_app, min_size=1024, level=6, mimetypes=(), exclude_paths=()):
+        self.wsgi_app = wsgi_app
+        self.min_size = min_size
+        self.level = level
+        self.mimetypes = frozenset(mimetypes)
+        self.exclude_paths = frozenset(exclude_paths)
+
+    def __call__(self, environ, start_response):
+        if environ.get("PATH_INFO") in self.exclude_paths:
+            return self.wsgi_app(environ, start_response)
+        accepts_gzip = (
+            environ.get("REQUEST_METHOD") != "HEAD"
+            and parse_accept_header(environ.get("HTTP_ACCEPT_ENCODING"))["gzip"]
+        )
+
+        captured = {}
+
+        def capture(status, headers, exc_info=None):
+            if exc_info and captured:
+                raise exc_info[1].with_traceback(exc_info[2])
+            captured.update(status=status, headers=headers, exc_info=exc_info)
+            return lambda data: None
+
+        body = self.wsgi_app(environ, capture)
+        return self._respond(body, captured, start_response, accepts_gzip)
+
+    def _varies(self, headers):
+        """Whether the encoding of this response depends on ``Accept-Encoding`` at all."""
+        if "Content-Encoding" in headers:
+            return False
+        return headers.get("Content-Type", "").split(";", 1)[0].strip() in self.mimetypes
+
+    def _eligible(self, status, headers):
+        if int(status.split(" ", 1)[0]) in (204, 206, 304):
+            return False
+        return headers.get("Content-Length") is None or int(headers["Content-Length"]) >= self.min_size
+
+    def _respond(self, body, captured, start_response, accepts_gzip):
+        try:
+            chunks = iter(body)
+            head, size, compress = [], 0, False
+            headers = Headers(captured["headers"])
+            varies = self._varies(headers)
+            if varies:
+                # Set even when this response goes out uncompressed, so shared caches
+                # never hand a plain body to a gzip client or a gzip body to anyone else.
+                vary = ", ".join(headers.getlist("Vary"))
+                if not vary or "accept-encoding" not in vary.lower():
+                    headers["Vary"] = f"{vary}, Accept-Encoding" if vary else "Accept-Encoding"
+            if varies and accepts_gzip and self._eligible(captured["status"], headers):
+                for chunk in chunks:
+                    head.append(chunk)
+                    size += len(chunk)
+                    if size >= self.min_size:
+                        break
+                compress = size >= self.min_size
+
+            if not compress:
+                start_response(captured["status"], headers.to_wsgi_list() if varies else captured["headers"], captured["exc_info"])
+                yield from head
+                yield from chunks
+                return
+
+            headers.remove("Content-Length")
+            headers["Content-Encoding"] = "gzip"
+            etag = headers.get("ETag")
+            if etag and not etag.startswith("W/"):
+                headers["ETag"] = f"W/{etag}"
+            start_response(captured["status"], headers.to_wsgi_list(), captured["exc_info"])
+
+            compressor = zlib.compressobj(self.level, zlib.DEFLATED, 31)
+            for chunk in itertools.chain(head, chunks):
+                out = compressor.compress(chunk)
+                if out:
+                    yield out
+            yield compressor.flush()
+        finally:
+            if hasattr(body, "close"):
+                body.close()
+
+
+def init_compression(app):
+    if not app.config["COMPRESS_ENABLED"]:
+        return
+    app.wsgi_app = GzipMiddleware(
+        app.wsgi_app,
+        min_size=app.config["COMPRESS_MIN_SIZE"],
+        level=app.config["COMPRESS_LEVEL"],
+        mimetypes=app.config["COMPRESS_MIMETYPES"],
+        exclude_paths=app.config["COMPRESS_EXCLUDE_PATHS"],
+    )
@@ -4,15 +4,29 @@ from flask import g
 
 from app.utils.auth import current_user_from_request
 from app.utils.errors import error_response
+from app.utils.permissions import compile_grants
+
+
+def has_permission(granted, permission) -> bool:
+    return compile_grants(frozenset(granted)).allows(permission)
+
+
+def current_grants():
+    grants = g.get("permission_trie")
+    if grants is None:
+        grants = g.permission_trie = compile_grants(frozenset(g.current_user.permissions()))
+    return grants
 
 
 def require_auth(fn):
     @wraps(fn)
     def wrapper(*args, **kwargs):
-        user = current_user_from_request()
+        # Batch sub-requests reuse the user the enclosing /api/batch call already authenticated.
+        user = g.get("batch_user") or current_user_from_request()
         if not user or not user.is_active:
             return error_response("UNAUTHORIZED", "Authentication required", 401)
         g.current_user = user
+        g.pop("permission_trie", None)
         return fn(*args, **kwargs)
 
     return wrapper
@@ -23,8 +37,7 @@ def require_perm(permission):
         @wraps(fn)
         @require_auth
         def wrapper(*args, **kwargs):
-            user = g.current_user
-            if permission not in user.permissions():
+            if not current_grants().allows(permission):
                 return error_response("FORBIDDEN", "You do not have required permission", 403, {"required": permission})
             return fn(*args, **kwargs)
 
@@ -1,6 +1,21 @@
 from flask import jsonify
 
 
+def error_payload(code: str, message: str, details=None):
+    return {"error": {"code": code, "message": message, "details": details or {}}}
+
+
 def error_response(code: str, message: str, status: int, details=None):
-    payload = {"error": {"code": code, "message": message, "details": details or {}}}
-    return jsonify(payload), status
+    return jsonify(error_payload(code, message, details)), status
+
+
+class ApiError(Exception):
+    def __init__(self, code: str, message: str, status: int, details=None):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+        self.status = status
+        self.details = details
+
+    def to_response(self):
+        return error_response(self.code, self.message, self.status, self.details)
@@ -0,0 +1,133 @@
+"""Structured JSON logging behind a bounded queue and a background listener.
+
+Request threads only enrich the record with request context and ``put_nowait``
+it on the queue; formatting and stream I/O happen on the listener thread.
+When the queue is full the record is dropped and counted instead of blocking.
+"""
+import atexit
+import json
+import logging
+import os
+import queue
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+from flask import g, has_request_context, request
+
+
+# Attributes every LogRecord has; anything else was passed via ``extra=`` and is emitted as a field.
+_RECORD_ATTRS = frozenset(logging.makeLogRecord({}).__dict__) | {"message", "asctime"}
+
+
+class RequestContextFilter(logging.Filter):
+    def filter(self, record):
+        if has_request_context():
+            user = g.get("current_user")
+            record.request_id = getattr(record, "request_id", None) or g.get("request_id")
+            record.user_id = getattr(record, "user_id", None) or (user.id if user is not None else None)
+            record.method = request.method
+            record.route = request.url_rule.rule if request.url_rule else request.path
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and value is not None:
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, default=str, separators=(",", ":"))
+
+
+class BoundedQueueHandler(QueueHandler):
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        # Resolve the message and traceback here; args and exc_info may not survive the thread hop.
+        record.message = record.getMessage()
+        if record.exc_info and not record.exc_text:
+            record.exc_text = JsonFormatter().formatException(record.exc_info)
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg, record.args, record.exc_info = record.message, None, None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class StdoutHandler(logging.StreamHandler):
+    # Resolve sys.stdout at write time so redirected streams (tests, daemons) are honoured.
+    @property
+    def stream(self):
+        return sys.stdout
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+
+class LogPipeline:
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.sink = StdoutHandler()
+        self.sink.setFormatter(JsonFormatter())
+        self.handler = BoundedQueueHandler(queue.Queue(maxsize))
+        self.handler.addFilter(RequestContextFilter())
+        self.listener = None
+
+    def start(self):
+        self.listener = QueueListener(self.handler.queue, self.sink, respect_handler_level=True)
+        self.listener.start()
+
+    def restart_after_fork(self):
+        # The parent's listener thread does not exist in the child and its queue lock may be held.
+        self.handler.queue = queue.Queue(self.maxsize)
+        self.start()
+
+    def stop(self):
+        if self.listener is not None and self.listener._thread is not None:
+            self.listener.stop()
+        if self.handler.dropped:
+            self.sink.emit(logging.makeLogRecord({
+                "name": __name__, "levelno": logging.WARNING, "levelname": "WARNING",
+                "msg": f"dropped {self.handler.dropped} log records (queue full)",
+            }))
+
+    def stats(self):
+        return {"queued": self.handler.queue.qsize(), "dropped": self.handler.dropped}
+
+
+_pipeline = None
+
+
+def configure_logging(app):
+    """Install the queue handler on the root logger once per process."""
+    global _pipeline
+    root = logging.getLogger()
+    root.setLevel(app.config["LOG_LEVEL"])
+    if _pipeline is None:
+        _pipeline = LogPipeline(app.config["LOG_QUEUE_SIZE"])
+        _pipeline.start()
+        root.addHandler(_pipeline.handler)
+        atexit.register(_pipeline.stop)
+        os.register_at_fork(after_in_child=_pipeline.restart_after_fork)
+    return _pipeline
+
+
+def log_stats():
+    return _pipeline.stats() if _pipeline else {"queued": 0, "dropped": 0}
@@ -0,0 +1,51 @@
+"""Permission grants compiled into a segment trie.
+
+A grant is either an exact name (``users.read``) or ends in a ``*`` segment
+that covers the whole subtree below it (``users.*``, ``reports.monthly.*``);
+a bare ``*`` grants everything. ``*`` anywhere but the last segment is a
+literal. Names with an empty segment (``users.``, ``a..b``) are malformed:
+such a grant grants nothing and such a permission is never allowed.
+Checking a permission walks one node per segment, however many grants the
+user holds.
+"""
+from functools import lru_cache
+
+
+WILDCARD = "*"
+# Not a string, so no segment can collide with the end-of-grant marker.
+_LEAF = object()
+
+
+class PermissionTrie:
+    __slots__ = ("root",)
+
+    def __init__(self, grants):
+        self.root = {}
+        for grant in grants:
+            segments = grant.split(".")
+            if "" in segments:
+                continue
+            node = self.root
+            for segment in segments:
+                node = node.setdefault(segment, {})
+            node[_LEAF] = True
+
+    def allows(self, permission: str) -> bool:
+        segments = permission.split(".")
+        if "" in segments:
+            return False
+        node = self.root
+        for segment in segments:
+            wildcard = node.get(WILDCARD)
+            if wildcard is not None and _LEAF in wildcard:
+                return True
+            node = node.get(segment)
+            if node is None:
+                return False
+        return _LEAF in node
+
+
+@lru_cache(maxsize=4096)
+def compile_grants(grants: frozenset) -> PermissionTrie:
+    # Keyed by the grant set, so users with the same group memberships share one trie.
+    return PermissionTrie(grants)
@@ -0,0 +1,129 @@
+"""Per-request cProfile dumps for ``PROFILE_ENABLED`` deployments.
+
+A request is profiled when it is one of every ``PROFILE_SAMPLE_RATE`` requests,
+or when it carries ``X-Profile-Signature`` (an HMAC of its ``X-Request-ID``
+under ``PROFILE_HEADER_SECRET``). A correctly signed request is always
+profiled, regardless of sampling. Dumps are named
+``<sanitized request id>.<UTC timestamp>-<random>.pstats`` so requests reusing
+an id never overwrite each other's dump.
+"""
+import cProfile
+import hashlib
+import hmac
+import itertools
+import os
+import pstats
+import re
+import time
+import uuid
+
+import click
+from flask import current_app, g, request
+from flask.cli import with_appcontext
+
+
+_request_counter = itertools.count(1)
+_unsafe_chars = re.compile(r"[^A-Za-z0-9_-]")
+
+
+def profile_signature(secret: str, request_id: str) -> str:
+    return hmac.new(secret.encode(), request_id.encode(), hashlib.sha256).hexdigest()
+
+
+def _wants_profile(cfg) -> bool:
+    secret = cfg["PROFILE_HEADER_SECRET"]
+    signature = request.headers.get("X-Profile-Signature")
+    if secret and signature:
+        return hmac.compare_digest(signature, profile_signature(secret, g.request_id))
+    rate = cfg["PROFILE_SAMPLE_RATE"]
+    return rate > 0 and next(_request_counter) % rate == 0
+
+
+def start_request_profile():
+    cfg = current_app.config
+    if not cfg["PROFILE_ENABLED"] or not _wants_profile(cfg):
+        return None
+    profiler = cProfile.Profile()
+    g.profiler = profiler
+    profiler.enable()
+    return profiler
+
+
+def finish_request_profile(_exc=None):
+    profiler = g.pop("profiler", None)
+    if profiler is None:
+        return None
+    profiler.disable()
+    out_dir = current_app.config["PROFILE_DIR"]
+    os.makedirs(out_dir, exist_ok=True)
+    name = _unsafe_chars.sub("_", getattr(g, "request_id", "") or "request")[:64]
+    # X-Request-ID is client supplied, so the id alone is not unique.
+    suffix = f"{time.strftime('%Y%m%dT%H%M%S', time.gmtime())}-{uuid.uuid4().hex[:8]}"
+    path = os.path.join(out_dir, f"{name}.{suffix}.pstats")
+    profiler.dump_stats(path)
+    return path
+
+
+def _frame_label(func):
+    filename, line, name = func
+    if filename == "~":
+        return name
+    return f"{os.path.basename(filename)}:{line}({name})"
+
+
+def collapse_stats(stats: pstats.Stats) -> dict[str, int]:
+    # cProfile only records caller -> callee edges, so each function is placed
+    # under its most expensive caller chain. That is enough for a flame graph
+    # of where self time goes, not an exact stack reconstruction.
+    raw = stats.stats
+    paths = {}
+
+    def path_for(func, seen=()):
+        if func in paths:
+            return paths[func]
+        callers = raw.get(func, (0, 0, 0, 0, {}))[4]
+        candidates = [c for c in callers if c not in seen and c != func]
+        if not candidates:
+            path = _frame_label(func)
+        else:
+            parent = max(candidates, key=lambda c: callers[c][3])
+            path = f"{path_for(parent, seen + (func,))};{_frame_label(func)}"
+        paths[func] = path
+        return path
+
+    folded = {}
+    for func, (_cc, _nc, tt, _ct, callers) in raw.items():
+        if not callers:
+            key = _frame_label(func)
+            folded[key] = folded.get(key, 0) + int(tt * 1_000_000)
+            continue
+        for caller, edge in callers.items():
+            prefix = path_for(caller, (func,)) if caller != func else path_for(func)
+            key = f"{prefix};{_frame_label(func)}"
+            folded[key] = folded.get(key, 0) + int(edge[2] * 1_000_000)
+    return {k: v for k, v in folded.items() if v > 0}
+
+
+@click.command("profile-aggregate")
+@click.option("--dir", "profile_dir", default=None, help="Directory with .pstats dumps (defaults to PROFILE_DIR).")
+@click.option("--output", default="profile.folded", show_default=True, help="Collapsed-stack output file.")
+@click.option("--match", default="", help="Only include dumps whose request id contains this string.")
+@with_appcontext
+def profile_aggregate(profile_dir, output, match):
+    profile_dir = profile_dir or current_app.config["PROFILE_DIR"]
+    dumps = sorted(
+        os.path.join(profile_dir, name)
+        for name in os.listdir(profile_dir)
+        if name.endswith(".pstats") and match in name
+    ) if os.path.isdir(profile_dir) else []
+    if not dumps:
+        print(f"No profile dumps found in {profile_dir}")
+        return
+    stats = pstats.Stats(dumps[0])
+    for path in dumps[1:]:
+        stats.add(path)
+    folded = collapse_stats(stats)
+    with open(output, "w") as fh:
+        for stack, micros in sorted(folded.items()):
+            fh.write(f"{stack} {micros}\n")
+    print(f"Aggregated {len(dumps)} profiles into {output} ({len(folded)} stacks)")
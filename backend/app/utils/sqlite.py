@@ -0,0 +1,40 @@
+"""SQLite connection tuning for local and single-node deployments.
+
+WAL lets readers run alongside the one writer, ``busy_timeout`` makes a
+writer wait for the lock instead of failing with ``database is locked``, and
+``synchronous=NORMAL`` skips the fsync on every commit (a power loss can drop
+the last transactions but never corrupts the file in WAL mode).
+"""
+from sqlalchemy import event
+from sqlalchemy.exc import OperationalError
+
+
+def sqlite_pragmas(config):
+    return {
+        "journal_mode": "WAL",
+        "busy_timeout": config["SQLITE_BUSY_TIMEOUT_MS"],
+        "synchronous": config["SQLITE_SYNCHRONOUS"],
+        "mmap_size": config["SQLITE_MMAP_SIZE"],
+        # Negative cache_size is in KiB rather than pages.
+        "cache_size": -config["SQLITE_CACHE_SIZE_KB"],
+    }
+
+
+def configure_sqlite(engine, config):
+    """Apply the pragmas to every new connection of a SQLite ``engine``; no-op for other dialects."""
+    if engine.dialect.name != "sqlite" or not config["SQLITE_TUNING"]:
+        return
+    pragmas = sqlite_pragmas(config)
+    if engine.url.database in (None, "", ":memory:"):
+        pragmas.pop("journal_mode")
+
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_conn, _record):
+        cursor = dbapi_conn.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+
+def is_locked_error(exc):
+    return isinstance(exc, OperationalError) and "database is locked" in str(exc.orig)
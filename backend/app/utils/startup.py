@@ -0,0 +1,59 @@
+import json
+import os
+import subprocess
+import sys
+
+import click
+
+
+_PROBE = """
+import json, time
+t0 = time.perf_counter()
+from app import create_app
+t1 = time.perf_counter()
+app = create_app({config!r})
+t2 = time.perf_counter()
+app.test_client().get("/healthz")
+t3 = time.perf_counter()
+print(json.dumps({{"import_ms": (t1 - t0) * 1000, "create_app_ms": (t2 - t1) * 1000, "first_request_ms": (t3 - t2) * 1000}}))
+"""
+
+
+def parse_importtime(stderr: str):
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        rows.append({"module": name.strip(), "self_ms": int(self_us) / 1000, "cumulative_ms": int(cumulative_us) / 1000, "depth": depth})
+    return rows
+
+
+def profile_startup(config_name: str):
+    env = {k: v for k, v in os.environ.items() if k != "FLASK_RUN_FROM_CLI"}
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE.format(config=config_name)],
+        capture_output=True, text=True, env=env, cwd=os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+    )
+    if proc.returncode != 0:
+        raise click.ClickException(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "startup probe failed")
+    timings = json.loads(proc.stdout.strip().splitlines()[-1])
+    return timings, parse_importtime(proc.stderr)
+
+
+@click.command("startup-profile")
+@click.option("--config", "config_name", default="production", show_default=True, help="Config name passed to create_app.")
+@click.option("--top", default=15, show_default=True, help="Number of slowest top-level imports to list.")
+def startup_profile(config_name, top):
+    """Report process start cost as gunicorn sees it: imports, create_app and the first request."""
+    timings, imports = profile_startup(config_name)
+    total = sum(timings.values())
+    print(f"import app        {timings['import_ms']:9.1f} ms")
+    print(f"create_app()      {timings['create_app_ms']:9.1f} ms")
+    print(f"first request     {timings['first_request_ms']:9.1f} ms")
+    print(f"total             {total:9.1f} ms")
+    print()
+    print(f"{'cumulative ms':>13}  {'self ms':>8}  module")
+    for row in sorted((r for r in imports if r["depth"] <= 1), key=lambda r: r["cumulative_ms"], reverse=True)[:top]:
+        print(f"{row['cumulative_ms']:>13.1f}  {row['self_ms']:>8.1f}  {'  ' * row['depth']}{row['module']}")
@@ -0,0 +1,46 @@
+import json
+import threading
+import time
+
+from flask import current_app, g, request
+
+
+_lock = threading.Lock()
+_handles = {}
+
+
+def mark_request_start():
+    g.request_started_at = time.time()
+    g.request_started = time.perf_counter()
+
+
+def request_latency_ms():
+    started = g.get("request_started")
+    return round((time.perf_counter() - started) * 1000, 3) if started is not None else None
+
+
+def _handle(path):
+    fh = _handles.get(path)
+    if fh is None:
+        fh = _handles[path] = open(path, "a", buffering=1)
+    return fh
+
+
+def record_request(resp):
+    path = current_app.config["TRAFFIC_RECORD_PATH"]
+    if not path:
+        return resp
+    # Only request metadata is kept: no headers, query strings or bodies.
+    entry = {
+        "ts": g.get("request_started_at"),
+        "method": request.method,
+        "route": request.url_rule.rule if request.url_rule else None,
+        "path": request.path,
+        "status": resp.status_code,
+        "latency_ms": request_latency_ms(),
+        "request_id": g.get("request_id"),
+    }
+    line = json.dumps(entry, separators=(",", ":")) + "\n"
+    with _lock:
+        _handle(path).write(line)
+    return resp
@@ -0,0 +1,103 @@
+"""Concurrent-connection capacity of one sync worker vs one ASGI worker.
+
+Start both servers with a single worker against the same database::
+
+    gunicorn -c gunicorn.conf.py -w 1 -b 127.0.0.1:8001 wsgi:app
+    uvicorn --workers 1 --port 8002 asgi:app
+
+then::
+
+    python -m benchmarks.async_capacity --login admin@example.com:secret \\
+        --target sync=http://127.0.0.1:8001 --target async=http://127.0.0.1:8002
+
+Each concurrency level keeps N connections busy for ``--duration`` seconds
+and reports throughput, latency percentiles and errors per target.
+"""
+import argparse
+import asyncio
+import json
+import time
+import urllib.request
+from urllib.parse import urlsplit
+
+from benchmarks.harness import run_metadata, summarize
+
+
+async def http_get(host, port, path, headers, timeout):
+    reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+    try:
+        lines = [f"GET {path} HTTP/1.1", f"Host: {host}:{port}", "Connection: close"]
+        lines += [f"{k}: {v}" for k, v in headers.items()]
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode())
+        await writer.drain()
+        data = await asyncio.wait_for(reader.read(), timeout)
+        return int(data.split(b" ", 2)[1])
+    finally:
+        writer.close()
+
+
+async def drive(target, path, headers, concurrency, duration, timeout):
+    parts = urlsplit(target)
+    samples, errors = [], 0
+    deadline = time.perf_counter() + duration
+
+    async def connection():
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                status = await http_get(parts.hostname, parts.port or 80, path, headers, timeout)
+            except (OSError, asyncio.TimeoutError, IndexError, ValueError):
+                status = 0
+            if status == 200:
+                samples.append(time.perf_counter() - started)
+            else:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(connection() for _ in range(concurrency)))
+    result = summarize(samples, time.perf_counter() - started)
+    result["errors"] = errors
+    return result
+
+
+def login(target, credentials):
+    email, password = credentials.split(":", 1)
+    req = urllib.request.Request(
+        target.rstrip("/") + "/api/auth/login",
+        data=json.dumps({"email": email, "password": password}).encode(),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    with urllib.request.urlopen(req, timeout=30) as resp:
+        return json.loads(resp.read())["token"]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare concurrent-connection capacity of sync and async workers.")
+    parser.add_argument("--target", action="append", required=True, help="name=url, repeatable")
+    parser.add_argument("--path", default="/api/auth/me")
+    parser.add_argument("--login", required=True, help="email:password")
+    parser.add_argument("--levels", default="1,10,50,100,200")
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--timeout", type=float, default=10.0)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args(argv)
+
+    targets = dict(t.split("=", 1) for t in args.target)
+    token = login(next(iter(targets.values())), args.login)
+    headers = {"Authorization": f"Bearer {token}"}
+    results = {}
+    print(f"{'target':<10} {'conns':>6} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'errors':>7}")
+    for level in (int(x) for x in args.levels.split(",")):
+        for name, url in targets.items():
+            row = asyncio.run(drive(url, args.path, headers, level, args.duration, args.timeout))
+            results[f"{name}.{level}"] = row
+            print(f"{name:<10} {level:>6} {row['ops_per_sec']:>9.1f} {row['p50_ms']:>9.2f} {row['p95_ms']:>9.2f} {row['errors']:>7}")
+    if args.output:
+        with open(args.output, "w") as fh:
+            json.dump({"meta": run_metadata(path=args.path, targets=targets), "results": results}, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+import json
+import platform
+import statistics
+import subprocess
+import time
+from datetime import datetime, timezone
+
+
+def percentile(samples, pct):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    idx = min(len(ordered) - 1, max(0, int(round(pct / 100 * (len(ordered) - 1)))))
+    return ordered[idx]
+
+
+def summarize(samples, total_seconds=None):
+    total = total_seconds if total_seconds is not None else sum(samples)
+    return {
+        "n": len(samples),
+        "mean_ms": round(statistics.fmean(samples) * 1000, 4) if samples else 0.0,
+        "p50_ms": round(percentile(samples, 50) * 1000, 4),
+        "p95_ms": round(percentile(samples, 95) * 1000, 4),
+        "p99_ms": round(percentile(samples, 99) * 1000, 4),
+        "ops_per_sec": round(len(samples) / total, 2) if total else 0.0,
+    }
+
+
+def measure(fn, iterations, warmup=0):
+    for _ in range(warmup):
+        fn()
+    samples = []
+    started = time.perf_counter()
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return summarize(samples, time.perf_counter() - started)
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_metadata(**extra):
+    return {
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        **extra,
+    }
+
+
+def write_results(path, meta, results):
+    with open(path, "w") as fh:
+        json.dump({"meta": meta, "results": results}, fh, indent=2, sort_keys=True)
+
+
+def compare(baseline_path, results):
+    with open(baseline_path) as fh:
+        baseline = json.load(fh)["results"]
+    lines = [f"{'benchmark':<40} {'p50 base':>10} {'p50 now':>10} {'delta':>8}"]
+    for name, now in sorted(results.items()):
+        base = baseline.get(name)
+        if not base or not base.get("p50_ms"):
+            lines.append(f"{name:<40} {'-':>10} {now['p50_ms']:>10.3f} {'new':>8}")
+            continue
+        delta = (now["p50_ms"] - base["p50_ms"]) / base["p50_ms"] * 100
+        lines.append(f"{name:<40} {base['p50_ms']:>10.3f} {now['p50_ms']:>10.3f} {delta:>+7.1f}%")
+    return "\n".join(lines)
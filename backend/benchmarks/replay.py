@@ -0,0 +1,135 @@
+"""Replay a traffic capture (TRAFFIC_RECORD_PATH) against a running instance.
+
+    python -m benchmarks.replay traffic.jsonl --target http://staging:8000 --rate 3 \\
+        --login admin@example.com:secret --bodies bodies.json --output replay.json
+
+Requests keep their recorded inter-arrival times divided by ``--rate``.
+Captures carry no bodies or credentials: POST/PATCH bodies come from
+``--bodies`` (a JSON object keyed by ``"METHOD /route/rule"``) and every
+request is sent with the bearer token from ``--token`` or ``--login``.
+"""
+import argparse
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.harness import run_metadata, summarize
+
+
+def load_capture(path, include_health=False):
+    entries = []
+    with open(path) as fh:
+        for line in fh:
+            line = line.strip()
+            if not line:
+                continue
+            entry = json.loads(line)
+            if entry.get("ts") is None or (not include_health and entry.get("path") == "/healthz"):
+                continue
+            entries.append(entry)
+    entries.sort(key=lambda e: e["ts"])
+    return entries
+
+
+def send(target, entry, token, bodies, timeout):
+    body = bodies.get(f"{entry['method']} {entry['route']}")
+    data = json.dumps(body).encode() if body is not None else None
+    req = urllib.request.Request(target.rstrip("/") + entry["path"], data=data, method=entry["method"])
+    req.add_header("Content-Type", "application/json")
+    if token:
+        req.add_header("Authorization", f"Bearer {token}")
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
+            resp.read()
+            status = resp.status
+    except urllib.error.HTTPError as exc:
+        exc.read()
+        status = exc.code
+    except (urllib.error.URLError, TimeoutError, ConnectionError):
+        status = 0
+    return time.perf_counter() - started, status
+
+
+def login(target, credentials):
+    email, password = credentials.split(":", 1)
+    req = urllib.request.Request(
+        target.rstrip("/") + "/api/auth/login",
+        data=json.dumps({"email": email, "password": password}).encode(),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    with urllib.request.urlopen(req, timeout=30) as resp:
+        return json.loads(resp.read())["token"]
+
+
+def replay(entries, target, rate, concurrency, token=None, bodies=None, timeout=30.0):
+    bodies = bodies or {}
+    latencies = defaultdict(list)
+    statuses = defaultdict(Counter)
+    lock = threading.Lock()
+
+    def run(entry):
+        elapsed, status = send(target, entry, token, bodies, timeout)
+        key = f"{entry['method']} {entry['route'] or entry['path']}"
+        with lock:
+            latencies[key].append(elapsed)
+            statuses[key][str(status)] += 1
+
+    first_ts = entries[0]["ts"] if entries else 0
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for entry in entries:
+            delay = (entry["ts"] - first_ts) / rate - (time.perf_counter() - started)
+            if delay > 0:
+                time.sleep(delay)
+            pool.submit(run, entry)
+    wall = time.perf_counter() - started
+
+    report = {}
+    for key, samples in latencies.items():
+        report[key] = summarize(samples, wall)
+        report[key]["status"] = dict(statuses[key])
+    return report, wall
+
+
+def print_report(report):
+    print(f"{'route':<45} {'n':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}  status")
+    for key, row in sorted(report.items()):
+        print(f"{key:<45} {row['n']:>6} {row['p50_ms']:>9.2f} {row['p95_ms']:>9.2f} {row['p99_ms']:>9.2f}  {row['status']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay captured traffic against a target instance.")
+    parser.add_argument("capture")
+    parser.add_argument("--target", default="http://localhost:8000")
+    parser.add_argument("--rate", type=float, default=1.0, help="Speed multiplier; 2 replays twice as fast.")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--token", default=None)
+    parser.add_argument("--login", default=None, help="email:password used to obtain a bearer token.")
+    parser.add_argument("--bodies", default=None, help="JSON file of request bodies keyed by 'METHOD /route'.")
+    parser.add_argument("--include-health", action="store_true")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args(argv)
+
+    entries = load_capture(args.capture, args.include_health)
+    token = args.token or (login(args.target, args.login) if args.login else None)
+    bodies = {}
+    if args.bodies:
+        with open(args.bodies) as fh:
+            bodies = json.load(fh)
+    report, wall = replay(entries, args.target, args.rate, args.concurrency, token, bodies, args.timeout)
+    print(f"Replayed {len(entries)} requests in {wall:.1f}s at {args.rate}x")
+    print_report(report)
+    if args.output:
+        with open(args.output, "w") as fh:
+            json.dump({"meta": run_metadata(target=args.target, rate=args.rate, requests=len(entries)), "results": report}, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Write throughput of several worker processes sharing one SQLite file.
+
+    python -m benchmarks.sqlite_writers --workers 1 2 4 8 --duration 5
+
+Each worker process builds its own app (like a gunicorn worker) and creates
+groups through ``POST /api/groups`` in a loop. Every level runs twice: with
+the stock SQLite settings and with the tuned profile (WAL, busy_timeout,
+synchronous=NORMAL and retried writes). The database file is recreated.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import time
+
+from app.extensions import db
+from benchmarks.harness import run_metadata, summarize
+from benchmarks.run import build_app, login_headers, reset_database
+
+
+PROFILES = {
+    "stock": {"SQLITE_TUNING": False, "SQLITE_WRITE_RETRIES": 0},
+    "tuned": {"SQLITE_TUNING": True},
+}
+
+
+def writer(worker_id, database_url, profile, level, duration, start_at, results):
+    app = build_app(database_url, bcrypt_rounds=4, LOG_ACCESS=False, **PROFILES[profile])
+    client = app.test_client()
+    samples, errors = [], 0
+    with app.app_context():
+        headers = login_headers(client)
+        while time.time() < start_at:
+            time.sleep(0.001)
+        deadline = time.perf_counter() + duration
+        n = 0
+        while time.perf_counter() < deadline:
+            n += 1
+            t0 = time.perf_counter()
+            try:
+                ok = client.post("/api/groups", headers=headers, json={"name": f"{profile}-{level}-{worker_id}-{n}"}).status_code == 201
+            except Exception:
+                ok = False
+                db.session.rollback()
+            if ok:
+                samples.append(time.perf_counter() - t0)
+            else:
+                errors += 1
+    results.put((samples, errors))
+
+
+def run_level(database_url, profile, workers, duration):
+    ctx = multiprocessing.get_context("spawn")
+    results = ctx.Queue()
+    start_at = time.time() + 3  # let every process finish importing and logging in
+    procs = [ctx.Process(target=writer, args=(i, database_url, profile, workers, duration, start_at, results)) for i in range(workers)]
+    for proc in procs:
+        proc.start()
+    samples, errors = [], 0
+    for _ in procs:
+        worker_samples, worker_errors = results.get()
+        samples += worker_samples
+        errors += worker_errors
+    for proc in procs:
+        proc.join()
+    return {**summarize(samples, duration), "errors": errors}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark concurrent SQLite writers.")
+    parser.add_argument("--database", default="sqlite-writers-bench.db")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args(argv)
+    database_url = f"sqlite:///{os.path.abspath(args.database)}"
+
+    results = {}
+    print(f"{'profile':<8} {'workers':>7} {'writes/s':>10} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for profile in PROFILES:
+        for path in (args.database, args.database + "-wal", args.database + "-shm"):
+            if os.path.exists(path):
+                os.remove(path)
+        app = build_app(database_url, bcrypt_rounds=4, **PROFILES[profile])
+        with app.app_context():
+            reset_database(100)
+            db.engine.dispose()
+        for workers in args.workers:
+            result = results[f"{profile}.workers_{workers}"] = run_level(database_url, profile, workers, args.duration)
+            print(f"{profile:<8} {workers:>7} {result['ops_per_sec']:>10.1f} {result['p50_ms']:>8.2f} {result['p99_ms']:>8.2f} {result['errors']:>7}")
+    if args.output:
+        with open(args.output, "w") as fh:
+            json.dump({"meta": run_metadata(database="sqlite", duration=args.duration), "results": results}, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Compare per-worker memory of the plain gunicorn command with gunicorn.conf.py.
+
+    DATABASE_URL=sqlite:///bench.db python -m benchmarks.worker_memory --workers 4
+
+Linux only: reads /proc/<pid>/smaps_rollup. PSS splits shared pages between
+the processes mapping them, so it shows what copy-on-write sharing saves.
+"""
+import argparse
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+
+
+PROFILES = {
+    # gunicorn reads ./gunicorn.conf.py by default, so the baseline points at an empty config.
+    "baseline": ["-c", os.devnull, "-w", "{workers}"],
+    "gunicorn.conf.py": ["-c", "gunicorn.conf.py", "-w", "{workers}"],
+}
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def children(pid):
+    with open(f"/proc/{pid}/task/{pid}/children") as fh:
+        return [int(p) for p in fh.read().split()]
+
+
+def memory_kb(pid):
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup") as fh:
+        for line in fh:
+            parts = line.split()
+            if len(parts) >= 2 and parts[0].rstrip(":") in ("Rss", "Pss", "Private_Clean", "Private_Dirty"):
+                values[parts[0].rstrip(":")] = int(parts[1])
+    return {"rss_kb": values["Rss"], "pss_kb": values["Pss"], "uss_kb": values["Private_Clean"] + values["Private_Dirty"]}
+
+
+def measure(profile, workers, requests):
+    port = free_port()
+    args = [a.format(workers=workers) for a in PROFILES[profile]]
+    cmd = [sys.executable, "-m", "gunicorn", *args, "-b", f"127.0.0.1:{port}", "wsgi:app"]
+    proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        deadline = time.time() + 30
+        while time.time() < deadline:
+            if len(children(proc.pid)) == workers:
+                try:
+                    urllib.request.urlopen(f"http://127.0.0.1:{port}/healthz", timeout=2).read()
+                    break
+                except OSError:
+                    pass
+            time.sleep(0.2)
+        for _ in range(requests):
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/healthz", timeout=5).read()
+        time.sleep(0.5)
+        per_worker = [memory_kb(pid) for pid in children(proc.pid)]
+        return {
+            "master": memory_kb(proc.pid),
+            "workers": per_worker,
+            "avg_worker_pss_kb": sum(w["pss_kb"] for w in per_worker) // max(1, len(per_worker)),
+            "avg_worker_uss_kb": sum(w["uss_kb"] for w in per_worker) // max(1, len(per_worker)),
+            "total_pss_kb": memory_kb(proc.pid)["pss_kb"] + sum(w["pss_kb"] for w in per_worker),
+        }
+    finally:
+        proc.send_signal(signal.SIGTERM)
+        proc.wait(timeout=30)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args(argv)
+    os.environ.setdefault("GUNICORN_MAX_REQUESTS", "0")
+
+    results = {name: measure(name, args.workers, args.requests) for name in PROFILES}
+    print(f"{'profile':<18} {'avg worker PSS':>15} {'avg worker USS':>15} {'total PSS':>12}")
+    for name, row in results.items():
+        print(f"{name:<18} {row['avg_worker_pss_kb'] / 1024:>12.1f} MB {row['avg_worker_uss_kb'] / 1024:>12.1f} MB {row['total_pss_kb'] / 1024:>9.1f} MB")
+    if args.output:
+        with open(args.output, "w") as fh:
+            json.dump(results, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
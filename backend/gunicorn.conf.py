@@ -0,0 +1,32 @@
+import gc
+import multiprocessing
+import os
+
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.getenv("GUNICORN_WORKERS", multiprocessing.cpu_count() * 2 + 1))
+# gthread workers: more threads than DB_POOL_SIZE + DB_MAX_OVERFLOW, so requests
+# beyond the pool are shed by admission control instead of queueing on checkout.
+threads = int(os.getenv("GUNICORN_THREADS", "8"))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "30"))
+# Import and build the app once in the master so workers share its pages copy-on-write.
+preload_app = os.getenv("GUNICORN_PRELOAD", "1") == "1"
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "2000"))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", "200"))
+# The app already writes one JSON app.access line per request (LOG_ACCESS); only
+# enable gunicorn's own access log (e.g. GUNICORN_ACCESS_LOG=-) with LOG_ACCESS=0.
+accesslog = os.getenv("GUNICORN_ACCESS_LOG") or None
+errorlog = "-"
+
+
+def pre_fork(server, worker):
+    # Move preloaded objects out of the GC's reach so collections in workers
+    # don't write to (and un-share) the master's pages.
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    from app.services.warmup import prepare_worker
+    from wsgi import app
+
+    prepare_worker(app)
@@ -0,0 +1,33 @@
+"""search indexes
+
+Revision ID: 20261019_0003
+Revises: 20261019_0002
+Create Date: 2026-10-19
+"""
+from alembic import op
+
+revision = '20261019_0003'
+down_revision = '20261019_0002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        op.execute('CREATE INDEX ix_users_email_trgm ON users USING gin (email gin_trgm_ops)')
+        op.execute('CREATE INDEX ix_groups_name_trgm ON groups USING gin (name gin_trgm_ops)')
+    else:
+        op.execute("CREATE VIRTUAL TABLE users_search USING fts5(email, tokenize='trigram')")
+        op.execute("CREATE VIRTUAL TABLE groups_search USING fts5(name, tokenize='trigram')")
+        op.execute('INSERT INTO users_search(rowid, email) SELECT id, email FROM users')
+        op.execute('INSERT INTO groups_search(rowid, name) SELECT id, name FROM groups')
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        op.drop_index('ix_groups_name_trgm', 'groups')
+        op.drop_index('ix_users_email_trgm', 'users')
+    else:
+        op.execute('DROP TABLE groups_search')
+        op.execute('DROP TABLE users_search')
@@ -0,0 +1,40 @@
+"""stat counters
+
+Revision ID: 20261019_0005
+Revises: 20261019_0004
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '20261019_0005'
+down_revision = '20261019_0004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('stat_counters',
+        sa.Column('name', sa.String(64), primary_key=True),
+        sa.Column('key', sa.String(160), primary_key=True, server_default=''),
+        sa.Column('value', sa.BigInteger(), nullable=False, server_default='0'),
+    )
+    # Seed from the existing rows; afterwards the app keeps them current (same queries as `flask stats-rebuild`).
+    op.execute("INSERT INTO stat_counters (name, key, value) SELECT 'users.total', '', COUNT(*) FROM users")
+    op.execute("INSERT INTO stat_counters (name, key, value) SELECT 'users.active', '', COUNT(*) FROM users WHERE is_active")
+    op.execute("INSERT INTO stat_counters (name, key, value) SELECT 'users.locked', '', COUNT(*) FROM users WHERE locked_until IS NOT NULL")
+    op.execute(
+        "INSERT INTO stat_counters (name, key, value) "
+        "SELECT 'group.members', CAST(group_id AS VARCHAR(160)), COUNT(*) FROM group_members GROUP BY group_id"
+    )
+    # UTC days, like the app; on Postgres date() alone would use the session time zone.
+    day = "date(timezone('UTC', created_at))" if op.get_bind().dialect.name == "postgresql" else "date(created_at)"
+    op.execute(
+        "INSERT INTO stat_counters (name, key, value) "
+        f"SELECT 'audit.events', CAST({day} AS VARCHAR(10)) || '|' || event_type, COUNT(*) "
+        f"FROM audit_logs GROUP BY {day}, event_type"
+    )
+
+
+def downgrade():
+    op.drop_table('stat_counters')
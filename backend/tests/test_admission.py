@@ -0,0 +1,144 @@
+import threading
+import time
+
+from flask import current_app, jsonify
+from sqlalchemy import select
+
+from app import create_app
+from app.extensions import db
+from app.utils.admission import AdmissionController, admission_limits, parse_route_limits
+from conftest import login
+
+
+def test_full_lane_sheds_with_retry_after_while_auth_lane_still_serves(app, client):
+    controller = current_app.extensions["admission"]
+    controller.queue_timeout = 0
+    headers = login(client, "admin@example.com", "admin123!")
+
+    held = [controller.admit("api.users_list") for _ in range(controller.lanes["api"].limit)]
+    try:
+        resp = client.get('/api/users', headers=headers)
+        assert resp.status_code == 503
+        assert resp.headers["Retry-After"] == "1"
+        assert resp.get_json()["error"]["code"] == "OVERLOADED"
+        assert client.get('/api/auth/me', headers=headers).status_code == 200
+        assert controller.lanes["api"].shed == 1
+        # The rejected request gave back the route/global slots it did not keep.
+        assert controller.global_gate.in_flight == controller.lanes["api"].limit
+    finally:
+        for slots in held:
+            controller.release(slots)
+
+    assert client.get('/api/users', headers=headers).status_code == 200
+    assert controller.global_gate.in_flight == 0
+
+
+def test_route_limit_and_batch_sub_requests_share_the_parent_slot(app, client):
+    controller = current_app.extensions["admission"]
+    assert controller.routes["api.batch"].limit == 4
+    headers = login(client, "admin@example.com", "admin123!")
+    resp = client.post('/api/batch', headers=headers, json={"requests": [{"method": "GET", "path": "/api/users"}] * 3})
+    assert [r["status"] for r in resp.get_json()["responses"]] == [200, 200, 200]
+
+    controller.queue_timeout = 0
+    held = controller.admit("api.rbac_sync")
+    try:
+        resp = client.post('/api/rbac/sync', headers=headers, json={"groups": {}})
+        assert resp.status_code == 503
+    finally:
+        controller.release(held)
+
+
+def test_readiness_reports_saturation(app, client):
+    assert client.get('/healthz').get_json() == {"ok": True}
+    assert client.get('/healthz?ready=1').status_code == 200
+
+    controller = current_app.extensions["admission"]
+    held = [controller.admit("api.users_list") for _ in range(controller.lanes["api"].limit)]
+    held += [controller.admit("auth.me") for _ in range(controller.global_gate.limit - controller.lanes["api"].limit)]
+    assert None not in held
+    try:
+        resp = client.get('/healthz?ready=1')
+        assert resp.status_code == 503 and "Retry-After" in resp.headers
+        assert resp.get_json()["saturated"] == ["admission"]
+        assert client.get('/healthz').status_code == 200
+    finally:
+        for slots in held:
+            controller.release(slots)
+
+
+def test_parse_route_limits():
+    assert parse_route_limits("api.batch=4, api.rbac_sync=1,") == {"api.batch": 4, "api.rbac_sync": 1}
+    controller = AdmissionController(2, {"auth": 1, "api": 1}, {}, 0)
+    first = controller.admit("auth.login")
+    assert controller.admit("auth.login") is None
+    assert controller.admit("api.users_list") is not None
+    assert controller.admit("api.groups_list") is None
+    assert controller.global_gate.in_flight == 2 and first is not None
+
+
+def test_default_caps_follow_the_db_pool():
+    config = {"DB_POOL_SIZE": 12, "DB_MAX_OVERFLOW": 4, "ADMISSION_MAX_INFLIGHT": None, "ADMISSION_AUTH_LIMIT": None, "ADMISSION_API_LIMIT": None}
+    global_limit, lanes = admission_limits(config)
+    assert global_limit == 16
+    assert lanes == {"auth": 4, "api": 14}
+    assert lanes["auth"] + lanes["api"] > global_limit
+    assert admission_limits({**config, "ADMISSION_API_LIMIT": 5})[1]["api"] == 5
+
+
+def pool_app(tmp_path, **overrides):
+    app = create_app("testing", {
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'pool.db'}",
+        "DB_POOL_SIZE": 4, "DB_MAX_OVERFLOW": 0, "ADMISSION_QUEUE_TIMEOUT_MS": 200, **overrides,
+    })
+    with app.app_context():
+        db.create_all()
+    release = threading.Event()
+
+    def slow():
+        db.session.execute(select(1))
+        release.wait(5)
+        return jsonify({"ok": True})
+
+    app.add_url_rule("/api/slow", "api.slow", slow)
+    return app, release
+
+
+def saturate(app, release, requests):
+    statuses = []
+
+    def call():
+        statuses.append(app.test_client().get("/api/slow").status_code)
+
+    threads = [threading.Thread(target=call) for _ in range(requests)]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline and len(statuses) < requests - app.config["DB_POOL_SIZE"]:
+        time.sleep(0.01)
+    with app.app_context():
+        checked_out = db.engine.pool.checkedout()
+        login = app.test_client().post("/api/auth/login", json={"email": "nobody@example.com", "password": "wrong-password"})
+    release.set()
+    for thread in threads:
+        thread.join()
+    return sorted(statuses), checked_out, login.status_code
+
+
+def test_threaded_requests_beyond_the_pool_are_shed_before_checkout(tmp_path):
+    app, release = pool_app(tmp_path)
+    controller = app.extensions["admission"]
+    assert (controller.global_gate.limit, controller.lanes["api"].limit) == (4, 3)
+
+    statuses, checked_out, login_status = saturate(app, release, 8)
+    # The api lane leaves a pooled connection for auth, so logins still reach the database.
+    assert statuses == [200] * 3 + [503] * 5
+    assert checked_out == 3 and login_status == 401
+    assert controller.lanes["api"].shed == 5
+
+
+def test_pool_checkout_timeout_without_admission_is_a_503(tmp_path):
+    app, release = pool_app(tmp_path, ADMISSION_ENABLED=False)
+    statuses, checked_out, login_status = saturate(app, release, 6)
+    assert statuses == [200] * 4 + [503] * 2
+    assert checked_out == 4 and login_status == 503
@@ -0,0 +1,99 @@
+import asyncio
+import json
+
+import jwt
+import pytest
+from sqlalchemy.exc import OperationalError
+
+pytest.importorskip("aiosqlite")
+pytest.importorskip("asgiref")
+
+from app.asgi import create_asgi_app
+from app.extensions import bcrypt, db
+from app.models import AuditLog, Group, Permission, User
+
+
+def asgi_get(asgi_app, path, headers=None):
+    scope = {
+        "type": "http", "method": "GET", "path": path, "raw_path": path.encode(), "query_string": b"",
+        "headers": [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()],
+        "scheme": "http", "server": ("testserver", 80), "client": ("127.0.0.1", 1234), "root_path": "",
+        "http_version": "1.1", "asgi": {"version": "3.0"},
+    }
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(asgi_app(scope, receive, send))
+    status = sent[0]["status"]
+    body = b"".join(m.get("body", b"") for m in sent[1:])
+    return status, json.loads(body)
+
+
+@pytest.fixture
+def asgi_app(tmp_path):
+    asgi_app = create_asgi_app("testing", {"SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'asgi.db'}"})
+    with asgi_app.flask_app.app_context():
+        db.create_all()
+        group = Group(name="Admin", permissions=[Permission(name="users.read"), Permission(name="audit.read")])
+        admin = User(email="admin@example.com", password_hash=bcrypt.generate_password_hash("admin123!").decode(), groups=[group])
+        viewer = User(email="viewer@example.com", password_hash=bcrypt.generate_password_hash("viewer123!").decode())
+        db.session.add_all([admin, viewer, AuditLog(event_type="seed", target_type="user", details={})])
+        db.session.commit()
+    yield asgi_app
+    asyncio.run(asgi_app.engine.dispose())
+
+
+def test_async_reads_match_sync_endpoints(asgi_app):
+    client = asgi_app.flask_app.test_client()
+    token = client.post("/api/auth/login", json={"email": "admin@example.com", "password": "admin123!"}).get_json()["token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    for path in ["/api/auth/me", "/api/users/1", "/api/users/2", "/api/users/99"]:
+        sync = client.get(path, headers=headers)
+        assert asgi_get(asgi_app, path, headers) == (sync.status_code, sync.get_json())
+
+    status, body = asgi_get(asgi_app, "/api/audit", headers)
+    assert status == 200
+    assert body == client.get("/api/audit", headers=headers).get_json()
+
+
+def test_async_auth_errors_match_sync_semantics(asgi_app):
+    client = asgi_app.flask_app.test_client()
+    assert asgi_get(asgi_app, "/api/auth/me")[1]["error"]["code"] == "UNAUTHORIZED"
+
+    token = client.post("/api/auth/login", json={"email": "viewer@example.com", "password": "viewer123!"}).get_json()["token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    status, body = asgi_get(asgi_app, "/api/audit", headers)
+    sync = client.get("/api/audit", headers=headers)
+    assert (status, body) == (sync.status_code, sync.get_json()) == (403, body)
+    assert body["error"]["details"] == {"required": "audit.read"}
+
+    assert asgi_get(asgi_app, "/healthz") == (200, {"ok": True})
+
+    client.post("/api/auth/logout", headers=headers)
+    assert asgi_get(asgi_app, "/api/auth/me", headers)[0] == 401
+
+
+def test_async_malformed_subject_and_failures_use_error_envelope(asgi_app, monkeypatch):
+    client = asgi_app.flask_app.test_client()
+    for claims in ({}, {"sub": "not-a-number"}):
+        token = jwt.encode(claims, asgi_app.jwt["key"], algorithm=asgi_app.jwt["algorithms"][0])
+        headers = {"Authorization": f"Bearer {token}"}
+        sync = client.get("/api/auth/me", headers=headers)
+        assert asgi_get(asgi_app, "/api/auth/me", headers) == (sync.status_code, sync.get_json())
+        assert sync.status_code == 401
+
+    token = client.post("/api/auth/login", json={"email": "admin@example.com", "password": "admin123!"}).get_json()["token"]
+
+    async def broken(*_args):
+        raise OperationalError("SELECT 1", {}, Exception("connection reset"))
+
+    monkeypatch.setattr(asgi_app, "user_permissions", broken)
+    status, body = asgi_get(asgi_app, "/api/auth/me", {"Authorization": f"Bearer {token}"})
+    assert status == 500
+    assert body["error"]["code"] == "INTERNAL_ERROR"
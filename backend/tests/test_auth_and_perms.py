@@ -1,3 +1,6 @@
+import pytest
+
+from app.extensions import db
 from conftest import login
 
 
@@ -23,3 +26,195 @@ def test_group_membership_affects_permissions(client, app):
     viewer_headers = login(client, "viewer@example.com", "viewer123!")
     ok_resp = client.get('/api/users', headers=viewer_headers)
     assert ok_resp.status_code == 200
+
+
+def test_worker_warmup_keeps_app_usable(app, client):
+    from app.services.warmup import warm_worker
+
+    warm_worker()
+    assert "jwt_settings" in app.extensions
+    headers = login(client, "admin@example.com", "admin123!")
+    assert client.get('/api/auth/me', headers=headers).status_code == 200
+
+
+def test_mutation_and_audit_commit_once(app, client):
+    from sqlalchemy import event
+    from sqlalchemy.orm import Session
+
+    headers = login(client, "admin@example.com", "admin123!")
+    commits = []
+    listener = lambda session: commits.append(session)
+    event.listen(Session, "after_commit", listener)
+    try:
+        resp = client.patch('/api/users/2', headers=headers, json={"must_reset_password": True})
+    finally:
+        event.remove(Session, "after_commit", listener)
+    assert resp.status_code == 200
+    assert len(commits) == 1
+
+
+def test_failed_audit_rolls_back_mutation(app, client, monkeypatch):
+    import app.api.routes as routes
+    from app.models import AuditLog, Group
+
+    headers = login(client, "admin@example.com", "admin123!")
+    audit_rows = AuditLog.query.count()
+
+    def broken_log_event(*args, **kwargs):
+        raise RuntimeError("audit store unavailable")
+
+    monkeypatch.setattr(routes, "log_event", broken_log_event)
+    with pytest.raises(RuntimeError):
+        client.post('/api/groups', headers=headers, json={"name": "Doomed"})
+    assert Group.query.filter_by(name="Doomed").first() is None
+    assert AuditLog.query.count() == audit_rows
+
+
+def test_logout_revokes_token_across_workers(app, client):
+    from app.models import RevokedToken
+    from app.services.revocation import RevocationCache, prune_revoked_tokens
+
+    headers = login(client, "admin@example.com", "admin123!")
+    other = login(client, "admin@example.com", "admin123!")
+    assert client.post('/api/auth/logout', headers=headers).status_code == 200
+    assert client.get('/api/auth/me', headers=headers).status_code == 401
+    assert client.get('/api/auth/me', headers=other).status_code == 200
+    assert RevokedToken.query.count() == 1
+
+    # A worker that never saw the logout picks the jti up from the table.
+    app.extensions["revocation_cache"] = RevocationCache()
+    assert client.get('/api/auth/me', headers=headers).status_code == 401
+    assert client.get('/api/auth/me', headers=other).status_code == 200
+
+    # Older revocations outside the recent set are confirmed against the database.
+    cache = app.extensions["revocation_cache"] = RevocationCache(recent_size=1)
+    client.get('/api/auth/me', headers=other)
+    cache.add("unrelated-jti")
+    assert client.get('/api/auth/me', headers=headers).status_code == 401
+
+    assert prune_revoked_tokens() == 0
+
+
+def test_revocations_committed_out_of_order_are_not_missed(app, client):
+    import time
+    from datetime import datetime, timedelta, timezone
+
+    from app.models import RevokedToken
+    from app.services.revocation import RevocationCache, refresh_revocations
+
+    cache = app.extensions["revocation_cache"] = RevocationCache(refresh_seconds=0, overlap_seconds=60, full_refresh_seconds=3600)
+    now = datetime.now(timezone.utc)
+    expires = now + timedelta(hours=1)
+    db.session.add(RevokedToken(jti="late-b", expires_at=expires, revoked_at=now))
+    db.session.commit()
+    refresh_revocations(force=True)
+    assert cache.check("late-b") is True
+
+    # A logout that started earlier commits after the worker already saw a newer row.
+    db.session.add(RevokedToken(jti="late-a", expires_at=expires, revoked_at=now - timedelta(seconds=10)))
+    db.session.commit()
+    assert refresh_revocations(force=True).check("late-a") is True
+    assert cache.count == 2  # rows re-read from the overlap window are not counted again
+
+    # Commits delayed beyond the overlap are picked up by the periodic full rebuild.
+    db.session.add(RevokedToken(jti="very-late", expires_at=expires, revoked_at=now - timedelta(minutes=10)))
+    db.session.commit()
+    refresh_revocations(force=True)
+    assert cache.check("very-late") is False
+    cache.full_refresh_seconds = 0
+    time.sleep(0.001)
+    assert refresh_revocations(force=True).check("very-late") is True
+
+
+def test_revoking_the_same_token_twice_is_a_noop(app, client):
+    from app.models import RevokedToken
+    from app.services.revocation import revoke_token
+
+    headers = login(client, "admin@example.com", "admin123!")
+    assert client.post('/api/auth/logout', headers=headers).status_code == 200
+    assert client.post('/api/auth/logout', headers=headers).status_code == 200
+    jti = RevokedToken.query.one().jti
+    revoke_token({"jti": jti, "sub": "1", "exp": 4102444800})
+    db.session.commit()
+    assert RevokedToken.query.count() == 1
+
+
+def test_logout_with_a_malformed_subject_still_revokes(app, client):
+    import jwt
+
+    from app.models import RevokedToken
+    from app.utils.auth import jwt_settings
+
+    settings = jwt_settings()
+    token = jwt.encode({"sub": "not-a-number", "jti": "odd-subject", "exp": 4102444800}, settings["key"], algorithm=settings["algorithms"][0])
+    assert client.post('/api/auth/logout', headers={"Authorization": f"Bearer {token}"}).status_code == 200
+    assert RevokedToken.query.filter_by(jti="odd-subject").one().user_id is None
+
+
+def test_validation_errors_render_uniformly(client):
+    resp = client.post('/api/auth/login', json={})
+    assert resp.status_code == 400
+    body = resp.get_json()["error"]
+    assert body["code"] == "VALIDATION_ERROR"
+    assert set(body["details"]) == {"email", "password"}
+
+    resp = client.post('/api/auth/login', json={"email": "not-an-email", "password": "x"})
+    assert resp.status_code == 400
+    assert "email" in resp.get_json()["error"]["details"]
+
+    headers = login(client, "admin@example.com", "admin123!")
+    assert client.patch('/api/users/2', headers=headers, json={}).status_code == 400
+    assert client.post('/api/groups', headers=headers, json=["name"]).status_code == 400
+
+
+def test_compiled_schema_fast_path_matches_marshmallow():
+    from app.schemas.payloads import LoginSchema, UserPatchSchema, login_schema, user_patch_schema
+
+    for compiled, schema_cls, payload in [
+        (login_schema, LoginSchema, {"email": "a@example.com", "password": "pw"}),
+        (login_schema, LoginSchema, {"email": "a@example.com", "password": "pw", "remember_me": True}),
+        (login_schema, LoginSchema, {"email": "a@example.com", "password": "pw", "remember_me": "yes"}),
+        (user_patch_schema, UserPatchSchema, {"is_active": False}),
+        (user_patch_schema, UserPatchSchema, {"is_active": 1}),
+    ]:
+        assert compiled.load(dict(payload)) == schema_cls().load(dict(payload))
+    assert login_schema._fast_load({"email": "a@example.com", "password": "pw"}) is not None
+    assert login_schema._fast_load({"email": "a@example.com", "password": "pw", "extra": 1}) is None
+
+
+def test_permission_trie_wildcards():
+    from app.utils.permissions import PermissionTrie
+
+    trie = PermissionTrie(["users.read", "reports.*", "billing.invoices.*"])
+    assert trie.allows("users.read")
+    assert not trie.allows("users.write")
+    assert not trie.allows("users")
+    assert trie.allows("reports.read") and trie.allows("reports.monthly.export")
+    assert not trie.allows("reports")
+    assert trie.allows("billing.invoices.void") and not trie.allows("billing.refunds.create")
+    assert PermissionTrie(["*"]).allows("anything.at.all")
+    assert not PermissionTrie(["users.*.read"]).allows("users.x.read")
+    assert not PermissionTrie([]).allows("users.read")
+
+
+def test_permission_trie_rejects_empty_segments():
+    from app.utils.permissions import PermissionTrie
+
+    trie = PermissionTrie(["users.", "a..b", ".", "users.read"])
+    assert not trie.allows("users")
+    assert not trie.allows("users.")
+    assert not trie.allows("a..b") and not trie.allows("a.b")
+    assert trie.allows("users.read") and not trie.allows("users.read.")
+    assert not trie.allows("a..") and not trie.allows("") and not trie.allows(".")
+    assert not PermissionTrie(["*"]).allows("users..read")
+
+
+def test_wildcard_grant_satisfies_require_perm(client):
+    admin_headers = login(client, "admin@example.com", "admin123!")
+    viewer_headers = login(client, "viewer@example.com", "viewer123!")
+    assert client.get('/api/users', headers=viewer_headers).status_code == 403
+
+    client.post('/api/groups/2/perms', headers=admin_headers, json={"permission": "users.*", "action": "add"})
+    assert client.get('/api/users', headers=viewer_headers).status_code == 200
+    assert client.patch('/api/users/2', headers=viewer_headers, json={"is_active": True}).status_code == 200
+    assert client.get('/api/groups', headers=viewer_headers).status_code == 403
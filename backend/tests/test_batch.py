@@ -0,0 +1,52 @@
+from app import create_app
+from app.extensions import bcrypt, db
+from app.models import Group, Permission, User
+from conftest import login
+
+
+def test_batch_dispatches_through_blueprints(client):
+    headers = login(client, "admin@example.com", "admin123!")
+    resp = client.post('/api/batch', headers=headers, json={"requests": [
+        {"method": "GET", "path": "/api/auth/me"},
+        {"method": "GET", "path": "/api/users"},
+        {"method": "POST", "path": "/api/groups", "body": {"name": "Batch"}},
+        {"method": "GET", "path": "/api/users/999"},
+        {"method": "PATCH", "path": "/api/groups/1", "body": {}},
+    ]})
+    assert resp.status_code == 200
+    results = resp.get_json()["responses"]
+    assert [r["status"] for r in results] == [200, 200, 201, 404, 400]
+    assert results[0]["body"] == client.get('/api/auth/me', headers=headers).get_json()
+    assert results[1]["body"] == client.get('/api/users', headers=headers).get_json()
+    assert results[2]["body"]["name"] == "Batch"
+    assert Group.query.filter_by(name="Batch").count() == 1
+
+
+def test_batch_enforces_auth_permissions_and_paths(client):
+    assert client.post('/api/batch', json={"requests": [{"method": "GET", "path": "/api/users"}]}).status_code == 401
+
+    headers = login(client, "viewer@example.com", "viewer123!")
+    resp = client.post('/api/batch', headers=headers, json={"requests": [{"method": "GET", "path": "/api/users"}]})
+    assert resp.get_json()["responses"][0]["status"] == 403
+
+    for path in ["/api/batch", "/healthz"]:
+        resp = client.post('/api/batch', headers=headers, json={"requests": [{"method": "GET", "path": path}]})
+        assert resp.status_code == 400
+    assert client.post('/api/batch', headers=headers, json={"requests": []}).status_code == 400
+
+
+def test_batch_runs_reads_concurrently(tmp_path):
+    app = create_app("testing", {"SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'batch.db'}"})
+    with app.app_context():
+        db.create_all()
+        perms = [Permission(name=p) for p in ["users.read", "groups.read", "audit.read"]]
+        db.session.add(User(email="admin@example.com", password_hash=bcrypt.generate_password_hash("admin123!").decode(),
+                            groups=[Group(name="Admin", permissions=perms)]))
+        db.session.commit()
+    client = app.test_client()
+    headers = login(client, "admin@example.com", "admin123!")
+    paths = ["/api/users", "/api/groups", "/api/audit", "/api/users/1", "/api/auth/me"]
+    resp = client.post('/api/batch', headers=headers, json={"parallel": True, "requests": [{"method": "GET", "path": p} for p in paths]})
+    results = resp.get_json()["responses"]
+    assert [r["status"] for r in results] == [200] * len(paths)
+    assert [r["body"] for r in results] == [client.get(p, headers=headers).get_json() for p in paths]
@@ -0,0 +1,64 @@
+import gzip
+import json
+
+from flask import Response
+
+from app import create_app
+from app.extensions import db
+from app.models import User
+from conftest import login
+
+
+def test_large_json_is_gzipped_and_small_responses_bypass(client, app):
+    with app.app_context():
+        db.session.add_all(User(email=f"bulk{i}@example.com", password_hash="x") for i in range(50))
+        db.session.commit()
+    headers = login(client, "admin@example.com", "admin123!")
+
+    plain = client.get("/api/users", headers=headers)
+    assert "Content-Encoding" not in plain.headers
+    assert "Accept-Encoding" in plain.headers["Vary"]
+
+    resp = client.get("/api/users", headers={**headers, "Accept-Encoding": "gzip, br"})
+    assert resp.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in resp.headers["Vary"]
+    assert "Content-Length" not in resp.headers
+    assert json.loads(gzip.decompress(resp.data)) == plain.get_json()
+
+    health = client.get("/healthz", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in health.headers
+    assert "Vary" not in health.headers
+    small = client.get("/api/auth/me", headers={**headers, "Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in small.headers
+    assert "Accept-Encoding" in small.headers["Vary"]
+
+
+def test_vary_is_merged_into_existing_header():
+    app = create_app("testing")
+    app.add_url_rule("/text", "text", lambda: Response("x", mimetype="text/plain", headers={"Vary": "Origin"}))
+    app.add_url_rule("/png", "png", lambda: Response(b"x" * 4096, mimetype="image/png"))
+    client = app.test_client()
+    assert client.get("/text").headers["Vary"] == "Origin, Accept-Encoding"
+    assert client.get("/text", headers={"Accept-Encoding": "gzip"}).headers["Vary"] == "Origin, Accept-Encoding"
+    assert "Vary" not in client.get("/png", headers={"Accept-Encoding": "gzip"}).headers
+
+
+def test_streamed_response_is_compressed_lazily():
+    app = create_app("testing", {"COMPRESS_MIN_SIZE": 64})
+    with app.app_context():
+        db.create_all()
+    produced = []
+
+    def rows():
+        yield "["
+        for i in range(1000):
+            produced.append(i)
+            yield ("," if i else "") + json.dumps({"id": i, "email": f"user{i}@example.com"})
+        yield "]"
+
+    app.add_url_rule("/stream", "stream", lambda: Response(rows(), mimetype="application/json"))
+    resp = app.test_client().get("/stream", headers={"Accept-Encoding": "gzip"}, buffered=False)
+    assert resp.headers["Content-Encoding"] == "gzip"
+    assert len(produced) < 10
+    body = gzip.decompress(b"".join(resp.response))
+    assert len(json.loads(body)) == 1000
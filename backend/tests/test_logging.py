@@ -0,0 +1,34 @@
+import json
+import logging
+
+from app.services.mail import ConsoleBackend, deliver_batch
+from app.utils.log import LogPipeline, configure_logging
+from conftest import login
+
+
+def test_requests_emit_structured_access_log(app, client, capsys):
+    pipeline = configure_logging(app)
+    headers = login(client, "admin@example.com", "admin123!")
+    client.get('/api/auth/me', headers={**headers, "X-Request-ID": "log-rid"})
+    client.post('/api/auth/request-password-reset', json={"email": "admin@example.com"}, headers={"X-Request-ID": "mail-rid"})
+    deliver_batch(ConsoleBackend())
+    pipeline.stop()  # drains the queue
+    pipeline.start()
+
+    entries = [json.loads(line) for line in capsys.readouterr().out.splitlines() if line.startswith("{")]
+    access = next(e for e in entries if e.get("request_id") == "log-rid")
+    assert access["logger"] == "app.access"
+    assert (access["route"], access["method"], access["status"], access["user_id"]) == ("/api/auth/me", "GET", 200, 1)
+    assert access["latency_ms"] >= 0
+    assert next(e for e in entries if e.get("request_id") == "mail-rid")["route"] == "/api/auth/request-password-reset"
+    mail = next(e for e in entries if e["logger"] == "app.services.mail" and e["message"] == "email")
+    assert mail["to"] == "admin@example.com" and "reset-password?token=" in mail["body"]
+
+
+def test_full_queue_drops_instead_of_blocking():
+    pipeline = LogPipeline(maxsize=2)
+    record = logging.makeLogRecord({"msg": "hello %s", "args": ("world",), "levelno": logging.INFO, "levelname": "INFO"})
+    for _ in range(5):
+        pipeline.handler.handle(record)
+    assert pipeline.stats() == {"queued": 2, "dropped": 3}
+    assert pipeline.handler.queue.get_nowait().getMessage() == "hello world"
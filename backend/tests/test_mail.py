@@ -0,0 +1,144 @@
+import socket
+import threading
+from datetime import datetime, timedelta, timezone
+
+from app.extensions import db
+from app.models import OutboundEmail
+from app.services.mail import SMTPPool, deliver_batch
+from conftest import login
+
+
+class SMTPStub:
+    """Just enough SMTP to accept messages; recipients in ``reject`` get a 550."""
+
+    def __init__(self, reject=()):
+        self.reject = set(reject)
+        self.messages = []
+        self.connections = 0
+        self.sock = socket.create_server(("127.0.0.1", 0))
+        self.port = self.sock.getsockname()[1]
+        threading.Thread(target=self._serve, daemon=True).start()
+
+    def _serve(self):
+        while True:
+            try:
+                conn, _ = self.sock.accept()
+            except OSError:
+                return
+            self.connections += 1
+            threading.Thread(target=self._session, args=(conn,), daemon=True).start()
+
+    def _session(self, conn):
+        stream = conn.makefile("rwb")
+
+        def reply(line):
+            stream.write(line.encode() + b"\r\n")
+            stream.flush()
+
+        reply("220 stub ready")
+        rcpt = []
+        for raw in stream:
+            verb = raw.decode().strip().split(" ", 1)[0].upper()
+            if verb in ("EHLO", "HELO"):
+                reply("250 stub")
+            elif verb == "RCPT":
+                address = raw.decode().split("<", 1)[1].split(">", 1)[0]
+                if address in self.reject:
+                    reply("550 no such user")
+                else:
+                    rcpt.append(address)
+                    reply("250 ok")
+            elif verb == "DATA":
+                reply("354 end with .")
+                lines = []
+                for line in stream:
+                    if line.rstrip(b"\r\n") == b".":
+                        break
+                    lines.append(line)
+                self.messages.append((rcpt, b"".join(lines).decode()))
+                rcpt = []
+                reply("250 queued")
+            elif verb == "QUIT":
+                reply("221 bye")
+                break
+            else:
+                # MAIL, RSET, NOOP
+                rcpt = [] if verb in ("MAIL", "RSET") else rcpt
+                reply("250 ok")
+        conn.close()
+
+    def close(self):
+        self.sock.close()
+
+
+def test_password_reset_is_queued_and_delivered_over_smtp(app, client):
+    resp = client.post('/api/auth/request-password-reset', json={"email": "viewer@example.com"})
+    assert resp.status_code == 200
+    headers = login(client, "admin@example.com", "admin123!")
+    assert client.post('/api/auth/request-email-verify', headers=headers).status_code == 200
+    queued = OutboundEmail.query.order_by(OutboundEmail.id).all()
+    assert [(m.to_address, m.status) for m in queued] == [("viewer@example.com", "pending"), ("admin@example.com", "pending")]
+
+    stub = SMTPStub()
+    pool = SMTPPool("127.0.0.1", stub.port, size=2)
+    try:
+        assert deliver_batch(pool, batch_size=10, workers=2) == {"sent": 2, "retried": 0, "failed": 0}
+        assert deliver_batch(pool) == {"sent": 0, "retried": 0, "failed": 0}
+    finally:
+        pool.close()
+        stub.close()
+
+    assert {m.status for m in OutboundEmail.query} == {"sent"}
+    assert sorted(rcpt[0] for rcpt, _ in stub.messages) == ["admin@example.com", "viewer@example.com"]
+    reset_body = next(body for rcpt, body in stub.messages if rcpt == ["viewer@example.com"])
+    assert "Subject: Reset your password" in reset_body and "/reset-password?token=" in reset_body
+    assert stub.connections <= 2
+
+
+def test_pool_size_bounds_connections_across_workers(app):
+    db.session.add_all(OutboundEmail(to_address=f"user{i}@example.com", subject="s", body="b") for i in range(8))
+    db.session.commit()
+
+    stub = SMTPStub()
+    pool = SMTPPool("127.0.0.1", stub.port, size=1)
+    try:
+        assert deliver_batch(pool, batch_size=8, workers=4) == {"sent": 8, "retried": 0, "failed": 0}
+        assert pool.open == 1
+    finally:
+        pool.close()
+        stub.close()
+    assert stub.connections == 1 and pool.open == 0
+
+
+def test_failed_delivery_backs_off_then_gives_up(app):
+    app.config.update(MAIL_MAX_ATTEMPTS=2, MAIL_RETRY_BASE_SECONDS=60)
+    db.session.add_all([
+        OutboundEmail(to_address="bounce@example.com", subject="s", body="b"),
+        OutboundEmail(to_address="ok@example.com", subject="s", body="b"),
+    ])
+    db.session.commit()
+
+    stub = SMTPStub(reject={"bounce@example.com"})
+    pool = SMTPPool("127.0.0.1", stub.port, size=1)
+    try:
+        before = datetime.now(timezone.utc)
+        assert deliver_batch(pool) == {"sent": 1, "retried": 1, "failed": 0}
+        bounced = OutboundEmail.query.filter_by(to_address="bounce@example.com").one()
+        assert bounced.status == "pending" and bounced.attempts == 1
+        assert "SMTPRecipientsRefused" in bounced.last_error
+        next_attempt = bounced.next_attempt_at.replace(tzinfo=timezone.utc)
+        assert before + timedelta(seconds=45) < next_attempt < before + timedelta(seconds=75)
+
+        # Not due yet, so nothing is claimed.
+        assert deliver_batch(pool) == {"sent": 0, "retried": 0, "failed": 0}
+
+        bounced.next_attempt_at = datetime.now(timezone.utc) - timedelta(seconds=1)
+        db.session.commit()
+        assert deliver_batch(pool) == {"sent": 0, "retried": 0, "failed": 1}
+    finally:
+        pool.close()
+        stub.close()
+
+    bounced = OutboundEmail.query.filter_by(to_address="bounce@example.com").one()
+    assert (bounced.status, bounced.attempts) == ("failed", 2)
+    assert [rcpt for rcpt, _ in stub.messages] == [["ok@example.com"]]
@@ -0,0 +1,47 @@
+import os
+import re
+
+from app import create_app
+from app.extensions import db
+from app.utils.profiling import profile_signature
+
+
+def _profiled_app(tmp_path, **overrides):
+    cfg = {"PROFILE_ENABLED": True, "PROFILE_DIR": str(tmp_path), "PROFILE_HEADER_SECRET": "s3cret"}
+    cfg.update(overrides)
+    app = create_app("testing", cfg)
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+def test_signed_header_profiles_single_request(tmp_path):
+    app = _profiled_app(tmp_path)
+    client = app.test_client()
+
+    client.get("/healthz", headers={"X-Request-ID": "req-1", "X-Profile-Signature": "bogus"})
+    assert os.listdir(tmp_path) == []
+
+    headers = {"X-Request-ID": "req-2", "X-Profile-Signature": profile_signature("s3cret", "req-2")}
+    assert client.get("/healthz", headers=headers).status_code == 200
+    [dump] = os.listdir(tmp_path)
+    assert re.fullmatch(r"req-2\.\d{8}T\d{6}-[0-9a-f]{8}\.pstats", dump)
+
+    # A reused request id gets its own dump instead of overwriting the first.
+    assert client.get("/healthz", headers=headers).status_code == 200
+    assert len(os.listdir(tmp_path)) == 2
+
+
+def test_sampled_requests_aggregate_to_folded_stacks(tmp_path):
+    app = _profiled_app(tmp_path / "dumps", PROFILE_SAMPLE_RATE=1)
+    client = app.test_client()
+    for i in range(3):
+        client.get("/healthz", headers={"X-Request-ID": f"../sample-{i}"})
+    assert sorted(name.split(".", 1)[0] for name in os.listdir(tmp_path / "dumps")) == [f"___sample-{i}" for i in range(3)]
+
+    output = tmp_path / "out.folded"
+    result = app.test_cli_runner().invoke(args=["profile-aggregate", "--output", str(output)])
+    assert "Aggregated 3 profiles" in result.output
+    lines = output.read_text().splitlines()
+    assert lines and all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+    assert any("healthz" in line for line in lines)
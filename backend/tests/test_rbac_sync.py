@@ -0,0 +1,67 @@
+import json
+
+from app.models import AuditLog, Group, Permission, User
+from conftest import login
+
+
+POLICY = {
+    "permissions": ["reports.read"],
+    "groups": {
+        "Admin": {"permissions": ["users.read", "users.write", "groups.read", "groups.write", "admin.panel", "audit.read"],
+                  "members": ["admin@example.com"]},
+        "Default": {"permissions": ["users.read"]},
+        "Support": {"description": "Support desk", "permissions": ["users.read", "tickets.write"],
+                    "members": ["viewer@example.com"]},
+    },
+}
+
+
+def test_rbac_sync_endpoint_applies_minimal_diff(client):
+    headers = login(client, "admin@example.com", "admin123!")
+
+    dry = client.post('/api/rbac/sync?dry_run=1', headers=headers, json=POLICY).get_json()
+    assert dry["summary"] == {
+        "permissions_created": 2, "groups_created": 1, "groups_updated": 0, "groups_deleted": 0,
+        "grants_added": 3, "grants_removed": 0, "members_added": 1, "members_removed": 0,
+    }
+    assert dry["diff"]["grants_added"] == [["Default", "users.read"], ["Support", "tickets.write"], ["Support", "users.read"]]
+    assert Group.query.filter_by(name="Support").first() is None
+
+    applied = client.post('/api/rbac/sync', headers=headers, json=POLICY).get_json()
+    assert applied["summary"] == dry["summary"] and "diff" not in applied
+    support = Group.query.filter_by(name="Support").one()
+    assert sorted(p.name for p in support.permissions) == ["tickets.write", "users.read"]
+    assert [u.email for u in support.users] == ["viewer@example.com"]
+    assert Permission.query.filter_by(name="reports.read").count() == 1
+    assert AuditLog.query.filter_by(event_type="rbac.synced").count() == 1
+
+    again = client.post('/api/rbac/sync', headers=headers, json=POLICY).get_json()
+    assert not any(again["summary"].values())
+    assert AuditLog.query.filter_by(event_type="rbac.synced").count() == 1
+
+    viewer_headers = login(client, "viewer@example.com", "viewer123!")
+    assert client.get('/api/users', headers=viewer_headers).status_code == 200
+
+    shrunk = {"groups": {"Admin": POLICY["groups"]["Admin"], "Support": {"permissions": ["users.read"], "members": []}}, "prune": True}
+    summary = client.post('/api/rbac/sync', headers=headers, json=shrunk).get_json()["summary"]
+    assert (summary["groups_deleted"], summary["grants_removed"], summary["members_removed"]) == (1, 1, 1)
+    assert Group.query.filter_by(name="Default").first() is None
+    assert User.query.filter_by(email="viewer@example.com").one().groups == []
+
+    bad = {"groups": {"Ghosts": {"permissions": [], "members": ["ghost@example.com"]}}}
+    assert client.post('/api/rbac/sync', headers=headers, json=bad).status_code == 400
+    assert client.post('/api/rbac/sync', headers=viewer_headers, json=POLICY).status_code == 403
+
+
+def test_rbac_sync_command(app, tmp_path):
+    policy = tmp_path / "policy.json"
+    policy.write_text(json.dumps(POLICY))
+    runner = app.test_cli_runner()
+
+    dry = runner.invoke(args=["rbac-sync", str(policy), "--dry-run"])
+    assert "Would apply: permissions_created=2, groups_created=1" in dry.output
+    assert Group.query.filter_by(name="Support").first() is None
+
+    assert "Applied: permissions_created=2" in runner.invoke(args=["rbac-sync", str(policy)]).output
+    assert "groups_created=0" in runner.invoke(args=["rbac-sync", str(policy)]).output
+    assert Group.query.filter_by(name="Support").one().description == "Support desk"
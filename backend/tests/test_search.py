@@ -0,0 +1,40 @@
+from app.extensions import db
+from app.models import Group, User
+from app.services.search import reindex_search
+from app.services.synthetic import generate_synthetic
+from conftest import login
+
+
+def test_user_and_group_search_stays_in_sync(client, app):
+    headers = login(client, "admin@example.com", "admin123!")
+    db.session.add_all([User(email="zed.alpha@corp.test", password_hash="x"), User(email="alpha@corp.test", password_hash="x")])
+    db.session.commit()
+
+    items = client.get('/api/users/search?q=alpha', headers=headers).get_json()["items"]
+    assert [u["email"] for u in items] == ["alpha@corp.test", "zed.alpha@corp.test"]
+    assert client.get('/api/users/search?q=ALP&limit=1', headers=headers).get_json()["items"][0]["email"] == "alpha@corp.test"
+    assert [u["email"] for u in client.get('/api/users/search?q=ze', headers=headers).get_json()["items"]] == ["zed.alpha@corp.test"]
+
+    user = User.query.filter_by(email="zed.alpha@corp.test").one()
+    user.email = "omega@corp.test"
+    db.session.commit()
+    assert [u["email"] for u in client.get('/api/users/search?q=alpha', headers=headers).get_json()["items"]] == ["alpha@corp.test"]
+    db.session.delete(user)
+    db.session.commit()
+    assert client.get('/api/users/search?q=omega', headers=headers).get_json()["items"] == []
+
+    client.post('/api/groups', headers=headers, json={"name": "Support 100%"})
+    assert [g["name"] for g in client.get('/api/groups/search?q=100%25', headers=headers).get_json()["items"]] == ["Support 100%"]
+    assert client.get('/api/groups/search?q=', headers=headers).status_code == 400
+
+    viewer = login(client, "viewer@example.com", "viewer123!")
+    assert client.get('/api/users/search?q=alpha', headers=viewer).status_code == 403
+
+
+def test_bulk_loaded_rows_are_searchable(client, app):
+    headers = login(client, "admin@example.com", "admin123!")
+    generate_synthetic(users=50, groups=3, permissions=2, seed=1)
+    items = client.get('/api/users/search?q=synthetic-1', headers=headers).get_json()["items"]
+    assert items and all("synthetic-1" in u["email"] for u in items)
+    assert Group.query.count() == 5
+    assert reindex_search() == {"users_search": User.query.count(), "groups_search": 5}
@@ -0,0 +1,35 @@
+from sqlalchemy import func
+
+from app.extensions import db
+from app.models import Group, Permission, User, group_members
+
+
+def test_seed_synthetic_generates_skewed_memberships(app):
+    result = app.test_cli_runner().invoke(args=["seed-synthetic", "--users", "500", "--groups", "20", "--audit-rows", "50", "--seed", "7"])
+    assert "users=500" in result.output
+    assert "audit_logs=50" in result.output
+
+    with app.app_context():
+        assert User.query.filter(User.email.like("synthetic-%")).count() == 500
+        sizes = dict(db.session.query(group_members.c.group_id, func.count()).group_by(group_members.c.group_id).all())
+        synthetic = [gid for (gid,) in db.session.query(Group.id).filter(Group.name.like("synthetic-group-%")).order_by(Group.id)]
+        assert sizes[synthetic[0]] > 5 * sizes.get(synthetic[-1], 0)
+
+        user = User(email="after-seed@example.com", password_hash="x")
+        db.session.add(user)
+        db.session.commit()
+        assert user.id > 500
+
+
+def test_seed_is_idempotent_and_grants_new_permissions(app):
+    runner = app.test_cli_runner()
+    assert "Seed data already present" in runner.invoke(args=["seed"]).output
+
+    with app.app_context():
+        db.session.add(Permission(name="reports.read"))
+        db.session.commit()
+    assert "Seeded groups and permissions" in runner.invoke(args=["seed"]).output
+    assert "Seed data already present" in runner.invoke(args=["seed"]).output
+    with app.app_context():
+        admin = Group.query.filter_by(name="Admin").one()
+        assert "reports.read" in {p.name for p in admin.permissions}
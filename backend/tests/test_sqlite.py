@@ -0,0 +1,54 @@
+import sqlite3
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app import create_app
+from app.extensions import db
+from app.models import AuditLog, Group
+from conftest import login
+
+
+def test_file_database_gets_wal_and_pragmas(tmp_path):
+    app = create_app("testing", {"SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'tuned.db'}", "SQLITE_BUSY_TIMEOUT_MS": 1234})
+    with app.app_context():
+        pragma = lambda name: db.session.execute(text(f"PRAGMA {name}")).scalar()
+        assert pragma("journal_mode") == "wal"
+        assert pragma("busy_timeout") == 1234
+        assert pragma("synchronous") == 1  # NORMAL
+        assert pragma("cache_size") == -65536
+        db.session.remove()
+
+
+def locked_once(monkeypatch, failures=1):
+    real_commit = db.session.commit
+    calls = {"n": 0}
+
+    def commit():
+        calls["n"] += 1
+        if calls["n"] <= failures:
+            raise OperationalError("COMMIT", {}, sqlite3.OperationalError("database is locked"))
+        return real_commit()
+
+    monkeypatch.setattr(db.session, "commit", commit)
+    return calls
+
+
+def test_locked_write_is_retried_as_a_whole(app, client, monkeypatch):
+    headers = login(client, "admin@example.com", "admin123!")
+    calls = locked_once(monkeypatch)
+    resp = client.post('/api/groups', headers=headers, json={"name": "Retried"})
+    assert resp.status_code == 201 and calls["n"] == 2
+    assert Group.query.filter_by(name="Retried").count() == 1
+    assert AuditLog.query.filter_by(event_type="group.created").count() == 1
+
+
+def test_locked_write_gives_up_after_retries(app, client, monkeypatch):
+    app.config["SQLITE_WRITE_RETRIES"] = 1
+    headers = login(client, "admin@example.com", "admin123!")
+    calls = locked_once(monkeypatch, failures=5)
+    with pytest.raises(OperationalError):
+        client.post('/api/groups', headers=headers, json={"name": "Locked"})
+    assert calls["n"] == 2
+    assert Group.query.filter_by(name="Locked").count() == 0
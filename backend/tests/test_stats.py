@@ -0,0 +1,140 @@
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import event, select
+from sqlalchemy.dialects import postgresql
+
+from app.extensions import bcrypt, db
+from app.models import AuditLog, Group, StatCounter, User
+from app.services.rbac_sync import sync_policy
+from app.services.stats import get_stats, rebuild_stats, utc_date
+from conftest import login
+
+
+def counters():
+    db.session.expire_all()
+    return {(r.name, r.key): r.value for r in db.session.execute(select(StatCounter)).scalars() if r.value}
+
+
+def assert_matches_recount():
+    incremental = counters()
+    rebuild_stats()
+    assert incremental == counters()
+
+
+def test_counters_follow_writes_in_the_same_transaction(app, client):
+    admin_id, default_id = (Group.query.filter_by(name=name).one().id for name in ("Admin", "Default"))
+    assert get_stats()["users"] == {"total": 2, "active": 2, "locked": 0}
+
+    headers = login(client, "admin@example.com", "admin123!")
+    resp = client.post('/api/users', headers=headers, json={"email": "new@example.com", "password": "password123!", "group_ids": [default_id]})
+    assert resp.status_code == 201
+    new_id = resp.get_json()["id"]
+    client.patch(f'/api/users/{new_id}', headers=headers, json={"is_active": False})
+    client.post(f'/api/groups/{admin_id}/members', headers=headers, json={"user_id": new_id, "action": "add"})
+    client.post(f'/api/groups/{default_id}/members', headers=headers, json={"user_id": new_id, "action": "remove"})
+    # Rejected writes roll back together with their counter deltas.
+    client.post(f'/api/groups/{default_id}/members', headers=headers, json={"user_id": new_id, "action": "remove"})
+    for _ in range(5):
+        client.post('/api/auth/login', json={"email": "viewer@example.com", "password": "wrong-password"})
+
+    stats = client.get('/api/stats', headers=headers).get_json()
+    assert stats["users"] == {"total": 3, "active": 2, "locked": 1}
+    assert stats["groups"] == {str(admin_id): 2, str(default_id): 1}
+    today = datetime.now(timezone.utc).date().isoformat()
+    assert stats["audit"][today] == dict(Counter(row.event_type for row in AuditLog.query))
+    assert stats["audit"][today]["login.failure"] == 5
+    assert_matches_recount()
+
+
+def test_rollback_and_bulk_sync_keep_counters_exact(app):
+    db.session.add(User(email="ghost@example.com", password_hash="x"))
+    db.session.flush()
+    db.session.rollback()
+    assert get_stats()["users"]["total"] == 2
+
+    user = User(email="member@example.com", password_hash=bcrypt.generate_password_hash("member123!").decode())
+    db.session.add(user)
+    db.session.commit()
+    sync_policy({"groups": {
+        "Admin": {"permissions": ["admin.panel"], "members": ["member@example.com"]},
+        "Ops": {"permissions": [], "members": ["member@example.com", "viewer@example.com"]},
+    }})
+    db.session.commit()
+    ops_id = Group.query.filter_by(name="Ops").one().id
+    admin_id = Group.query.filter_by(name="Admin").one().id
+    assert get_stats()["groups"][str(ops_id)] == 2
+    assert get_stats()["groups"][str(admin_id)] == 1
+    assert_matches_recount()
+
+    sync_policy({"groups": {"Admin": {"permissions": ["admin.panel"]}}, "prune": True})
+    db.session.commit()
+    assert set(get_stats()["groups"]) == {str(admin_id)}
+    assert_matches_recount()
+
+
+def test_audit_days_are_utc_on_both_paths(app):
+    # Local dates differ from the UTC day in both directions around midnight.
+    for created in (
+        datetime(2026, 1, 1, 23, 30, tzinfo=timezone(timedelta(hours=-5))),
+        datetime(2026, 1, 2, 8, 30, tzinfo=timezone(timedelta(hours=9))),
+        datetime(2026, 1, 2, 0, 30, tzinfo=timezone.utc),
+    ):
+        db.session.add(AuditLog(event_type="tz.check", target_type="user", created_at=created))
+    db.session.commit()
+    assert counters()[("audit.events", "2026-01-01|tz.check")] == 1
+    assert counters()[("audit.events", "2026-01-02|tz.check")] == 2
+    assert_matches_recount()
+
+    pg_day = str(select(utc_date(AuditLog.created_at, "postgresql")).compile(dialect=postgresql.dialect()))
+    assert "date(timezone(" in pg_day
+
+
+def test_deleting_users_and_groups_releases_their_memberships(app):
+    admin_id = Group.query.filter_by(name="Admin").one().id
+    ops = Group(name="Ops", users=User.query.all())
+    db.session.add(ops)
+    db.session.commit()
+    ops_id = ops.id
+    assert get_stats()["groups"][str(ops_id)] == 2
+
+    db.session.expire_all()
+    db.session.delete(User.query.filter_by(email="viewer@example.com").one())
+    db.session.commit()
+    assert get_stats()["groups"] == {str(admin_id): 1, str(ops_id): 1}
+    assert_matches_recount()
+
+    db.session.delete(db.session.get(Group, ops_id))
+    db.session.commit()
+    assert get_stats()["groups"] == {str(admin_id): 1}
+    assert get_stats()["users"]["total"] == 1
+    assert_matches_recount()
+
+
+def test_counter_deltas_are_written_in_one_statement(app):
+    db.session.add_all(Group(name=f"Team {i}", users=User.query.all()) for i in range(20))
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(db.engine, "before_cursor_execute", listener)
+    try:
+        db.session.commit()
+    finally:
+        event.remove(db.engine, "before_cursor_execute", listener)
+    assert len([s for s in statements if "stat_counters" in s]) == 1
+    assert_matches_recount()
+
+
+def test_stats_rebuild_command_corrects_drift(app):
+    row = db.session.get(StatCounter, ("users.total", ""))
+    row.value = 99
+    db.session.commit()
+
+    result = app.test_cli_runner().invoke(args=["stats-rebuild"])
+    assert result.exit_code == 0, result.output
+    assert "users.total: 99 -> 2" in result.output
+    assert get_stats()["users"]["total"] == 2
+
+
+def test_stats_endpoint_requires_admin_panel(client):
+    headers = login(client, "viewer@example.com", "viewer123!")
+    assert client.get('/api/stats', headers=headers).status_code == 403
@@ -0,0 +1,37 @@
+import json
+import threading
+
+from werkzeug.serving import make_server
+
+from app import create_app
+from app.extensions import db
+from benchmarks.replay import load_capture, replay
+
+
+def test_recorded_traffic_replays_against_live_server(tmp_path):
+    capture = tmp_path / "traffic.jsonl"
+    app = create_app("testing", {"TRAFFIC_RECORD_PATH": str(capture)})
+    with app.app_context():
+        db.create_all()
+    client = app.test_client()
+    client.get("/healthz", headers={"X-Request-ID": "rid-1"})
+    client.get("/api/users?secret=1")
+    client.post("/api/auth/login", json={"email": "nobody@example.com", "password": "pw"})
+
+    entries = [json.loads(line) for line in capture.read_text().splitlines()]
+    assert [e["route"] for e in entries] == ["/healthz", "/api/users", "/api/auth/login"]
+    assert entries[0]["request_id"] == "rid-1"
+    assert entries[1]["path"] == "/api/users" and entries[1]["status"] == 401
+    assert all(e["latency_ms"] >= 0 for e in entries)
+
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        bodies = {"POST /api/auth/login": {"email": "nobody@example.com", "password": "pw"}}
+        report, _ = replay(load_capture(str(capture)), f"http://127.0.0.1:{server.server_port}", rate=50, concurrency=4, bodies=bodies)
+    finally:
+        server.shutdown()
+    assert report["GET /api/users"]["status"] == {"401": 1}
+    assert report["POST /api/auth/login"]["status"] == {"401": 1}
+    assert "GET /healthz" not in report
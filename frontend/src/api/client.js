@@ -12,3 +12,15 @@ export async function api(path, options = {}) {
   }
   return data
 }
+
+// Runs several API calls in one round trip; resolves to one { status, body } per request.
+export async function batch(requests, { parallel = false } = {}) {
+  const data = await api('/api/batch', {
+    method: 'POST',
+    body: JSON.stringify({ parallel, requests: requests.map((r) => ({ method: 'GET', ...r })) })
+  })
+  return data.responses.map(({ status, body }) => {
+    if (status >= 400) throw new Error(body?.error?.message || 'Request failed')
+    return body
+  })
+}
@@ -21,7 +21,11 @@ export const useAuthStore = defineStore('auth', {
         this.logout()
       }
     },
-    hasPerm(perm) { return this.permissions.includes(perm) },
+    hasPerm(perm) {
+      // Mirrors the backend: a trailing `*` segment grants the whole subtree.
+      return this.permissions.some((grant) => grant === perm || grant === '*' ||
+        (grant.endsWith('.*') && perm.startsWith(grant.slice(0, -1))))
+    },
     logout() {
       this.token = ''
       this.user = null
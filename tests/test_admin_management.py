@@ -1,5 +1,7 @@
+import time
+
 from app.extensions import db
-from app.models import Group, User
+from app.models import Group, Permission, User, migrate_legacy_group_permissions
 
 
 def create_admin_and_login(client, app):
@@ -136,3 +138,175 @@ def test_user_groups_can_be_added_and_removed(client, app):
     with app.app_context():
         user = db.session.get(User, user_id)
         assert user.groups == []
+
+
+def test_group_permissions_are_normalized_and_indexed(client, app):
+    create_admin_and_login(client, app)
+    client.post("/api/login", json={"email": "admin@example.com", "password": "password123"})
+    client.post("/admin/api/groups", json={"name": "Editors", "permissions": "posts.write, posts.read, posts.read"})
+    client.post("/admin/api/groups", json={"name": "Readers", "permissions": "posts.read"})
+
+    with app.app_context():
+        assert Permission.query.count() == 2
+        editors = Group.query.filter_by(name="Editors").first()
+        assert editors.permissions_list == ["posts.read", "posts.write"]
+        assert editors.grants("posts.write") and not editors.grants("users.read")
+        assert sorted(group.name for group in Group.granting("posts.read")) == ["Editors", "Readers"]
+
+
+def test_legacy_comma_separated_permissions_are_migrated(app):
+    with app.app_context():
+        db.session.add(Group(name="Legacy", legacy_permissions="a.read, b.write,a.read"))
+        db.session.commit()
+
+        assert migrate_legacy_group_permissions() == 1
+        group = Group.query.filter_by(name="Legacy").first()
+        assert group.legacy_permissions == ""
+        assert group.permissions == "a.read,b.write"
+        assert migrate_legacy_group_permissions() == 0
+
+
+def test_admin_dashboard_is_paginated_and_searchable(client, app):
+    create_admin_and_login(client, app)
+    with app.app_context():
+        db.session.add_all(
+            User(username=f"bulk{i:02d}", email=f"bulk{i:02d}@example.com", password_hash="x") for i in range(30)
+        )
+        db.session.add(Group(name="Editors", permissions="posts.read"))
+        db.session.commit()
+    client.post("/api/login", json={"email": "admin@example.com", "password": "password123"})
+
+    page = client.get("/admin/?per_page=10&page=2")
+    assert page.status_code == 200
+    assert b"Page 2 of 4" in page.data
+
+    found = client.get("/admin/api/users?q=BULK1&per_page=5").get_json()
+    assert found["total"] == 10
+    assert [item["username"] for item in found["items"]] == [f"bulk1{i}" for i in range(5)]
+    assert found["pages"] == 2
+
+    groups = client.get("/admin/api/groups?q=edit").get_json()
+    assert groups["items"] == [{"id": groups["items"][0]["id"], "name": "Editors", "permissions": ["posts.read"]}]
+
+    searched = client.get("/admin/?q=member")
+    assert b"member@example.com" in searched.data
+    assert b"bulk00@example.com" not in searched.data
+
+    # Rows render only their assigned groups; available ones are fetched on demand.
+    with app.app_context():
+        db.session.add_all(Group(name=f"Team {i:02d}") for i in range(40))
+        bulk10 = User.query.filter_by(username="bulk10").one()
+        bulk10.groups.append(Group.query.filter_by(name="Editors").one())
+        db.session.commit()
+    rows = client.get("/admin/?q=bulk1&per_page=10&gpage=99")
+    assert rows.data.count(b"<option") == 1
+
+
+def test_cached_user_sessions_see_admin_changes_immediately(app):
+    from sqlalchemy import event
+
+    _, user_id = create_admin_and_login(app.test_client(), app)
+    with app.app_context():
+        db.session.get(User, user_id).is_admin = True
+        db.session.commit()
+
+    admin_client = app.test_client()
+    member_client = app.test_client()
+
+    def call(client, method, path, **kwargs):
+        # A fresh app context per request, so Flask-Login's per-context user isn't reused.
+        with app.app_context():
+            return client.open(path, method=method, **kwargs)
+
+    def member_get(path):
+        return call(member_client, "GET", path)
+
+    call(admin_client, "POST", "/api/login", json={"email": "admin@example.com", "password": "password123"})
+    call(member_client, "POST", "/api/login", json={"email": "member@example.com", "password": "password123"})
+
+    assert member_get("/admin/").status_code == 200
+
+    queries = []
+    listener = lambda *args: queries.append(args[2])
+    with app.app_context():
+        event.listen(db.engine, "before_cursor_execute", listener)
+    assert member_get("/").status_code == 200
+    with app.app_context():
+        event.remove(db.engine, "before_cursor_execute", listener)
+    # The snapshot matches the session's session_version, so no query is needed.
+    assert queries == []
+
+    demote = call(
+        admin_client,
+        "POST",
+        f"/admin/api/users/{user_id}",
+        json={"username": "member", "email": "member@example.com", "is_admin": False, "group_ids": []},
+    )
+    assert demote.status_code == 200
+    assert member_get("/admin/").status_code == 403
+
+    call(admin_client, "POST", f"/admin/api/users/{user_id}/delete")
+    assert member_get("/dashboard").status_code in (301, 302)
+
+
+def test_other_workers_drop_stale_snapshots(app, monkeypatch):
+    import app.models as models
+
+    admin_id, user_id = create_admin_and_login(app.test_client(), app)
+    with app.app_context():
+        db.session.get(User, user_id).is_admin = True
+        db.session.commit()
+    client = app.test_client()
+
+    def get(path):
+        with app.app_context():
+            return client.get(path)
+
+    with app.app_context():
+        client.post("/api/login", json={"email": "member@example.com", "password": "password123"})
+    assert get("/admin/").status_code == 200
+
+    # Another worker demotes the user: its cache is not this one, so nothing is invalidated here.
+    with app.app_context():
+        user = db.session.get(User, user_id)
+        user.is_admin = False
+        user.bump_session_version()
+        db.session.commit()
+    assert get("/admin/").status_code == 200
+
+    # A session already carrying the newer version (reloaded by another worker) skips the stale snapshot.
+    with client.session_transaction() as sess:
+        sess["session_version"] = 2
+    assert get("/admin/").status_code == 403
+
+    with app.app_context():
+        db.session.delete(db.session.get(User, user_id))
+        db.session.commit()
+    assert get("/dashboard").status_code == 200
+    now = time.monotonic()
+    monkeypatch.setattr(models.time, "monotonic", lambda: now + app.config["USER_CACHE_TTL"] + 1)
+    assert get("/dashboard").status_code in (301, 302)
+
+
+def test_session_version_column_is_added_by_cli(tmp_path):
+    import sqlite3
+
+    from app import create_app
+
+    path = tmp_path / "old.db"
+    conn = sqlite3.connect(path)
+    conn.execute(
+        'CREATE TABLE "user" (id INTEGER PRIMARY KEY, username VARCHAR(80) NOT NULL UNIQUE, '
+        "email VARCHAR(255) NOT NULL UNIQUE, password_hash VARCHAR(255) NOT NULL, is_admin BOOLEAN NOT NULL)"
+    )
+    conn.execute("INSERT INTO user VALUES (1, 'old', 'old@example.com', 'x', 1)")
+    conn.commit()
+    conn.close()
+
+    app = create_app({"TESTING": True, "SQLALCHEMY_DATABASE_URI": f"sqlite:///{path}"})
+    runner = app.test_cli_runner()
+    assert "Added user.session_version" in runner.invoke(args=["migrate-user-columns"]).output
+    assert "up to date" in runner.invoke(args=["migrate-user-columns"]).output
+    with app.app_context():
+        assert db.session.get(User, 1).session_version == 1
+        db.session.remove()
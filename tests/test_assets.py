@@ -0,0 +1,75 @@
+import gzip
+import re
+
+from app import assets
+from app.assets import IMMUTABLE
+
+
+def test_assets_build_serves_fingerprinted_precompressed_css(app, client, tmp_path):
+    app.config["ASSETS_DIST_DIR"] = str(tmp_path)
+    result = app.test_cli_runner().invoke(args=["assets", "build"])
+    assert result.exit_code == 0, result.output
+    assert (tmp_path / "manifest.json").exists()
+
+    page = client.get("/").get_data(as_text=True)
+    match = re.search(r'href="(/assets/css/app\.[0-9a-f]{12}\.css)"', page)
+    assert match
+
+    with open(app.static_folder + "/css/app.css", "rb") as fh:
+        source = fh.read()
+
+    compressed = client.get(match.group(1), headers={"Accept-Encoding": "gzip"})
+    assert compressed.headers["Content-Encoding"] == "gzip"
+    assert compressed.headers["Cache-Control"] == IMMUTABLE
+    assert "Accept-Encoding" in compressed.headers["Vary"]
+    assert compressed.mimetype == "text/css"
+    assert gzip.decompress(compressed.data) == source
+
+    plain = client.get(match.group(1))
+    assert "Content-Encoding" not in plain.headers
+    assert plain.data == source
+
+    assert client.get("/assets/css/app.css").status_code == 404
+
+
+def test_assets_build_without_brotli_serves_gzip_to_br_clients(app, client, tmp_path, monkeypatch):
+    monkeypatch.setattr(assets, "brotli", None)
+    app.config["ASSETS_DIST_DIR"] = str(tmp_path)
+    result = app.test_cli_runner().invoke(args=["assets", "build"])
+    assert result.exit_code == 0, result.output
+    assert "gzip only" in result.output
+    assert not list(tmp_path.rglob("*.br"))
+
+    hashed = app.extensions["assets_manifest"]["css/app.css"]
+    assert (tmp_path / (hashed + ".gz")).exists()
+    resp = client.get(f"/assets/{hashed}", headers={"Accept-Encoding": "br, gzip"})
+    assert resp.headers["Content-Encoding"] == "gzip"
+    with open(app.static_folder + "/css/app.css", "rb") as fh:
+        assert gzip.decompress(resp.data) == fh.read()
+
+
+def test_rebuild_keeps_earlier_hashes_until_pruned(app, client, tmp_path):
+    static = tmp_path / "static"
+    (static / "css").mkdir(parents=True)
+    app.static_folder = str(static)
+    app.config["ASSETS_DIST_DIR"] = str(tmp_path / "dist")
+    runner = app.test_cli_runner()
+
+    (static / "css" / "app.css").write_text("body { color: red; }")
+    runner.invoke(args=["assets", "build"])
+    old = app.extensions["assets_manifest"]["css/app.css"]
+    (static / "css" / "app.css").write_text("body { color: blue; }")
+    runner.invoke(args=["assets", "build"])
+    new = app.extensions["assets_manifest"]["css/app.css"]
+    assert old != new
+
+    # Pages rendered against the previous manifest keep loading their assets.
+    assert client.get(f"/assets/{old}").data == b"body { color: red; }"
+    assert client.get(f"/assets/{new}").data == b"body { color: blue; }"
+    assert client.get("/assets/manifest.json").status_code == 404
+    assert client.get(f"/assets/{new}.gz").status_code == 404
+
+    result = runner.invoke(args=["assets", "prune"])
+    assert f"Removed {3 if assets.brotli else 2} stale file(s)" in result.output
+    assert client.get(f"/assets/{old}").status_code == 404
+    assert client.get(f"/assets/{new}").status_code == 200
@@ -56,3 +56,45 @@ def test_dashboard_requires_login(client, app):
     login = client.post("/api/login", json={"email": "member@example.com", "password": "password123"})
     assert login.status_code == 200
     assert client.get("/dashboard").status_code == 200
+
+
+def test_public_pages_are_served_from_page_cache(client, app, monkeypatch):
+    import app.main.routes as main_routes
+
+    renders = []
+    original = main_routes.render_template
+    monkeypatch.setattr(main_routes, "render_template", lambda *a, **kw: renders.append(a[0]) or original(*a, **kw))
+
+    first = client.get("/docs")
+    second = client.get("/docs")
+    assert renders == ["docs.html"]
+    assert first.data == second.data
+    assert second.headers["Cache-Control"] == "public, max-age=300"
+    assert "Cookie" in second.headers["Vary"]
+
+    not_modified = client.get("/docs", headers={"If-None-Match": first.headers["ETag"]})
+    assert not_modified.status_code == 304
+    assert renders == ["docs.html"]
+
+    from app.page_cache import invalidate_pages
+
+    with app.test_request_context():
+        assert invalidate_pages("main.docs") == 1
+    client.get("/docs")
+    assert renders == ["docs.html", "docs.html"]
+
+
+def test_page_cache_varies_by_login_state(client, app):
+    anonymous = client.get("/")
+    assert b"Create account" in anonymous.data
+
+    with app.app_context():
+        user = User(username="demo", email="demo@example.com", is_admin=False)
+        user.set_password("password123")
+        db.session.add(user)
+        db.session.commit()
+    client.post("/api/login", json={"email": "demo@example.com", "password": "password123"})
+
+    logged_in = client.get("/")
+    assert b"Welcome back, demo" in logged_in.data
+    assert "private" in logged_in.headers["Cache-Control"]